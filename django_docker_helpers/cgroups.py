@@ -0,0 +1,219 @@
+import math
+import os
+import typing as t
+
+CGROUP_ROOT = '/sys/fs/cgroup'
+PROC_CGROUP = '/proc/self/cgroup'
+
+#: cgroup v1 reports "no limit" as a huge page-aligned number (``PAGE_COUNTER_MAX * PAGE_SIZE``)
+UNLIMITED_MEMORY_THRESHOLD = 2 ** 60
+
+
+def _read(path: str) -> t.Optional[str]:
+    try:
+        with open(path) as fp:
+            return fp.read().strip()
+    except (OSError, ValueError):
+        return None
+
+
+def process_cgroups(proc_cgroup: str = PROC_CGROUP) -> t.Dict[str, str]:
+    """
+    Parses ``/proc/self/cgroup``.
+
+    :param proc_cgroup: a path to a ``/proc/<pid>/cgroup`` file
+    :return: ``controller -> cgroup path``, the cgroup v2 (unified) path is stored with an empty controller
+    """
+    content = _read(proc_cgroup) or ''
+    cgroups = {}
+    for line in content.splitlines():
+        if line.count(':') < 2:
+            continue
+        _hierarchy_id, controllers, path = line.split(':', 2)
+        for controller in controllers.split(','):
+            cgroups[controller] = path
+    return cgroups
+
+
+def _hierarchy(mount: str, path: str) -> t.Generator[str, None, None]:
+    """
+    Yields existing directories from the process cgroup up to the ``mount`` root.
+    Limits are hierarchical, so every level counts. Inside a cgroup namespace (or a container
+    that mounts its own subtree) the full path may not exist and only the upper levels are found.
+    """
+    parts = [part for part in path.split('/') if part]
+    while True:
+        directory = os.path.join(mount, *parts)
+        if os.path.isdir(directory):
+            yield directory
+        if not parts:
+            return
+        parts.pop()
+
+
+def _controller_dirs(controller: str,
+                     root: str = CGROUP_ROOT,
+                     proc_cgroup: str = PROC_CGROUP) -> t.Tuple[bool, t.List[str]]:
+    """
+    :return: ``(is cgroup v2, directories to read limits from)``
+    """
+    cgroups = process_cgroups(proc_cgroup)
+
+    if os.path.exists(os.path.join(root, 'cgroup.controllers')):
+        return True, list(_hierarchy(root, cgroups.get('', '/')))
+
+    for mount_name in (controller, '{0},cpuacct'.format(controller), 'cpuacct,{0}'.format(controller)):
+        mount = os.path.join(root, mount_name)
+        if os.path.isdir(mount):
+            return False, list(_hierarchy(mount, cgroups.get(controller, '/')))
+
+    return False, []
+
+
+def cpu_quota(root: str = CGROUP_ROOT, proc_cgroup: str = PROC_CGROUP) -> t.Optional[float]:
+    """
+    Reads the CFS CPU quota of the current process: ``cpu.max`` (cgroup v2) or
+    ``cpu.cfs_quota_us`` / ``cpu.cfs_period_us`` (cgroup v1).
+
+    :param root: a cgroup filesystem mount point
+    :param proc_cgroup: a path to a ``/proc/<pid>/cgroup`` file
+    :return: a number of CPUs the process can use (may be fractional) or ``None`` if it's not limited
+    """
+    v2, dirs = _controller_dirs('cpu', root, proc_cgroup)
+
+    quotas = []
+    for directory in dirs:
+        if v2:
+            raw = (_read(os.path.join(directory, 'cpu.max')) or 'max').split()
+            quota, period = raw[0], raw[1] if len(raw) > 1 else '100000'
+        else:
+            quota = _read(os.path.join(directory, 'cpu.cfs_quota_us')) or '-1'
+            period = _read(os.path.join(directory, 'cpu.cfs_period_us')) or '100000'
+
+        if quota in ('max', '-1') or not int(period):
+            continue
+        quotas.append(int(quota) / int(period))
+
+    return min(quotas) if quotas else None
+
+
+def memory_limit(root: str = CGROUP_ROOT, proc_cgroup: str = PROC_CGROUP) -> t.Optional[int]:
+    """
+    Reads the memory limit of the current process: ``memory.max`` (cgroup v2) or
+    ``memory.limit_in_bytes`` (cgroup v1).
+
+    :param root: a cgroup filesystem mount point
+    :param proc_cgroup: a path to a ``/proc/<pid>/cgroup`` file
+    :return: a limit in bytes or ``None`` if it's not limited
+    """
+    v2, dirs = _controller_dirs('memory', root, proc_cgroup)
+
+    limits = []
+    for directory in dirs:
+        raw = _read(os.path.join(directory, 'memory.max' if v2 else 'memory.limit_in_bytes'))
+        if not raw or raw == 'max':
+            continue
+        limit = int(raw)
+        if 0 < limit < UNLIMITED_MEMORY_THRESHOLD:
+            limits.append(limit)
+
+    return min(limits) if limits else None
+
+
+def available_cpus(root: str = CGROUP_ROOT, proc_cgroup: str = PROC_CGROUP) -> float:
+    """
+    A number of CPUs the process can actually use: the smallest of the CPU affinity mask
+    and the cgroup CPU quota. ``os.cpu_count()`` reports all host CPUs even in a throttled container.
+
+    :param root: a cgroup filesystem mount point
+    :param proc_cgroup: a path to a ``/proc/<pid>/cgroup`` file
+    :return: a number of CPUs, may be fractional
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+
+    quota = cpu_quota(root, proc_cgroup)
+    if quota is None:
+        return cpus
+    return min(cpus, quota)
+
+
+def auto_size_workers(workers: t.Optional[int] = None,
+                      threads: t.Optional[int] = None,
+                      worker_memory: t.Optional[int] = None,
+                      root: str = CGROUP_ROOT,
+                      proc_cgroup: str = PROC_CGROUP) -> t.Tuple[int, int]:
+    """
+    Derives a number of worker processes and threads per worker from the container limits
+    for values that are not set explicitly.
+
+    The concurrency target is ``2 * CPUs + 1`` (the gunicorn recommendation) where CPUs are
+    :func:`~django_docker_helpers.cgroups.available_cpus` rounded up. Workers are capped by
+    ``memory limit // worker_memory``, threads make up the rest of the target.
+
+    :param workers: a fixed number of workers
+    :param threads: a fixed number of threads per worker
+    :param worker_memory: an expected memory footprint of a worker in bytes, ``None`` disables the memory cap
+    :param root: a cgroup filesystem mount point
+    :param proc_cgroup: a path to a ``/proc/<pid>/cgroup`` file
+    :return: ``(workers, threads)``
+    """
+    target = 2 * math.ceil(available_cpus(root, proc_cgroup)) + 1
+
+    if workers is None:
+        workers = target
+        limit = memory_limit(root, proc_cgroup) if worker_memory else None
+        if limit is not None:
+            workers = min(workers, limit // worker_memory)
+        workers = max(workers, 1)
+
+    if threads is None:
+        threads = max(math.ceil(target / workers), 1)
+
+    return workers, threads
+
+
+def auto_tune_uwsgi(processes: t.Optional[int] = None,
+                    threads: t.Optional[int] = None,
+                    worker_memory: t.Optional[int] = None,
+                    root: str = CGROUP_ROOT,
+                    proc_cgroup: str = PROC_CGROUP,
+                    cheaper: t.Optional[int] = None) -> t.Dict[str, t.Any]:
+    """
+    Computes uWSGI ``processes``, ``threads`` and the ``spare`` cheaper algorithm settings from
+    the container limits, see :func:`~django_docker_helpers.cgroups.auto_size_workers`.
+    The cheaper subsystem keeps one process per available CPU alive and spawns the rest under load.
+    uWSGI requires ``cheaper`` to be less than ``processes``, so it's capped with ``processes - 1``
+    and the cheaper subsystem is not configured at all for a single process.
+
+    :param processes: a fixed number of processes
+    :param threads: a fixed number of threads per process
+    :param worker_memory: an expected memory footprint of a process in bytes, ``None`` disables the memory cap
+    :param root: a cgroup filesystem mount point
+    :param proc_cgroup: a path to a ``/proc/<pid>/cgroup`` file
+    :param cheaper: a fixed number of processes to keep alive, default is the number of available CPUs
+    :return: uWSGI options
+    """
+    processes, threads = auto_size_workers(processes, threads, worker_memory, root, proc_cgroup)
+    cfg = {
+        'processes': processes,
+        'threads': threads,
+    }  # type: t.Dict[str, t.Any]
+
+    if threads > 1:
+        cfg['enable-threads'] = True
+
+    if cheaper is None:
+        cheaper = math.ceil(available_cpus(root, proc_cgroup))
+    cheaper = min(cheaper, processes - 1)
+    if cheaper >= 1:
+        cfg.update({
+            'cheaper-algo': 'spare',
+            'cheaper': cheaper,
+            'cheaper-initial': cheaper,
+            'cheaper-step': 1,
+        })
+
+    return cfg
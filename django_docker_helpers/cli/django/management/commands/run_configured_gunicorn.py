@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand
+
+from django_docker_helpers.cgroups import CGROUP_ROOT, auto_size_workers
+from django_docker_helpers.config import ConfigLoader
+from django_docker_helpers.config.coercers import ByteSize
+from django_docker_helpers.management import run_gunicorn
+
+
+class Command(BaseCommand):
+    help = 'Runs gunicorn with settings fetched from ConfigLoader'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--key', default='gunicorn', dest='key',
+            help='The YAML configuration key with which gunicorn settings can be accessed (default: gunicorn)'
+        )
+        parser.add_argument(
+            '--print', action='store_true', dest='print',
+            help='If true the resulting settings will be outputted'
+        )
+        parser.add_argument(
+            '--worker-memory', default=None, dest='worker_memory', type=ByteSize,
+            help='An expected memory footprint of a worker (e.g. 256MiB), caps workers by the cgroup memory limit'
+        )
+        parser.add_argument(
+            '--cgroup-root', default=CGROUP_ROOT, dest='cgroup_root',
+            help=f'A cgroup filesystem mount point (default: {CGROUP_ROOT})'
+        )
+        parser.add_argument(
+            '--no-freeze', action='store_false', dest='freeze',
+            help='Do not gc.freeze() the config and the application before gunicorn forks workers'
+        )
+
+    def handle(self, **options):
+        key = options['key']
+
+        configure = ConfigLoader.from_env(suppress_logs=True, silent=True)
+        gunicorn_cfg = configure.get_section(key)
+
+        if not gunicorn_cfg:
+            self.stderr.write(f'Parsing error: gunicorn settings were not found by the key "{key}"')
+            return
+
+        gunicorn_cfg = dict(gunicorn_cfg)
+        workers, threads = gunicorn_cfg.get('workers'), gunicorn_cfg.get('threads')
+        gunicorn_cfg['workers'], gunicorn_cfg['threads'] = auto_size_workers(
+            workers=int(workers) if workers else None,
+            threads=int(threads) if threads else None,
+            worker_memory=options['worker_memory'],
+            root=options['cgroup_root'],
+        )
+
+        if options['print']:
+            self.stdout.write('*' * 80 + '\n')
+            self.stdout.write('GUNICORN SETTINGS'.center(80))
+            self.stdout.write('*' * 80 + '\n')
+
+            for name, val in gunicorn_cfg.items():
+                self.stdout.write(f'{name} = {val}\n')
+
+            self.stdout.write('*' * 80 + '\n')
+            self.stdout.flush()
+
+        from django.core.wsgi import get_wsgi_application
+
+        run_gunicorn(get_wsgi_application(), configure=configure, freeze=options['freeze'], config=gunicorn_cfg)
@@ -3,7 +3,9 @@ import typing as t
 
 from django.core.management.base import BaseCommand
 
+from django_docker_helpers.cgroups import CGROUP_ROOT, auto_tune_uwsgi
 from django_docker_helpers.config import ConfigLoader
+from django_docker_helpers.config.coercers import ByteSize
 
 
 def write_uwsgi_ini_cfg(fp: t.IO, cfg: dict):
@@ -56,6 +58,25 @@ class Command(BaseCommand):
             '-f', '--file', default='/tmp/uwsgi.ini', dest='file',
             help='Specifies a file that will be used for config storing'
         )
+        parser.add_argument(
+            '--auto-tune', action='store_true', dest='auto_tune',
+            help='Derive processes, threads and cheaper settings from cgroup CPU quota and memory limits, '
+                 'explicit config values take precedence'
+        )
+        parser.add_argument(
+            '--worker-memory', default=None, dest='worker_memory', type=ByteSize,
+            help='An expected memory footprint of a process (e.g. 256MiB), caps auto-tuned processes '
+                 'by the cgroup memory limit'
+        )
+        parser.add_argument(
+            '--cgroup-root', default=CGROUP_ROOT, dest='cgroup_root',
+            help=f'A cgroup filesystem mount point (default: {CGROUP_ROOT})'
+        )
+        parser.add_argument(
+            '--config-handoff', action='store_true', dest='config_handoff',
+            help='Pass the resolved config to uWSGI workers in an inherited snapshot, '
+                 'so they do not read it from parsers again'
+        )
 
     def handle(self, **options):
         key = options['key']
@@ -67,11 +88,18 @@ class Command(BaseCommand):
             self.stderr.write(f'Parsing error: uWSGI config was not found by the key "{key}"')
             return
 
+        tuned = {}
+        if options['auto_tune']:
+            uwsgi_cfg, tuned = self.auto_tune(uwsgi_cfg, options['worker_memory'], options['cgroup_root'])
+
         if options['print']:
             self.stdout.write('*' * 80 + '\n')
             self.stdout.write('uWSGI CONFIG'.center(80))
             self.stdout.write('*' * 80 + '\n')
 
+            for name, val in tuned.items():
+                self.stdout.write(f'auto-tuned: {name} = {val}\n')
+
             write_uwsgi_ini_cfg(self.stdout, uwsgi_cfg)
 
             self.stdout.write('*' * 80 + '\n')
@@ -81,4 +109,62 @@ class Command(BaseCommand):
         with open(cfg_file, 'w') as file:
             write_uwsgi_ini_cfg(file, uwsgi_cfg)
 
+        if options['config_handoff']:
+            self.handoff_config(configure)
+
         os.execvp('uwsgi', ('--ini', cfg_file))
+
+    def auto_tune(self, uwsgi_cfg: dict, worker_memory: t.Optional[int], cgroup_root: str) -> t.Tuple[dict, dict]:
+        """
+        Merges :func:`~django_docker_helpers.cgroups.auto_tune_uwsgi` settings under explicit ``uwsgi_cfg`` values.
+        An explicit ``cheaper`` is capped with ``processes - 1`` (or removed for a single process),
+        ``cheaper-*`` options are not added if any of them is set explicitly.
+
+        :return: a merged config and auto-tuned values that are actually used
+        """
+        processes = uwsgi_cfg.get('processes') or uwsgi_cfg.get('workers')
+        threads = uwsgi_cfg.get('threads')
+        cheaper = uwsgi_cfg.get('cheaper')
+
+        auto_cfg = auto_tune_uwsgi(
+            processes=int(processes) if processes else None,
+            threads=int(threads) if threads else None,
+            worker_memory=worker_memory,
+            root=cgroup_root,
+            cheaper=int(cheaper) if cheaper else None,
+        )
+        if 'workers' in uwsgi_cfg:
+            auto_cfg.pop('processes')
+        if any(name.startswith('cheaper-') for name in uwsgi_cfg):
+            auto_cfg = {name: val for name, val in auto_cfg.items() if not name.startswith('cheaper-')}
+
+        tuned = {name: val for name, val in auto_cfg.items() if name not in uwsgi_cfg}
+        cfg = dict(auto_cfg, **uwsgi_cfg)
+        if cheaper and auto_cfg.get('cheaper') != int(cheaper):
+            if 'cheaper' in auto_cfg:
+                cfg['cheaper'] = tuned['cheaper'] = auto_cfg['cheaper']
+            else:
+                cfg.pop('cheaper')
+        return cfg, tuned
+
+    def handoff_config(self, configure: ConfigLoader):
+        """
+        Writes the resolved config into an inherited snapshot and exports its location with ``CONFIG__SNAPSHOT``,
+        so :meth:`~django_docker_helpers.config.ConfigLoader.from_env` in uWSGI workers reads it instead of
+        fetching everything from parsers again. Workers that can't read the snapshot fall back to parsers.
+
+        The handoff is skipped if the config can't be snapshotted, see
+        :meth:`~django_docker_helpers.config.ConfigLoader.snapshot_items`.
+        """
+        if os.environ.get('CONFIG__SNAPSHOT'):
+            return
+
+        from django_docker_helpers.config.snapshot import write_inheritable_snapshot
+
+        try:
+            items = configure.snapshot_items()
+        except ValueError as e:
+            self.stderr.write(f'Config handoff skipped: {e}')
+            return
+
+        os.environ['CONFIG__SNAPSHOT'] = write_inheritable_snapshot(items)
@@ -1,14 +1,18 @@
-import inspect
 import logging
 import os
-import textwrap
+import threading
+import time
 import typing as t
 from collections import deque, namedtuple
-from pprint import pformat
+from functools import lru_cache
 
-from django_docker_helpers.utils import import_from, shred, wf, run_env_once
-from . import exceptions
-from .backends import *
+from django_docker_helpers.profiling import phase, profiled
+from django_docker_helpers.utils import deep_merge, import_from, run_env_once, shred, unflatten_items, wf
+from . import backends, exceptions
+from .backends import BaseParser
+
+if t.TYPE_CHECKING:  # pragma: no cover
+    from .schema import ConfigSchema, ConfigValues
 
 DEFAULT_PARSER_MODULE_PATH = 'django_docker_helpers.config.backends'
 
@@ -22,12 +26,74 @@ DEFAULT_PARSER_MODULES = (
 )
 
 
-def comma_str_to_list(raw_val: str) -> t.List[str]:
-    return list(filter(None, raw_val.split(',')))
+def __getattr__(name: str):
+    # parsers used to be star-imported here; resolve them lazily to keep ``import`` cheap
+    if name in backends.__all__:
+        return getattr(backends, name)
+    if name == 'AsyncConfigLoader':
+        from .async_loader import AsyncConfigLoader
+        return AsyncConfigLoader
+    if name == 'comma_str_to_list':
+        from .coercers import comma_str_to_list
+        return comma_str_to_list
+    raise AttributeError('module {0!r} has no attribute {1!r}'.format(__name__, name))
 
 
 ConfigReadItem = namedtuple('ConfigReadItem', ['variable_path', 'value', 'type', 'is_default', 'parser_name'])
 
+ParserWarmUpResult = namedtuple('ParserWarmUpResult', ['parser_name', 'elapsed', 'error'])
+
+ParserOptionsSchema = namedtuple('ParserOptionsSchema', ['arg_names', 'env_var_names', 'coercers', 'accepted_keys'])
+
+
+def coercer_from_type_hint(type_hint) -> t.Optional[t.Callable]:
+    """
+    Builds a callable that converts a raw environment string into a value of ``type_hint``
+    with :func:`~django_docker_helpers.config.coercers.get_coercer`.
+
+    Supports every registered type (``int``, ``float``, ``bool``, ``str``, ``timedelta``, etc),
+    ``t.Optional[...]`` of them, ``t.List[...]`` (comma-separated), ``t.Dict`` (YAML / JSON mapping)
+    and ``t.Type[...]`` / ``t.Callable`` (dot-separated import path).
+
+    :param type_hint: an ``__init__`` argument annotation
+    :return: a coercer or ``None`` if the value should be passed as is
+    """
+    from .coercers import find_coercer, get_coercer, unwrap_optional
+
+    type_hint = unwrap_optional(type_hint)
+    # plain ``list`` / ``dict`` coercers are constructors, but here values are always strings
+    if type_hint is list:
+        type_hint = t.List[str]
+    elif type_hint is dict:
+        type_hint = t.Dict[str, t.Any]
+
+    if find_coercer(type_hint) is None:
+        return None
+    return get_coercer(type_hint)
+
+
+@lru_cache(maxsize=None)
+def get_parser_options_schema(parser_class: t.Type[BaseParser]) -> ParserOptionsSchema:
+    """
+    Compiles (once per class) the options schema of ``parser_class.__init__``: argument names,
+    environment variable names the arguments are read from and their coercers.
+
+    :param parser_class: a subclass of :class:`~django_docker_helpers.config.backends.base.BaseParser`
+    :return: a cached :class:`ParserOptionsSchema`
+    """
+    import inspect
+
+    spec = inspect.getfullargspec(parser_class.__init__)
+    arg_names = tuple(arg_name for arg_name in spec.args if arg_name != 'self')
+    prefix = parser_class.__name__.upper()
+
+    return ParserOptionsSchema(
+        arg_names=arg_names,
+        env_var_names={arg_name: '{0}__{1}'.format(prefix, arg_name.upper()) for arg_name in arg_names},
+        coercers={arg_name: coercer_from_type_hint(spec.annotations.get(arg_name)) for arg_name in arg_names},
+        accepted_keys=frozenset(arg_names),
+    )
+
 
 class ConfigLoader:
     """
@@ -55,7 +121,11 @@ class ConfigLoader:
                  parsers: t.List[BaseParser],
                  silent: bool = False,
                  suppress_logs: bool = False,
-                 keep_read_records_max: int = 1024):
+                 keep_read_records_max: int = 1024,
+                 negative_cache_ttl: t.Optional[float] = None,
+                 use_bloom_filters: bool = True,
+                 use_key_index: bool = False,
+                 collect_metrics: bool = False):
         """
         Initialization:
             - takes a list of initialized parsers;
@@ -68,6 +138,15 @@ class ConfigLoader:
         :param silent: don't raise exceptions if any read attempt failed
         :param suppress_logs: don't display any exception warnings on screen
         :param keep_read_records_max: max capacity queue length
+        :param negative_cache_ttl: if set, every parser gets a
+         :class:`~django_docker_helpers.config.negative_cache.NegativeLookupCache`: misses are remembered for
+         ``negative_cache_ttl`` seconds and parsers known not to hold a path are skipped
+        :param use_bloom_filters: build bloom filters of existing keys for key-enumerable parsers
+         (only with ``negative_cache_ttl``)
+        :param use_key_index: resolve paths with a merged ``path -> parser`` index of key-enumerable parsers
+         (see :meth:`~django_docker_helpers.config.ConfigLoader.build_key_index`)
+        :param collect_metrics: count lookups and measure latency per parser in ``metrics``
+         (see :class:`~django_docker_helpers.config.metrics.ConfigMetrics`)
         """
         self.parsers = parsers
         self.silent = silent
@@ -75,6 +154,26 @@ class ConfigLoader:
         self.sentinel = object()
         self.logger = logging.getLogger(self.__class__.__name__)
         self.config_read_queue = deque(maxlen=keep_read_records_max)
+        self.warm_up_report = []  # type: t.List[ParserWarmUpResult]
+
+        self.negative_caches = None
+        if negative_cache_ttl:
+            from .negative_cache import NegativeLookupCache
+            self.negative_caches = [
+                NegativeLookupCache(p, ttl=negative_cache_ttl, use_bloom_filter=use_bloom_filters)
+                for p in parsers
+            ]
+
+        self.metrics = None
+        if collect_metrics:
+            from .metrics import ConfigMetrics
+            self.metrics = ConfigMetrics(parsers)
+
+        self.use_key_index = use_key_index
+        self._key_index = None  # type: t.Optional[t.Dict[str, int]]
+        self._parser_items = {}  # type: t.Dict[int, t.Dict[str, t.Any]]
+        self._not_indexed = []  # type: t.List[int]
+        self._case_folded = []  # type: t.List[int]
 
         self.colors_map = {
             'title': '\033[1;35m',
@@ -138,28 +237,616 @@ class ConfigLoader:
         :raises config.exceptions.RequiredValueIsEmpty: if nothing is read,``required``
          flag is set, and there's no ``default`` specified
         """
+        parser_indexes, winner = self.get_query_plan(variable_path, **kwargs)
 
-        for p in self.parsers:
+        for idx in parser_indexes:
+            p = self.parsers[idx]
+            started_at = time.perf_counter() if self.metrics else 0.0
             try:
-                val = p.get(
-                    variable_path, default=self.sentinel,
-                    coerce_type=coerce_type, coercer=coercer,
-                    **kwargs
+                with phase('config.get.{0}', p.__class__.__name__):
+                    val = p.get(
+                        variable_path, default=self.sentinel,
+                        coerce_type=coerce_type, coercer=coercer,
+                        **kwargs
+                    )
+            except Exception as e:
+                self.record_failure(idx, variable_path, e, started_at)
+                continue
+            if self.record_result(idx, variable_path, val, started_at, cache_miss=not kwargs):
+                return val
+
+        return self.get_fallback(winner, variable_path, default=default, required=required,
+                                 coerce_type=coerce_type, coercer=coercer)
+
+    def get_query_plan(self, variable_path: str, **kwargs) -> t.Tuple[t.Iterable[int], t.Optional[int]]:
+        """
+        :meth:`~django_docker_helpers.config.ConfigLoader.get_lookup_plan` that also skips parsers
+        whose negative cache knows ``variable_path`` is missing. Shared by all single-path lookups.
+
+        :param variable_path: a path to variable in config
+        :param kwargs: additional options to all parsers (negative caches are not used if any specified)
+        :return: a tuple ``(parser indexes to query in order, the index of the winning indexed parser or None)``
+        """
+        parser_indexes, winner = self.get_lookup_plan(variable_path, **kwargs)
+        # extra parser options may change a lookup result, so they are never cached
+        negative_caches = None if kwargs else self.negative_caches
+        if negative_caches:
+            parser_indexes = (
+                idx for idx in parser_indexes if not negative_caches[idx].is_known_miss(variable_path)
+            )
+        return parser_indexes, winner
+
+    def record_result(self,
+                      parser_idx: int,
+                      variable_path: str,
+                      val: t.Any,
+                      started_at: float,
+                      cache_miss: bool = True) -> bool:
+        """
+        Records a parser reply to metrics, the read queue and the negative cache.
+
+        :param parser_idx: an index of the queried parser
+        :param variable_path: a path to variable in config
+        :param val: a value returned by the parser, ``sentinel`` if it's missing
+        :param started_at: ``time.perf_counter()`` when the query started
+        :param cache_miss: remember a miss in the negative cache
+        :return: ``True`` if the value is found
+        """
+        found = val is not self.sentinel
+        if self.metrics:
+            self.metrics[parser_idx].observe(time.perf_counter() - started_at, hits=found, misses=not found)
+        if found:
+            self.enqueue(variable_path, self.parsers[parser_idx], val)
+        elif cache_miss and self.negative_caches:
+            self.negative_caches[parser_idx].add_miss(variable_path)
+        return found
+
+    def record_failure(self, parser_idx: int, variable_path: str, e: Exception, started_at: float):
+        """
+        Records a parser error to metrics and logs it. Must be called from an ``except`` block.
+
+        :param parser_idx: an index of the queried parser
+        :param variable_path: a path to variable in config
+        :param e: an exception raised by the parser
+        :param started_at: ``time.perf_counter()`` when the query started
+
+        :raises Exception: re-raises ``e`` if the loader is not ``silent``
+        """
+        if self.metrics:
+            self.metrics[parser_idx].observe(time.perf_counter() - started_at, errors=1)
+        if not self.silent:
+            raise
+        self.log_parser_error(self.parsers[parser_idx], variable_path, e)
+
+    def get_fallback(self,
+                     winner: t.Optional[int],
+                     variable_path: str,
+                     default: t.Optional[t.Any] = None,
+                     required: bool = False,
+                     coerce_type: t.Optional[t.Type] = None,
+                     coercer: t.Optional[t.Callable] = None) -> t.Any:
+        """
+        Returns the indexed value of ``winner`` if any, otherwise ``default``.
+
+        :param winner: the index of the winning indexed parser or ``None``
+        :param variable_path: a path to variable in config
+        :param default: a default value if ``variable_path`` is not present anywhere
+        :param required: raise ``RequiredValueIsEmpty`` if no ``default`` and no result
+        :param coerce_type: cast a result to a specified type
+        :param coercer: perform the type casting with specified callback
+        :return: a value
+        """
+        if winner is not None:
+            return self.get_indexed(winner, variable_path, coerce_type=coerce_type, coercer=coercer)
+        return self.get_default(variable_path, default=default, required=required)
+
+    def get_lookup_plan(self, variable_path: str, **kwargs) -> t.Tuple[t.Sequence[int], t.Optional[int]]:
+        """
+        Decides which parsers have to be queried for ``variable_path``.
+
+        Without the key index every parser is queried in order. With the key index only parsers
+        that can't enumerate their keys and precede the indexed winner are queried.
+
+        :param variable_path: a path to variable in config
+        :param kwargs: additional options to all parsers (the key index is not used if any specified)
+        :return: a tuple ``(parser indexes to query in order, the index of the winning indexed parser or None)``
+        """
+        if not self.use_key_index or kwargs:
+            return range(len(self.parsers)), None
+
+        winner = self.key_index.get(variable_path)
+        # case-insensitive parsers are indexed by lowercased paths
+        for idx in self._case_folded:
+            if winner is not None and idx >= winner:
+                break
+            if self.parsers[idx].fold_key(variable_path) in self._parser_items[idx]:
+                winner = idx
+                break
+
+        if winner is None:
+            return self._not_indexed, None
+        return [idx for idx in self._not_indexed if idx < winner], winner
+
+    def get_indexed(self,
+                    parser_idx: int,
+                    variable_path: str,
+                    coerce_type: t.Optional[t.Type] = None,
+                    coercer: t.Optional[t.Callable] = None) -> t.Any:
+        started_at = time.perf_counter() if self.metrics else 0.0
+        p = self.parsers[parser_idx]
+        val = p.coerce(self._parser_items[parser_idx][p.fold_key(variable_path)],
+                      coerce_type=coerce_type, coercer=coercer)
+        if self.metrics:
+            self.metrics[parser_idx].observe(time.perf_counter() - started_at, hits=1)
+        self.enqueue(variable_path, p, val)
+        return val
+
+    def lookup_many(self,
+                    variable_paths: t.Iterable[str],
+                    coerce_type: t.Optional[t.Type] = None,
+                    coercer: t.Optional[t.Callable] = None,
+                    **kwargs) -> t.Dict[str, t.Tuple[BaseParser, t.Any]]:
+        """
+        Resolves many paths in a single parser-major pass: every parser is asked once with
+        :meth:`~django_docker_helpers.config.backends.base.BaseParser.get_many` for all paths that are still
+        unresolved (so e.g. :class:`~django_docker_helpers.config.backends.MPTRedisParser` does a single ``MGET``).
+        Parsers precedence, negative caches and the key index are respected like in
+        :meth:`~django_docker_helpers.config.ConfigLoader.get`. Nothing is recorded to the read queue.
+
+        :param variable_paths: paths to variables in config
+        :param coerce_type: cast every result to a specified type
+        :param coercer: perform the type casting with specified callback
+        :param kwargs: additional options to all parsers
+        :return: a dict ``{variable_path: (parser, value)}`` of found values only
+        """
+        negative_caches = None if kwargs else self.negative_caches
+        metrics = self.metrics
+        plans = {path: self.get_lookup_plan(path, **kwargs) for path in variable_paths}
+        found = {}
+
+        for idx, p in enumerate(self.parsers):
+            lookup = [
+                path for path, (parser_indexes, _winner) in plans.items()
+                if path not in found and idx in parser_indexes and not (
+                    negative_caches and negative_caches[idx].is_known_miss(path)
                 )
-                if val != self.sentinel:
-                    self.enqueue(variable_path, p, val)
-                    return val
+            ]
+            if not lookup:
+                continue
+
+            started_at = time.perf_counter() if metrics else 0.0
+            try:
+                with phase('config.get_many.{0}', p.__class__.__name__):
+                    values = p.get_many(lookup, coerce_type=coerce_type, coercer=coercer, **kwargs)
             except Exception as e:
+                if metrics:
+                    metrics[idx].observe(time.perf_counter() - started_at, errors=len(lookup))
                 if not self.silent:
                     raise
-                if self.suppress_logs:
+                self.log_parser_error(p, ', '.join(lookup), e)
+                continue
+
+            if metrics:
+                hits = sum(path in values for path in lookup)
+                metrics[idx].observe(time.perf_counter() - started_at, hits=hits, misses=len(lookup) - hits)
+
+            for path in lookup:
+                if path in values:
+                    found[path] = p, values[path]
+                elif negative_caches:
+                    negative_caches[idx].add_miss(path)
+
+        for path, (_parser_indexes, winner) in plans.items():
+            if path not in found and winner is not None:
+                p = self.parsers[winner]
+                if metrics:
+                    metrics[winner].observe(0.0, hits=1)
+                found[path] = p, p.coerce(self._parser_items[winner][p.fold_key(path)],
+                                          coerce_type=coerce_type, coercer=coercer)
+
+        return found
+
+    def get_many(self,
+                 variable_paths: t.Iterable[str],
+                 default: t.Optional[t.Any] = None,
+                 coerce_type: t.Optional[t.Type] = None,
+                 coercer: t.Optional[t.Callable] = None,
+                 **kwargs) -> t.Dict[str, t.Any]:
+        """
+        Reads all ``variable_paths`` with :meth:`~django_docker_helpers.config.ConfigLoader.lookup_many`.
+
+        :param variable_paths: paths to variables in config
+        :param default: a default value for every path that is not present anywhere
+        :param coerce_type: cast every result to a specified type
+        :param coercer: perform the type casting with specified callback
+        :param kwargs: additional options to all parsers
+        :return: a dict ``{variable_path: value}``
+        """
+        variable_paths = list(dict.fromkeys(variable_paths))
+        found = self.lookup_many(variable_paths, coerce_type=coerce_type, coercer=coercer, **kwargs)
+
+        values = {}
+        for path in variable_paths:
+            if path in found:
+                p, values[path] = found[path]
+                self.enqueue(path, p, values[path])
+            else:
+                values[path] = self.get_default(path, default=default)
+        return values
+
+    def resolve_schema(self, schema: t.Type['ConfigSchema']) -> 'ConfigValues':
+        """
+        Resolves a declarative :class:`~django_docker_helpers.config.schema.ConfigSchema` in one batched pass,
+        see :func:`~django_docker_helpers.config.schema.resolve_schema`.
+
+        :param schema: a ``ConfigSchema`` subclass
+        :return: an immutable :class:`~django_docker_helpers.config.schema.ConfigValues` instance
+
+        :raises config.exceptions.SchemaValidationError: with all coercion errors and empty required values
+        """
+        from .schema import resolve_schema
+
+        return resolve_schema(self, schema)
+
+    def get_section(self,
+                    variable_path: str,
+                    default: t.Optional[t.Any] = None,
+                    required: bool = False,
+                    **kwargs):
+        """
+        Reads a ``variable_path`` section from **every** parser and deep-merges the results respecting parsers
+        precedence, so single overridden values (like ``PROJECT__DB__HOST``) are applied over the whole ``db``
+        section of a less prioritized parser.
+
+        A parser contributes a section if its value for ``variable_path`` is a dict. If it has no value at all
+        and it's key-enumerable (see :meth:`~django_docker_helpers.config.backends.base.BaseParser.iter_items`)
+        its nested paths are collected into a dict instead. Non-dict values are ignored.
+
+        Keys of case-insensitive parsers (environment) override existing keys regardless of case and keep
+        their original spelling: ``DATABASES__DEFAULT__HOST`` replaces ``databases.default.HOST``.
+
+        The result shares unchanged sub-dicts with parsers' data (see :func:`~django_docker_helpers.utils.deep_merge`),
+        treat it as read-only. Values are not coerced: environment overrides are strings.
+
+        :param variable_path: a path to a section in config
+        :param default: a default value if ``variable_path`` is not present anywhere
+        :param required: raise ``RequiredValueIsEmpty`` if no ``default`` and no result
+        :param kwargs: additional options to all parsers
+        :return: a merged dict or ``default``
+
+        :raises config.exceptions.RequiredValueIsEmpty: if nothing is read,``required``
+         flag is set, and there's no ``default`` specified
+        """
+        sections = []
+        for idx, p in enumerate(self.parsers):
+            try:
+                section = self._read_section(idx, variable_path, **kwargs)
+            except Exception as e:
+                if not self.silent:
+                    raise
+                self.log_parser_error(p, variable_path, e)
+                continue
+            if section is not None:
+                sections.append((p, section))
+
+        if not sections:
+            return self.get_default(variable_path, default=default, required=required)
+
+        merged = {}
+        # parsers with a lower precedence go first to be overwritten
+        for p, section in reversed(sections):
+            merged = deep_merge(merged, section, case_insensitive=not p.case_sensitive_keys)
+
+        self.enqueue(variable_path, sections[0][0], merged)
+        return merged
+
+    def lazy(self,
+             variable_path: str,
+             default: t.Optional[t.Any] = None,
+             coerce_type: t.Optional[t.Type] = None,
+             coercer: t.Optional[t.Callable] = None,
+             required: bool = False,
+             **kwargs):
+        """
+        A lazy counterpart of :meth:`~django_docker_helpers.config.ConfigLoader.get`: nothing is read until
+        the returned value is used for the first time, the result is cached afterwards. Useful in ``settings.py``
+        for options used only by some management commands or code paths. Errors (and
+        ``RequiredValueIsEmpty``) are raised on the first use as well.
+
+        Example:
+        ::
+
+            SECRET_KEY = configure.lazy('secret_key', required=True)
+            SENTRY_DSN = configure.lazy('sentry.dsn')
+
+        :param variable_path: a path to variable in config
+        :param default: a default value if ``variable_path`` is not present anywhere
+        :param coerce_type: cast a result to a specified type
+        :param coercer: perform the type casting with specified callback
+        :param required: raise ``RequiredValueIsEmpty`` if no ``default`` and no result
+        :param kwargs: additional options to all parsers
+        :return: a :class:`~django_docker_helpers.config.lazy.LazyConfigValue` proxy
+        """
+        from .lazy import LazyConfigValue
+
+        return LazyConfigValue(lambda: self.get(
+            variable_path, default=default,
+            coerce_type=coerce_type, coercer=coercer,
+            required=required,
+            **kwargs
+        ))
+
+    def lazy_section(self,
+                     variable_path: str,
+                     default: t.Optional[t.Any] = None,
+                     required: bool = False,
+                     **kwargs):
+        """
+        Marks a whole section lazy: it's read with :meth:`~django_docker_helpers.config.ConfigLoader.get_section`
+        (a single deep-merged read across all parsers) on the first access to any of its keys.
+
+        Example:
+        ::
+
+            CACHES = configure.lazy_section('caches')
+            AWS = configure.lazy_section('aws', default={})
+            AWS_SECRET_ACCESS_KEY = configure.lazy('aws.secret_access_key')
+
+        :param variable_path: a path to a section in config
+        :param default: a default value if ``variable_path`` is not present anywhere
+        :param required: raise ``RequiredValueIsEmpty`` if no ``default`` and no result
+        :param kwargs: additional options to all parsers
+        :return: a :class:`~django_docker_helpers.config.lazy.LazyConfigValue` proxy
+        """
+        from .lazy import LazyConfigValue
+
+        return LazyConfigValue(lambda: self.get_section(variable_path, default=default, required=required, **kwargs))
+
+    def _read_section(self, parser_idx: int, variable_path: str, **kwargs) -> t.Optional[dict]:
+        p = self.parsers[parser_idx]
+        val = p.get(variable_path, default=self.sentinel, **kwargs)
+        if val is not self.sentinel:
+            return val if isinstance(val, dict) else None
+
+        if self._key_index is not None and parser_idx in self._parser_items:
+            prefix = p.fold_key(variable_path) + p.path_separator
+            items = [
+                (path[len(prefix):], value)
+                for path, value in self._parser_items[parser_idx].items() if path.startswith(prefix)
+            ]
+        else:
+            try:
+                items = p.iter_section_items(variable_path)
+            except NotImplementedError:
+                return None
+
+        section = unflatten_items(items, separator=p.path_separator)
+        return section or None
+
+    @property
+    def key_index(self) -> t.Dict[str, int]:
+        """
+        A merged ``path -> parser index`` mapping, built on the first access.
+        """
+        if self._key_index is None:
+            self.build_key_index()
+        return self._key_index
+
+    @property
+    def non_enumerable_parsers(self) -> t.List[BaseParser]:
+        """
+        Parsers that can't enumerate their keys (or failed to in ``silent`` mode): they are neither
+        indexed nor snapshotted. Builds the key index if it's not built yet.
+        """
+        if self._key_index is None:
+            self.build_key_index()
+        return [self.parsers[idx] for idx in self._not_indexed]
+
+    def _fetch_parser_items(self, parser_idx: int) -> t.Optional[t.Dict[str, t.Any]]:
+        p = self.parsers[parser_idx]
+        try:
+            return dict(p.iter_items())
+        except NotImplementedError:
+            return None
+        except Exception as e:
+            if not self.silent:
+                raise
+            self.log_parser_error(p, '*', e)
+            return None
+
+    @profiled('config.build_key_index')
+    def build_key_index(self):
+        """
+        Builds a merged ``path -> parser`` index respecting parsers precedence with
+        :meth:`~django_docker_helpers.config.backends.base.BaseParser.iter_items` of every key-enumerable parser
+        (YAML, environment snapshot, prefetched MPT, etc). After that
+        :meth:`~django_docker_helpers.config.ConfigLoader.get` is a single dict lookup plus coercion.
+
+        Parsers that can't enumerate their keys (or failed to in ``silent`` mode) are queried as usual
+        in their order. Indexed parsers' values are snapshots: use
+        :meth:`~django_docker_helpers.config.ConfigLoader.reload` to pick up changes.
+        """
+        parser_items = {}
+        not_indexed = []
+        for idx in range(len(self.parsers)):
+            items = self._fetch_parser_items(idx)
+            if items is None:
+                not_indexed.append(idx)
+            else:
+                parser_items[idx] = items
+
+        key_index = {}
+        # parsers with a lower precedence go first to be overwritten
+        for idx in sorted(parser_items, reverse=True):
+            key_index.update(dict.fromkeys(parser_items[idx], idx))
+
+        self._parser_items = parser_items
+        self._not_indexed = not_indexed
+        self._case_folded = self._get_case_folded(parser_items)
+        self._key_index = key_index
+
+    def _get_case_folded(self, parser_items: t.Dict[int, t.Dict[str, t.Any]]) -> t.List[int]:
+        return [idx for idx in sorted(parser_items) if not self.parsers[idx].case_sensitive_keys]
+
+    def _reindex_parser(self, parser_idx: int):
+        items = self._fetch_parser_items(parser_idx)
+
+        parser_items = dict(self._parser_items)
+        old_items = parser_items.pop(parser_idx, {})
+        if items is None:
+            self._not_indexed = sorted(set(self._not_indexed) | {parser_idx})
+        else:
+            parser_items[parser_idx] = items
+            self._not_indexed = [idx for idx in self._not_indexed if idx != parser_idx]
+
+        order = sorted(parser_items)
+        key_index = dict(self._key_index)
+        for path in set(old_items).union(items or ()):
+            winner = next((idx for idx in order if path in parser_items[idx]), None)
+            if winner is None:
+                key_index.pop(path, None)
+            else:
+                key_index[path] = winner
+
+        self._parser_items = parser_items
+        self._case_folded = self._get_case_folded(parser_items)
+        self._key_index = key_index
+
+    def reload(self, parser: t.Optional[BaseParser] = None):
+        """
+        Reloads ``parser`` (or every parser) with :meth:`~django_docker_helpers.config.backends.base.BaseParser.reload`,
+        drops its negative cache and incrementally updates the key index: only paths the parser held before
+        or holds now are re-resolved.
+
+        :param parser: a parser to reload, ``None`` reloads all parsers
+        """
+        for idx, p in enumerate(self.parsers):
+            if parser is not None and p is not parser:
+                continue
+
+            p.reload()
+            if self.negative_caches:
+                self.negative_caches[idx].invalidate()
+            if self._key_index is not None:
+                self._reindex_parser(idx)
+
+    def release_buffers(self):
+        """
+        Drops raw config copies of all parsers with
+        :meth:`~django_docker_helpers.config.backends.base.BaseParser.release_buffers`.
+        Parsed values are kept, so call it after :meth:`~django_docker_helpers.config.ConfigLoader.warm_up`.
+        """
+        for p in self.parsers:
+            p.release_buffers()
+
+    def snapshot_items(self) -> t.List[t.Tuple[str, t.Any]]:
+        """
+        Collects values of all parsers resolved the same way :meth:`~django_docker_helpers.config.ConfigLoader.get`
+        resolves them: a path is taken from the first parser holding it (case-insensitive parsers match it
+        ignoring case). Nested values are stored separately and
+        :class:`~django_docker_helpers.config.backends.SnapshotParser` assembles sections from them, a section
+        is stored as a whole only if a nested value is taken from another parser: ``get('db')`` returns
+        the section of the parser holding ``db``, not a merged one.
+
+        :return: a list of ``(variable_path, value)``
+
+        :raises ValueError: if a parser can't enumerate its keys (its values would be lost),
+         or if there's an unscoped :class:`~django_docker_helpers.config.backends.EnvironmentParser`
+         (every variable of the process environment, secrets included, would be written)
+        """
+        from .backends.environment_parser import EnvironmentParser
+
+        for p in self.parsers:
+            if isinstance(p, EnvironmentParser) and not p.scope:
+                raise ValueError('{0}: an unscoped EnvironmentParser would snapshot '
+                                 'the whole process environment'.format(p))
+        non_enumerable_parsers = self.non_enumerable_parsers
+        if non_enumerable_parsers:
+            raise ValueError('{0}: parsers cannot enumerate their keys and cannot be snapshotted'.format(
+                ', '.join(str(p) for p in non_enumerable_parsers)
+            ))
+
+        order = sorted(self._parser_items)
+        resolved = {}  # type: t.Dict[str, t.Tuple[int, t.Any]]
+        for idx in order:
+            for variable_path in self._parser_items[idx]:
+                if variable_path in resolved:
                     continue
-                self.logger.error('Parser {0} cannot get key `{1}`: {2}'.format(
-                    p.__class__.__name__,
-                    variable_path,
-                    str(e)
-                ))
+                for winner in order:
+                    key = self.parsers[winner].fold_key(variable_path)
+                    if key in self._parser_items[winner]:
+                        resolved[variable_path] = winner, self._parser_items[winner][key]
+                        break
+
+        overridden_sections = set()
+        for variable_path, (winner, _val) in resolved.items():
+            separator = self.parsers[winner].path_separator
+            parts = variable_path.split(separator)
+            for i in range(1, len(parts)):
+                section_path = separator.join(parts[:i])
+                if section_path in resolved and resolved[section_path][0] != winner:
+                    overridden_sections.add(section_path)
+
+        items = []
+        for variable_path, (_winner, val) in resolved.items():
+            if isinstance(val, dict) and val and variable_path not in overridden_sections:
+                continue
+            items.append((variable_path, val))
+        return items
 
+    def write_snapshot(self, path: str) -> int:
+        """
+        Writes :meth:`~django_docker_helpers.config.ConfigLoader.snapshot_items` into a compact read-only snapshot
+        for :class:`~django_docker_helpers.config.backends.SnapshotParser`.
+
+        :param path: a snapshot file path, it's replaced atomically
+        :return: a number of stored values
+        """
+        from .snapshot import write_snapshot
+
+        items = self.snapshot_items()
+        write_snapshot(path, items)
+        return len(items)
+
+    @property
+    def remote_calls_avoided(self) -> int:
+        """
+        :return: a number of skipped lookups to parsers doing a network round trip per lookup
+         (:attr:`~django_docker_helpers.config.backends.base.BaseParser.remote_lookups`)
+        """
+        if not self.negative_caches:
+            return 0
+        return sum(cache.avoided for cache in self.negative_caches if cache.parser.remote_lookups)
+
+    def negative_cache_stats(self) -> t.List[t.Dict[str, t.Any]]:
+        """
+        :return: per-parser negative cache counters in parsers order
+        """
+        return [
+            {
+                'parser': str(cache.parser),
+                'avoided': cache.avoided,
+                'misses': len(cache.misses),
+                'bloom_filter': cache.bloom_filter is not None,
+            }
+            for cache in self.negative_caches or []
+        ]
+
+    def log_parser_error(self, parser: BaseParser, variable_path: str, error: Exception):
+        if self.suppress_logs:
+            return
+        self.logger.error('Parser {0} cannot get key `{1}`: {2}'.format(
+            parser.__class__.__name__,
+            variable_path,
+            str(error)
+        ))
+
+    def get_default(self, variable_path: str, default: t.Optional[t.Any] = None, required: bool = False):
+        """
+        Records a read of ``default`` for ``variable_path`` when no parser has a value for it.
+
+        :raises config.exceptions.RequiredValueIsEmpty: if ``required`` flag is set and there's no ``default``
+        """
         self.enqueue(variable_path, value=default)
 
         if not default and required:
@@ -168,6 +855,68 @@ class ConfigLoader:
 
         return default
 
+    @profiled('config.warm_up')
+    def warm_up(self, timeout: t.Optional[float] = None, attempts: int = 1) -> t.List[ParserWarmUpResult]:
+        """
+        Concurrently initializes clients and loads config bundles of all parsers
+        (see :meth:`~django_docker_helpers.config.backends.base.BaseParser.warm_up`),
+        so the boot time is bounded by the slowest backend instead of the sum of all of them.
+
+        Every parser is warmed up in its own daemon thread. Parsers that didn't finish in ``timeout``
+        are reported with a ``TimeoutError`` and keep initializing in background (or on the first ``get``).
+        Warm-up errors are logged (unless ``suppress_logs`` is set) and never raised: a broken parser
+        fails the same way it did before on ``get``.
+
+        Failed warm-ups (e.g. a remote backend that is not ready yet) are retried up to ``attempts`` times
+        within ``timeout``, spaced with :class:`~django_docker_helpers.retry.RetrySchedule`.
+
+        :param timeout: a global deadline in seconds for all parsers, ``None`` waits forever
+        :param attempts: a max number of warm-up attempts per parser
+        :return: a list of :class:`ParserWarmUpResult` in parsers order, also stored in ``warm_up_report``
+        """
+        from django_docker_helpers.retry import RetrySchedule
+
+        results = {}
+
+        def _warm_up(_parser: BaseParser):
+            started_at = time.monotonic()
+            error = None
+            for _attempt in RetrySchedule(deadline=timeout, max_attempts=attempts):
+                try:
+                    with phase('config.warm_up.{0}', _parser.__class__.__name__):
+                        _parser.warm_up()
+                    error = None
+                    break
+                except Exception as e:
+                    error = e
+            results[id(_parser)] = ParserWarmUpResult(str(_parser), time.monotonic() - started_at, error)
+
+        threads = [
+            threading.Thread(target=_warm_up, args=(p,), name='warm-up:{0}'.format(p.__class__.__name__), daemon=True)
+            for p in self.parsers
+        ]
+        started_at = time.monotonic()
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join(None if timeout is None else max(0.0, started_at + timeout - time.monotonic()))
+
+        report = []
+        for p in self.parsers:
+            result = results.get(id(p))
+            if result is None:
+                result = ParserWarmUpResult(
+                    str(p), time.monotonic() - started_at,
+                    TimeoutError('Warm-up did not finish in {0}s'.format(timeout))
+                )
+            if result.error is not None and not self.suppress_logs:
+                self.logger.warning('Parser {0} warm-up failed: {1}'.format(p.__class__.__name__, result.error))
+            report.append(result)
+
+        self.warm_up_report = report
+        return report
+
     @staticmethod
     def import_parsers(parser_modules: t.Iterable[str]) -> t.Generator[t.Type[BaseParser], None, None]:
         """
@@ -226,51 +975,36 @@ class ConfigLoader:
             assert res == {'endpoint': 'go.deep', 'host': 'my-host', 'port': 66}
         """
         env = env or os.environ
-        sentinel = object()
-        spec: inspect.FullArgSpec = inspect.getfullargspec(parser_class.__init__)
-        environment_parser = EnvironmentParser(scope=parser_class.__name__.upper(), env=env)
-
-        stop_args = ['self']
-        safe_types = [int, bool, str]
+        schema = get_parser_options_schema(parser_class)
 
         init_args = {}
 
-        for arg_name in spec.args:
-            if arg_name in stop_args:
-                continue
-
-            type_hint = spec.annotations.get(arg_name)
-            coerce_type = None
-
-            if type_hint in safe_types:
-                coerce_type = type_hint
-            elif hasattr(type_hint, '__args__'):
-                if len(type_hint.__args__) == 1:  # one type
-                    if type_hint.__args__[0] in safe_types:
-                        coerce_type = type_hint.__args__[0]
-                elif len(type_hint.__args__) == 2:  # t.Optional
-                    try:
-                        _args = list(type_hint.__args__)
-                        _args.remove(type(None))
-                        if _args[0] in safe_types:
-                            coerce_type = _args[0]
-                    except ValueError:
-                        pass
-
-            val = environment_parser.get(arg_name, sentinel, coerce_type=coerce_type)
-            if val is sentinel:
+        for arg_name in schema.arg_names:
+            val = env.get(schema.env_var_names[arg_name])
+            if val is None:
                 continue
 
-            init_args[arg_name] = val
+            coercer = schema.coercers[arg_name]
+            init_args[arg_name] = coercer(val) if coercer else val
 
         return init_args
 
-    @staticmethod
-    def from_env(parser_modules: t.Optional[t.Union[t.List[str], t.Tuple[str]]] = DEFAULT_PARSER_MODULES,
+    @classmethod
+    @profiled('config.from_env')
+    def from_env(cls,
+                 parser_modules: t.Optional[t.Union[t.List[str], t.Tuple[str]]] = DEFAULT_PARSER_MODULES,
                  env: t.Optional[t.Dict[str, str]] = None,
                  silent: bool = False,
                  suppress_logs: bool = False,
-                 extra: t.Optional[dict] = None) -> 'ConfigLoader':
+                 extra: t.Optional[dict] = None,
+                 warm_up: bool = False,
+                 warm_up_timeout: t.Optional[float] = None,
+                 negative_cache_ttl: t.Optional[float] = None,
+                 use_key_index: bool = False,
+                 snapshot: t.Optional[str] = None,
+                 snapshot_ttl: t.Optional[float] = None,
+                 warm_up_attempts: int = 1,
+                 collect_metrics: bool = False) -> 'ConfigLoader':
         """
         Creates an instance of :class:`~django_docker_helpers.config.ConfigLoader`
         with parsers initialized from environment variables.
@@ -284,6 +1018,23 @@ class ConfigLoader:
         :param silent: passed to :class:`~django_docker_helpers.config.ConfigLoader`
         :param suppress_logs: passed to :class:`~django_docker_helpers.config.ConfigLoader`
         :param extra: pass extra arguments to *every* parser
+        :param warm_up: run :meth:`~django_docker_helpers.config.ConfigLoader.warm_up` on the created loader,
+         may be set with ``CONFIG__WARM_UP`` environment variable
+        :param warm_up_timeout: a warm-up deadline in seconds, may be set with ``CONFIG__WARM_UP_TIMEOUT``
+        :param negative_cache_ttl: passed to :class:`~django_docker_helpers.config.ConfigLoader`,
+         may be set with ``CONFIG__NEGATIVE_CACHE_TTL``
+        :param use_key_index: passed to :class:`~django_docker_helpers.config.ConfigLoader`,
+         may be set with ``CONFIG__USE_KEY_INDEX``
+        :param snapshot: a snapshot file path, may be set with ``CONFIG__SNAPSHOT``. If the snapshot is missing
+         (or older than ``snapshot_ttl``) the first process resolves the config with parsers and writes it
+         with :meth:`~django_docker_helpers.config.ConfigLoader.write_snapshot` while others wait on a lock.
+         After that the loader reads with a single :class:`~django_docker_helpers.config.backends.SnapshotParser`,
+         so pre-forked workers don't hit remote backends and share the snapshot pages
+        :param snapshot_ttl: max snapshot age in seconds, may be set with ``CONFIG__SNAPSHOT_TTL``;
+         default is forever: remove the snapshot file to refresh it
+        :param warm_up_attempts: max warm-up attempts per parser, may be set with ``CONFIG__WARM_UP_ATTEMPTS``
+        :param collect_metrics: passed to :class:`~django_docker_helpers.config.ConfigLoader`,
+         may be set with ``CONFIG__COLLECT_METRICS``
         :return: an instance of :class:`~django_docker_helpers.config.ConfigLoader`
 
         Example:
@@ -304,13 +1055,28 @@ class ConfigLoader:
             loader = ConfigLoader.from_env(parser_modules=['EnvironmentParser'], env={})
 
         """
+        from .backends.environment_parser import EnvironmentParser
+
         env = env or os.environ
         extra = extra or {}
         environment_parser = EnvironmentParser(scope='config', env=env)
         silent = environment_parser.get('silent', silent, coerce_type=bool)
         suppress_logs = environment_parser.get('suppress_logs', suppress_logs, coerce_type=bool)
-
-        env_parsers = environment_parser.get('parsers', None, coercer=comma_str_to_list)
+        warm_up = environment_parser.get('warm_up', warm_up, coerce_type=bool)
+        warm_up_timeout = environment_parser.get('warm_up_timeout', warm_up_timeout, coerce_type=float)
+        warm_up_attempts = environment_parser.get('warm_up_attempts', warm_up_attempts, coerce_type=int)
+        negative_cache_ttl = environment_parser.get('negative_cache_ttl', negative_cache_ttl, coerce_type=float)
+        use_key_index = environment_parser.get('use_key_index', use_key_index, coerce_type=bool)
+        snapshot = environment_parser.get('snapshot', snapshot)
+        snapshot_ttl = environment_parser.get('snapshot_ttl', snapshot_ttl, coerce_type=float)
+        collect_metrics = environment_parser.get('collect_metrics', collect_metrics, coerce_type=bool)
+        loader_options = dict(
+            silent=silent, suppress_logs=suppress_logs,
+            negative_cache_ttl=negative_cache_ttl, use_key_index=use_key_index,
+            collect_metrics=collect_metrics,
+        )
+
+        env_parsers = environment_parser.get('parsers', None, coerce_type=t.List[str])
         if not env_parsers and not parser_modules:
             raise ValueError('Must specify `CONFIG__PARSERS` env var or `parser_modules`')
 
@@ -324,19 +1090,65 @@ class ConfigLoader:
         for parser_class in parser_classes:
             parser_options = ConfigLoader.load_parser_options_from_env(parser_class, env=env)
 
-            _init_args = inspect.getfullargspec(parser_class.__init__).args
+            accepted_keys = get_parser_options_schema(parser_class).accepted_keys
             # add extra args if parser's __init__ can take it it
-            if 'env' in _init_args:
+            if 'env' in accepted_keys:
                 parser_options['env'] = env
 
             for k, v in extra.items():
-                if k in _init_args:
+                if k in accepted_keys:
                     parser_options[k] = v
 
             parser_instance = parser_class(**parser_options)
             parsers.append(parser_instance)
 
-        return ConfigLoader(parsers=parsers, silent=silent, suppress_logs=suppress_logs)
+        if snapshot:
+            return cls._from_snapshot(snapshot, snapshot_ttl, parsers, loader_options,
+                                      warm_up, warm_up_timeout, warm_up_attempts)
+
+        loader = cls(parsers=parsers, **loader_options)
+        if warm_up:
+            loader.warm_up(timeout=warm_up_timeout, attempts=warm_up_attempts)
+        return loader
+
+    @classmethod
+    def _from_snapshot(cls,
+                       snapshot: str,
+                       snapshot_ttl: t.Optional[float],
+                       parsers: t.List[BaseParser],
+                       loader_options: dict,
+                       warm_up: bool = False,
+                       warm_up_timeout: t.Optional[float] = None,
+                       warm_up_attempts: int = 1) -> 'ConfigLoader':
+        from .backends.snapshot_parser import SnapshotParser
+        from .snapshot import is_fresh_snapshot, is_inherited_snapshot, snapshot_lock
+
+        if is_inherited_snapshot(snapshot):
+            # a handed off snapshot is read-only, there's nothing to lock or rewrite
+            if is_fresh_snapshot(snapshot):
+                return cls(parsers=[SnapshotParser(config=snapshot)], **loader_options)
+
+            # e.g. the descriptor was not inherited by this process
+            if not loader_options['suppress_logs']:
+                logging.getLogger(cls.__name__).warning(
+                    'Inherited config snapshot `{0}` is not usable, reading config from parsers'.format(snapshot)
+                )
+            loader = cls(parsers=parsers, **loader_options)
+            if warm_up:
+                loader.warm_up(timeout=warm_up_timeout, attempts=warm_up_attempts)
+            return loader
+
+        if not is_fresh_snapshot(snapshot, snapshot_ttl):
+            with snapshot_lock(snapshot):
+                # another process may have written it while we were waiting
+                if not is_fresh_snapshot(snapshot, snapshot_ttl):
+                    loader = cls(parsers=parsers, silent=loader_options['silent'],
+                                 suppress_logs=loader_options['suppress_logs'])
+                    if warm_up:
+                        loader.warm_up(timeout=warm_up_timeout, attempts=warm_up_attempts)
+                    loader.write_snapshot(snapshot)
+
+        return cls(parsers=[SnapshotParser(config=snapshot)], **loader_options)
 
     def _colorize(self, name: str, value: str, use_color: bool = False) -> str:
         if not use_color:
@@ -350,6 +1162,9 @@ class ConfigLoader:
 
     @staticmethod
     def _pformat(raw_obj: t.Union[str, t.Any], width: int = 50) -> str:
+        import textwrap
+        from pprint import pformat
+
         raw_str = str(raw_obj)
         if len(raw_str) <= width:
             return raw_obj
@@ -0,0 +1,122 @@
+import asyncio
+import time
+import typing as t
+
+from django_docker_helpers.config import ConfigLoader
+from django_docker_helpers.config.backends.async_base import AsyncBaseParser
+from django_docker_helpers.profiling import phase
+
+
+class AsyncConfigLoader(ConfigLoader):
+    """
+    :class:`~django_docker_helpers.config.ConfigLoader` that can read config options
+    without blocking the event loop, e.g. in Django async views or Channels consumers.
+
+    Parsers are queried in the same order as in :meth:`~django_docker_helpers.config.ConfigLoader.get`.
+    Async parsers (:class:`~django_docker_helpers.config.backends.async_base.AsyncBaseParser` subclasses) are
+    awaited, sync-only parsers (like :class:`~django_docker_helpers.config.backends.YamlParser` or
+    :class:`~django_docker_helpers.config.backends.EnvironmentParser`) are called directly since they
+    never do I/O once loaded.
+
+    The synchronous :meth:`~django_docker_helpers.config.ConfigLoader.get` is still available.
+
+    .. note::
+
+        With ``negative_cache_ttl`` bloom filters are built with the synchronous
+        :meth:`~django_docker_helpers.config.backends.base.BaseParser.keys` once per ``ttl``,
+        pass ``use_bloom_filters=False`` to never block the event loop. The same applies to ``use_key_index``:
+        call :meth:`~django_docker_helpers.config.ConfigLoader.build_key_index` before serving requests.
+
+    Example:
+    ::
+
+        configure = AsyncConfigLoader(parsers=[
+            EnvironmentParser(scope='project'),
+            AsyncMPTRedisParser(host=REDIS_HOST, port=REDIS_PORT, scope='project'),
+            YamlParser(config='./tests/data/config.yml', scope='project'),
+        ])
+
+        async def view(request):
+            flag = await configure.aget('features.new_ui', coerce_type=bool)
+            limits = await configure.aget_many(['limits.rps', 'limits.burst'], coerce_type=int)
+    """
+    async def aget(self,
+                   variable_path: str,
+                   default: t.Optional[t.Any] = None,
+                   coerce_type: t.Optional[t.Type] = None,
+                   coercer: t.Optional[t.Callable] = None,
+                   required: bool = False,
+                   **kwargs):
+        """
+        An async counterpart of :meth:`~django_docker_helpers.config.ConfigLoader.get`.
+
+        :param variable_path: a path to variable in config
+        :param default: a default value if ``variable_path`` is not present anywhere
+        :param coerce_type: cast a result to a specified type
+        :param coercer: perform the type casting with specified callback
+        :param required: raise ``RequiredValueIsEmpty`` if no ``default`` and no result
+        :param kwargs: additional options to all parsers
+        :return: **the first successfully read** value from the list of parser instances or ``default``
+
+        :raises config.exceptions.RequiredValueIsEmpty: if nothing is read,``required``
+         flag is set, and there's no ``default`` specified
+        """
+        parser_indexes, winner = self.get_query_plan(variable_path, **kwargs)
+
+        for idx in parser_indexes:
+            p = self.parsers[idx]
+            started_at = time.perf_counter() if self.metrics else 0.0
+            try:
+                with phase('config.get.{0}', p.__class__.__name__):
+                    if isinstance(p, AsyncBaseParser):
+                        val = await p.aget(
+                            variable_path, default=self.sentinel,
+                            coerce_type=coerce_type, coercer=coercer,
+                            **kwargs
+                        )
+                    else:
+                        val = p.get(
+                            variable_path, default=self.sentinel,
+                            coerce_type=coerce_type, coercer=coercer,
+                            **kwargs
+                        )
+            except Exception as e:
+                self.record_failure(idx, variable_path, e, started_at)
+                continue
+            if self.record_result(idx, variable_path, val, started_at, cache_miss=not kwargs):
+                return val
+
+        return self.get_fallback(winner, variable_path, default=default, required=required,
+                                 coerce_type=coerce_type, coercer=coercer)
+
+    async def aget_many(self,
+                        variable_paths: t.Iterable[str],
+                        default: t.Optional[t.Any] = None,
+                        coerce_type: t.Optional[t.Type] = None,
+                        coercer: t.Optional[t.Callable] = None,
+                        **kwargs) -> t.Dict[str, t.Any]:
+        """
+        Concurrently reads all ``variable_paths`` with
+        :meth:`~django_docker_helpers.config.async_loader.AsyncConfigLoader.aget`.
+
+        :param variable_paths: paths to variables in config
+        :param default: a default value for every path that is not present anywhere
+        :param coerce_type: cast every result to a specified type
+        :param coercer: perform the type casting with specified callback
+        :param kwargs: additional options to all parsers
+        :return: a dict ``{variable_path: value}``
+        """
+        variable_paths = list(variable_paths)
+        values = await asyncio.gather(*[
+            self.aget(variable_path, default=default, coerce_type=coerce_type, coercer=coercer, **kwargs)
+            for variable_path in variable_paths
+        ])
+        return dict(zip(variable_paths, values))
+
+    async def aclose(self):
+        """
+        Closes async clients of all async parsers.
+        """
+        for p in self.parsers:
+            if isinstance(p, AsyncBaseParser):
+                await p.aclose()
@@ -1,10 +1,21 @@
+import importlib
+import typing as t
+
 from .base import BaseParser
-from .consul_parser import ConsulParser
-from .environment_parser import EnvironmentParser
-from .mpt_consul_parser import MPTConsulParser
-from .mpt_redis_parser import MPTRedisParser
-from .redis_parser import RedisParser
-from .yaml_parser import YamlParser
+
+# parser class name -> module name; parsers are imported on the first attribute access
+_PARSER_MODULES = {
+    'AsyncBaseParser': 'async_base',
+    'AsyncMPTConsulParser': 'async_mpt_consul_parser',
+    'AsyncMPTRedisParser': 'async_mpt_redis_parser',
+    'ConsulParser': 'consul_parser',
+    'EnvironmentParser': 'environment_parser',
+    'MPTConsulParser': 'mpt_consul_parser',
+    'MPTRedisParser': 'mpt_redis_parser',
+    'RedisParser': 'redis_parser',
+    'SnapshotParser': 'snapshot_parser',
+    'YamlParser': 'yaml_parser',
+}
 
 __all__ = [
     'BaseParser',
@@ -17,4 +28,24 @@ __all__ = [
 
     'ConsulParser',
     'RedisParser',
+
+    'SnapshotParser',
+
+    'AsyncBaseParser',
+    'AsyncMPTConsulParser',
+    'AsyncMPTRedisParser',
 ]
+
+
+def __getattr__(name: str) -> t.Type[BaseParser]:
+    module_name = _PARSER_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError('module {0!r} has no attribute {1!r}'.format(__name__, name))
+
+    parser_class = getattr(importlib.import_module('.' + module_name, __name__), name)
+    globals()[name] = parser_class
+    return parser_class
+
+
+def __dir__() -> t.List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,87 @@
+import asyncio
+import typing as t
+
+from django_docker_helpers.config.backends.base import BaseParser
+
+
+class AsyncBaseParser(BaseParser):
+    """
+    Base class to inherit from in parsers that can read config options without blocking the event loop.
+
+    An async parser is still a regular parser: its synchronous
+    :meth:`~django_docker_helpers.config.backends.base.BaseParser.get` keeps working with a synchronous
+    ``client`` (e.g. while ``settings.py`` is imported), and
+    :meth:`~django_docker_helpers.config.backends.async_base.AsyncBaseParser.aget` uses a separate
+    ``aclient`` created with :meth:`~django_docker_helpers.config.backends.async_base.AsyncBaseParser.get_async_client`.
+
+    .. note::
+
+        Async clients are bound to the event loop they were created in, so the ``aclient`` is created on the first
+        :meth:`~django_docker_helpers.config.backends.async_base.AsyncBaseParser.aget` call and is created again
+        when it's used from another event loop (e.g. every ``asgiref.sync.async_to_sync`` call runs its own loop).
+    """
+    # class attributes keep ``__init__`` signatures of concrete parsers intact for ``ConfigLoader.from_env``
+    _aclient = None
+    _aclient_loop = None
+
+    async def aget(self,
+                   variable_path: str,
+                   default: t.Optional[t.Any] = None,
+                   coerce_type: t.Optional[t.Type] = None,
+                   coercer: t.Optional[t.Callable] = None,
+                   **kwargs):
+        """
+        An async counterpart of :meth:`~django_docker_helpers.config.backends.base.BaseParser.get`.
+        Inherited method should take all specified arguments.
+
+        :param variable_path: a delimiter-separated path to a nested value
+        :param default: default value if there's no object by specified path
+        :param coerce_type: cast a type of a value to a specified one
+        :param coercer: perform a type casting with specified callback
+        :param kwargs: additional arguments inherited parser may need
+        :return: value or default
+        """
+        raise NotImplementedError
+
+    @property
+    def aclient(self):
+        """
+        Helper property to lazy initialize and cache an async client for the running event loop. Runs
+        :meth:`~django_docker_helpers.config.backends.async_base.AsyncBaseParser.get_async_client`.
+        A client created in another loop is dropped without closing: it can't be awaited outside its loop.
+
+        :return: an instance of backend-specific async client
+        """
+        loop = asyncio.get_running_loop()
+        if self._aclient is not None and self._aclient_loop is loop:
+            return self._aclient
+
+        self._aclient = self.get_async_client()
+        self._aclient_loop = loop
+        return self._aclient
+
+    def pop_aclient(self):
+        """
+        Forgets the cached async client.
+
+        :return: the async client if it was created in the running event loop, otherwise ``None``
+        """
+        aclient, loop = self._aclient, self._aclient_loop
+        self._aclient = self._aclient_loop = None
+        if aclient is None or loop is not asyncio.get_running_loop():
+            return None
+        return aclient
+
+    def get_async_client(self):
+        """
+        If your backend needs an async client, inherit this method and use
+        :meth:`~django_docker_helpers.config.backends.async_base.AsyncBaseParser.aclient` shortcut.
+
+        :return: an instance of backend-specific async client
+        """
+        raise NotImplementedError
+
+    async def aclose(self):
+        """
+        Closes the async client if it has been created. Does nothing by default.
+        """
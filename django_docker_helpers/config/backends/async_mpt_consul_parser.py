@@ -0,0 +1,94 @@
+import base64
+import typing as t
+
+from django_docker_helpers.config.backends.async_base import AsyncBaseParser
+from django_docker_helpers.config.backends.mpt_consul_parser import MPTConsulParser
+
+
+class AsyncConsulKVClient:
+    """
+    A minimal asyncio consul KV client built on ``aiohttp``. It mimics ``consul.Consul().kv.get()`` return values:
+    ``(index, {'Key': ..., 'Value': b'...', ...})`` or ``(index, None)`` if the key does not exist.
+
+    ``python-consul``'s own ``consul.aio`` is not used since it relies on generator-based coroutines
+    removed in Python 3.11.
+    """
+    def __init__(self,
+                 host: str = '127.0.0.1',
+                 port: int = 8500,
+                 scheme: str = 'http',
+                 verify: bool = True,
+                 cert: t.Optional[str] = None):
+        import aiohttp
+        import ssl
+
+        self.base_url = '{0}://{1}:{2}/v1/kv/'.format(scheme, host, port)
+        ssl_context = None
+        if scheme == 'https':
+            ssl_context = ssl.create_default_context(cafile=cert) if verify else False
+        self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(ssl=ssl_context))
+
+    @property
+    def kv(self) -> 'AsyncConsulKVClient':
+        return self
+
+    async def get(self, key: str, **params) -> t.Tuple[t.Optional[str], t.Optional[dict]]:
+        async with self._session.get(self.base_url + key, params=params) as response:
+            index = response.headers.get('X-Consul-Index')
+            if response.status == 404:
+                return index, None
+            response.raise_for_status()
+            data = (await response.json(content_type=None))[0]
+
+        if data.get('Value') is not None:
+            data['Value'] = base64.b64decode(data['Value'])
+        return index, data
+
+    async def close(self):
+        await self._session.close()
+
+
+class AsyncMPTConsulParser(AsyncBaseParser, MPTConsulParser):
+    """
+    Materialized Path Tree Consul Parser with asyncio support.
+
+    It's the same :class:`~django_docker_helpers.config.backends.mpt_consul_parser.MPTConsulParser`
+    that additionally reads options with an ``aiohttp``-based client in
+    :meth:`~django_docker_helpers.config.backends.async_mpt_consul_parser.AsyncMPTConsulParser.aget`.
+
+    Example:
+    ::
+
+        parser = AsyncMPTConsulParser(host=CONSUL_HOST, port=CONSUL_PORT)
+        parser.get('debug')  # sync client, e.g. in settings.py
+        await parser.aget('nested.a.b')  # async client, e.g. in async views
+    """
+
+    def get_async_client(self) -> AsyncConsulKVClient:
+        return AsyncConsulKVClient(**self.client_options)
+
+    async def aget(self,
+                   variable_path: str,
+                   default: t.Optional[t.Any] = None,
+                   coerce_type: t.Optional[t.Type] = None,
+                   coercer: t.Optional[t.Callable] = None,
+                   **kwargs):
+        """
+        :param variable_path: a delimiter-separated path to a nested value
+        :param default: default value if there's no object by specified path
+        :param coerce_type: cast a type of a value to a specified one
+        :param coercer: perform a type casting with specified callback
+        :param kwargs: additional query parameters for consul kv ``GET`` request
+        :return: value or default
+        """
+        index, data = await self.aclient.kv.get(self.get_storage_key(variable_path), **kwargs)
+
+        if data is None:
+            return default
+
+        return self.deserialize_value(data['Value'], coerce_type=coerce_type, coercer=coercer)
+
+    async def aclose(self):
+        aclient = self.pop_aclient()
+        if aclient is not None:
+            await aclient.close()
@@ -0,0 +1,52 @@
+import typing as t
+
+from django_docker_helpers.config.backends.async_base import AsyncBaseParser
+from django_docker_helpers.config.backends.mpt_redis_parser import MPTRedisParser
+
+
+class AsyncMPTRedisParser(AsyncBaseParser, MPTRedisParser):
+    """
+    Materialized Path Tree Redis Parser with asyncio support.
+
+    It's the same :class:`~django_docker_helpers.config.backends.mpt_redis_parser.MPTRedisParser`
+    that additionally reads options with ``redis.asyncio`` client (``redis>=5.0.1``) in
+    :meth:`~django_docker_helpers.config.backends.async_mpt_redis_parser.AsyncMPTRedisParser.aget`.
+
+    Example:
+    ::
+
+        parser = AsyncMPTRedisParser(host=REDIS_HOST, port=REDIS_PORT)
+        parser.get('debug')  # sync client, e.g. in settings.py
+        await parser.aget('nested.a.b')  # async client, e.g. in async views
+    """
+
+    def get_async_client(self):
+        # type: () -> redis.asyncio.Redis
+        import redis.asyncio
+        return redis.asyncio.Redis(**self.client_options)
+
+    async def aget(self,
+                   variable_path: str,
+                   default: t.Optional[t.Any] = None,
+                   coerce_type: t.Optional[t.Type] = None,
+                   coercer: t.Optional[t.Callable] = None,
+                   **kwargs):
+        """
+        :param variable_path: a delimiter-separated path to a nested value
+        :param default: default value if there's no object by specified path
+        :param coerce_type: cast a type of a value to a specified one
+        :param coercer: perform a type casting with specified callback
+        :param kwargs: additional arguments inherited parser may need
+        :return: value or default
+        """
+        val = await self.aclient.get(self.get_storage_key(variable_path))
+
+        if val is None:
+            return default
+
+        return self.deserialize_value(val, coerce_type=coerce_type, coercer=coercer)
+
+    async def aclose(self):
+        aclient = self.pop_aclient()
+        if aclient is not None:
+            await aclient.aclose()
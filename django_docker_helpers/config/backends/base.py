@@ -2,13 +2,20 @@ import logging
 import os
 import typing as t
 
-from django_docker_helpers.utils import coerce_str_to_bool
-
 
 class BaseParser:
     """
     Base class to inherit from in custom parsers.
     """
+    #: set to ``True`` if every :meth:`~django_docker_helpers.config.backends.base.BaseParser.get` call is
+    #: a network round trip
+    remote_lookups = False
+
+    #: set to ``False`` if :meth:`~django_docker_helpers.config.backends.base.BaseParser.get` resolves paths
+    #: case-insensitively: enumerated paths are lowercased then, and lookups by them fold the case
+    #: with :meth:`~django_docker_helpers.config.backends.base.BaseParser.fold_key`
+    case_sensitive_keys = True
+
     def __init__(self,
                  scope: t.Optional[str] = None,
                  config: t.Optional[str] = None,
@@ -62,6 +69,30 @@ class BaseParser:
         """
         raise NotImplementedError
 
+    def get_many(self,
+                 variable_paths: t.Iterable[str],
+                 coerce_type: t.Optional[t.Type] = None,
+                 coercer: t.Optional[t.Callable] = None,
+                 **kwargs) -> t.Dict[str, t.Any]:
+        """
+        Reads several variables at once, used by :meth:`~django_docker_helpers.config.ConfigLoader.get_many`.
+
+        The default implementation calls :meth:`~django_docker_helpers.config.backends.base.BaseParser.get`
+        for every path, inherited methods should fetch all values in a single round trip if the backend can.
+
+        :param variable_paths: delimiter-separated paths to nested values
+        :param coerce_type: cast a type of every value to a specified one
+        :param coercer: perform a type casting with specified callback
+        :param kwargs: additional arguments inherited parser may need
+        :return: a dict ``{variable_path: value}`` of **found** values only
+        """
+        values = {}
+        for variable_path in variable_paths:
+            val = self.get(variable_path, default=self.sentinel, coerce_type=coerce_type, coercer=coercer, **kwargs)
+            if val is not self.sentinel:
+                values[variable_path] = val
+        return values
+
     @staticmethod
     def coerce(val: t.Any,
                coerce_type: t.Optional[t.Type] = None,
@@ -69,27 +100,102 @@ class BaseParser:
         """
         Casts a type of ``val`` to ``coerce_type`` with ``coercer``.
 
-        If ``coerce_type`` is bool and no ``coercer`` specified it uses
-        :func:`~django_docker_helpers.utils.coerce_str_to_bool` by default.
+        If no ``coercer`` specified it uses a compiled coercer of ``coerce_type`` from
+        :func:`~django_docker_helpers.config.coercers.get_coercer`
+        (e.g. :func:`~django_docker_helpers.utils.coerce_str_to_bool` for bool).
 
         :param val: a value of any type
         :param coerce_type: any type
         :param coercer: provide a callback that takes ``val`` and returns a value with desired type
         :return: type casted value
         """
-        if not coerce_type and not coercer:
-            return val
+        if coercer is not None:
+            if coerce_type and type(val) is coerce_type:
+                return val
+            return coercer(val)
 
-        if coerce_type and type(val) is coerce_type:
+        if not coerce_type:
             return val
 
-        if coerce_type and coerce_type is bool and not coercer:
-            coercer = coerce_str_to_bool
+        # coercers are compiled (and their dependencies imported) on first use
+        from django_docker_helpers.config.coercers import get_coercer
+
+        return get_coercer(coerce_type)(val)
+
+    def fold_key(self, variable_path: str) -> str:
+        """
+        :param variable_path: a path to variable in config
+        :return: ``variable_path`` as it's enumerated by
+         :meth:`~django_docker_helpers.config.backends.base.BaseParser.keys`
+        """
+        return variable_path if self.case_sensitive_keys else variable_path.lower()
+
+    def keys(self) -> t.Iterable[str]:
+        """
+        Optional protocol for key-enumerable backends. Inherited method should return all variable paths
+        (relative to ``scope``) the parser can resolve with
+        :meth:`~django_docker_helpers.config.backends.base.BaseParser.get`,
+        including paths of nested sections and list items if the backend resolves them.
+
+        :return: an iterable of delimiter-separated paths
+        :raises NotImplementedError: if the backend cannot enumerate its keys
+        """
+        raise NotImplementedError
+
+    def iter_items(self) -> t.Iterable[t.Tuple[str, t.Any]]:
+        """
+        Optional protocol for key-enumerable backends: all ``(variable_path, value)`` pairs
+        the parser holds (see :meth:`~django_docker_helpers.config.backends.base.BaseParser.keys`).
+        Values are not coerced.
+
+        The default implementation reads every key with
+        :meth:`~django_docker_helpers.config.backends.base.BaseParser.get`, inherited methods
+        should fetch everything at once if the backend can.
+
+        :return: an iterable of tuples ``(variable_path, value)``
+        :raises NotImplementedError: if the backend cannot enumerate its keys
+        """
+        for variable_path in self.keys():
+            val = self.get(variable_path, default=self.sentinel)
+            if val is not self.sentinel:
+                yield variable_path, val
+
+    def iter_section_items(self, variable_path: str) -> t.Iterable[t.Tuple[str, t.Any]]:
+        """
+        Optional protocol for key-enumerable backends: ``(path, value)`` pairs inside the ``variable_path``
+        section, paths are relative to the section. Values are not coerced.
 
-        if coercer is None:
-            coercer = coerce_type
+        The default implementation filters
+        :meth:`~django_docker_helpers.config.backends.base.BaseParser.iter_items`, inherited methods
+        of remote backends should fetch the section only.
+
+        :param variable_path: a path to a section
+        :return: an iterable of tuples ``(path, value)``
+        :raises NotImplementedError: if the backend cannot enumerate its keys
+        """
+        prefix = self.fold_key(variable_path) + self.path_separator
+        return [(path[len(prefix):], val) for path, val in self.iter_items() if path.startswith(prefix)]
 
-        return coercer(val)
+    def reload(self):
+        """
+        Drops cached data (loaded config bundles, etc), so it's fetched again on the next read.
+        Does nothing by default.
+        """
+
+    def warm_up(self):
+        """
+        Prepares everything the parser needs to serve
+        :meth:`~django_docker_helpers.config.backends.base.BaseParser.get`: initializes the client,
+        fetches and parses remote config bundles, etc. Does nothing by default.
+
+        It's called by :meth:`~django_docker_helpers.config.ConfigLoader.warm_up` in a separate thread.
+        """
+
+    def release_buffers(self):
+        """
+        Drops raw copies of loaded configs (``StringIO`` buffers of fetched bundles, etc) that are not needed
+        once the config is parsed, so they don't take memory in every forked worker. Does nothing by default.
+        """
 
     @property
     def client(self):
@@ -107,6 +107,35 @@ class ConsulParser(BaseParser):
         )
         return self._inner_parser
 
+    def keys(self) -> t.Iterable[str]:
+        return self.inner_parser.keys()
+
+    def iter_items(self) -> t.Iterable[t.Tuple[str, t.Any]]:
+        return self.inner_parser.iter_items()
+
+    def reload(self):
+        """
+        Drops the inner parser, the config bundle is fetched again on the next read.
+        """
+        self._inner_parser = None
+
+    def release_buffers(self):
+        """
+        Drops the ``StringIO`` copy of the fetched bundle kept by the inner parser.
+        """
+        if self._inner_parser is not None:
+            self._inner_parser.release_buffers()
+
+    def warm_up(self):
+        """
+        Fetches the config bundle from ``endpoint`` and parses it with the inner parser.
+
+        :raises config.exceptions.KVStorageKeyDoestNotExist: if specified ``endpoint`` does not exists
+
+        :raises config.exceptions.KVStorageValueIsEmpty: if specified ``endpoint`` does not contain a config
+        """
+        self.inner_parser.warm_up()
+
     def get(self,
             variable_path: str,
             default: t.Optional[t.Any] = None,
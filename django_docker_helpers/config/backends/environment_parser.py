@@ -2,7 +2,6 @@ import os
 import typing as t
 
 from django_docker_helpers.config.backends.base import BaseParser
-from django_docker_helpers.utils import coerce_str_to_bool
 
 
 class EnvironmentParser(BaseParser):
@@ -33,6 +32,8 @@ class EnvironmentParser(BaseParser):
         assert parser.get('yaml.list.variable',
                           coerce_type=list, coercer=yaml_load) == [33, 42]
     """
+    case_sensitive_keys = False
+
     def __init__(self,
                  scope: t.Optional[str] = None,
                  config: t.Optional[str] = None,
@@ -91,12 +92,39 @@ class EnvironmentParser(BaseParser):
         if val is self.sentinel:
             return default
 
-        # coerce to bool with default env coercer if no coercer specified
-        if coerce_type and coerce_type is bool and not coercer:
-            coercer = coerce_str_to_bool
-
         return self.coerce(val, coerce_type=coerce_type, coercer=coercer)
 
+    def keys(self) -> t.List[str]:
+        """
+        Enumerates environment variables inside ``scope``.
+
+        .. note::
+
+            Environment variable names are case-insensitive for this parser, so paths are lowercased.
+
+        :return: lowercased paths of all variables inside ``scope``
+        """
+        return [variable_path for variable_path, _val in self.iter_items()]
+
+    def iter_items(self) -> t.List[t.Tuple[str, str]]:
+        """
+        A snapshot of environment variables inside ``scope``.
+
+        :return: ``(path, value)`` of all variables inside ``scope``, paths are lowercased
+        """
+        prefix = self.get_env_var_name('')
+        if prefix:
+            prefix += self.nested_delimiter
+
+        items = []
+        for var_name, val in self.env.items():
+            # ``get`` reads uppercased names only
+            if not var_name.startswith(prefix) or len(var_name) == len(prefix) or var_name != var_name.upper():
+                continue
+            parts = var_name[len(prefix):].lower().split(self.nested_delimiter)
+            items.append((self.path_separator.join(parts), val))
+        return items
+
     def get_env_var_name(self, variable_path: str) -> str:
         return self.nested_delimiter.join(
             filter(
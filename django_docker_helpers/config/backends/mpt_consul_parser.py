@@ -21,6 +21,8 @@ class MPTConsulParser(BaseParser):
     If you want to store your config with separated key paths take
     :func:`~django_docker_helpers.utils.mp_serialize_dict` helper to materialize your dict.
     """
+    remote_lookups = True
+
     def __init__(self,
                  scope: t.Optional[str] = None,
                  host: str = '127.0.0.1',
@@ -73,6 +75,64 @@ class MPTConsulParser(BaseParser):
         self._client = consul.Consul(**self.client_options)
         return self._client
 
+    def _get_enumerated_prefix(self) -> str:
+        key_prefix = self.get_storage_key('')
+        if not key_prefix:
+            raise NotImplementedError('Keys are not enumerated without `scope`')
+        return key_prefix
+
+    def keys(self) -> t.List[str]:
+        """
+        Lists all consul kv keys under ``scope``.
+
+        :return: paths of all stored values
+        :raises NotImplementedError: if ``scope`` is not set: the parser doesn't enumerate
+         (and prefetch) the whole consul kv store
+        """
+        key_prefix = self._get_enumerated_prefix()
+        index, keys = self.client.kv.get(key_prefix, keys=True)
+        return [
+            key[len(key_prefix):].replace(self.consul_path_separator, self.path_separator)
+            for key in keys or []
+            # skip "folders"
+            if not key.endswith(self.consul_path_separator)
+        ]
+
+    def iter_items(self) -> t.List[t.Tuple[str, t.Any]]:
+        """
+        Prefetches all values under ``scope`` with a single recursive ``GET``.
+
+        :return: ``(path, value)`` of all stored values
+        :raises NotImplementedError: if ``scope`` is not set
+        """
+        return self._fetch(self._get_enumerated_prefix())
+
+    def iter_section_items(self, variable_path: str) -> t.List[t.Tuple[str, t.Any]]:
+        """
+        Fetches values of the ``variable_path`` section only with a single recursive ``GET``.
+
+        :param variable_path: a path to a section
+        :return: ``(path, value)`` of all stored values inside the section
+        """
+        return self._fetch(self.get_storage_key(variable_path) + self.consul_path_separator)
+
+    def _fetch(self, key_prefix: str) -> t.List[t.Tuple[str, t.Any]]:
+        index, data = self.client.kv.get(key_prefix, recurse=True)
+        return [
+            (
+                item['Key'][len(key_prefix):].replace(self.consul_path_separator, self.path_separator),
+                self.deserialize_value(item['Value'])
+            )
+            for item in data or []
+            if not item['Key'].endswith(self.consul_path_separator)
+        ]
+
+    def warm_up(self):
+        """
+        Initializes the consul client.
+        """
+        self.client
+
     def get(self,
             variable_path: str,
             default: t.Optional[t.Any] = None,
@@ -87,7 +147,18 @@ class MPTConsulParser(BaseParser):
         :param kwargs: additional arguments inherited parser may need
         :return: value or default
         """
+        index, data = self.client.kv.get(self.get_storage_key(variable_path), **kwargs)
+
+        if data is None:
+            return default
 
+        return self.deserialize_value(data['Value'], coerce_type=coerce_type, coercer=coercer)
+
+    def get_storage_key(self, variable_path: str) -> str:
+        """
+        :param variable_path: a delimiter-separated path to a nested value
+        :return: a consul kv key with ``scope`` applied
+        """
         if self.path_separator != self.consul_path_separator:
             variable_path = variable_path.replace(self.path_separator, self.consul_path_separator)
 
@@ -95,12 +166,21 @@ class MPTConsulParser(BaseParser):
             _scope = self.consul_path_separator.join(self.scope.split(self.path_separator))
             variable_path = '{0}/{1}'.format(_scope, variable_path)
 
-        index, data = self.client.kv.get(variable_path, **kwargs)
+        return variable_path
 
-        if data is None:
-            return default
+    def deserialize_value(self,
+                          val: t.Optional[bytes],
+                          coerce_type: t.Optional[t.Type] = None,
+                          coercer: t.Optional[t.Callable] = None) -> t.Any:
+        """
+        Deserializes a raw value read from consul kv storage: complex objects are deserialized with
+        ``object_deserialize``, anything else is decoded and coerced.
 
-        val = data['Value']
+        :param val: a raw value
+        :param coerce_type: cast a type of a value to a specified one
+        :param coercer: perform a type casting with specified callback
+        :return: value
+        """
         if val is None:
             # None is present and it is a valid value
             return val
@@ -1,8 +1,12 @@
+import re
 import typing as t
 
 from django_docker_helpers.config.backends.base import BaseParser
 from django_docker_helpers.utils import default_yaml_object_deserialize
 
+# redis ``SCAN MATCH`` glob-style pattern special characters
+GLOB_SPECIAL_CHARS = re.compile(r'([*?\[\]\\])')
+
 
 class MPTRedisParser(BaseParser):
     """
@@ -22,6 +26,7 @@ class MPTRedisParser(BaseParser):
     If you want to store your config with separated key paths take
     :func:`~django_docker_helpers.utils.mp_serialize_dict` helper to materialize your dict.
     """
+    remote_lookups = True
 
     def __init__(self,
                  scope: t.Optional[str] = None,
@@ -72,6 +77,61 @@ class MPTRedisParser(BaseParser):
         self._client = redis.Redis(**self.client_options)
         return self._client
 
+    def keys(self) -> t.List[str]:
+        """
+        Scans redis for all keys under ``key_prefix`` and ``scope``.
+
+        :return: paths of all stored values
+        :raises NotImplementedError: if neither ``scope`` nor ``key_prefix`` is set: the parser doesn't
+         enumerate (and prefetch) the whole redis database
+        """
+        key_prefix = self.get_storage_key('')
+        if not key_prefix:
+            raise NotImplementedError('Keys are not enumerated without `scope` or `key_prefix`')
+        return self._scan(key_prefix)
+
+    def iter_items(self) -> t.List[t.Tuple[str, t.Any]]:
+        """
+        Prefetches all values under ``key_prefix`` and ``scope`` with a single ``MGET``.
+
+        :return: ``(path, value)`` of all stored values
+        """
+        return self._fetch(self.get_storage_key(''), self.keys())
+
+    def iter_section_items(self, variable_path: str) -> t.List[t.Tuple[str, t.Any]]:
+        """
+        Fetches values of the ``variable_path`` section only with a single ``MGET``.
+
+        :param variable_path: a path to a section
+        :return: ``(path, value)`` of all stored values inside the section
+        """
+        key_prefix = self.get_storage_key(variable_path) + self.path_separator
+        return self._fetch(key_prefix, self._scan(key_prefix))
+
+    def _scan(self, key_prefix: str) -> t.List[str]:
+        keys = []
+        for key in self.client.scan_iter(match=GLOB_SPECIAL_CHARS.sub(r'\\\1', key_prefix) + '*'):
+            if isinstance(key, bytes):
+                key = key.decode()
+            keys.append(key[len(key_prefix):])
+        return keys
+
+    def _fetch(self, key_prefix: str, paths: t.List[str]) -> t.List[t.Tuple[str, t.Any]]:
+        if not paths:
+            return []
+        values = self.client.mget([key_prefix + path for path in paths])
+        return [
+            (path, self.deserialize_value(val))
+            for path, val in zip(paths, values)
+            if val is not None
+        ]
+
+    def warm_up(self):
+        """
+        Establishes a connection to redis.
+        """
+        self.client.ping()
+
     def get(self,
             variable_path: str,
             default: t.Optional[t.Any] = None,
@@ -86,18 +146,64 @@ class MPTRedisParser(BaseParser):
         :param kwargs: additional arguments inherited parser may need
         :return: value or default
         """
+        val = self.client.get(self.get_storage_key(variable_path))
+
+        if val is None:
+            return default
 
+        return self.deserialize_value(val, coerce_type=coerce_type, coercer=coercer)
+
+    def get_many(self,
+                 variable_paths: t.Iterable[str],
+                 coerce_type: t.Optional[t.Type] = None,
+                 coercer: t.Optional[t.Callable] = None,
+                 **kwargs) -> t.Dict[str, t.Any]:
+        """
+        Reads all ``variable_paths`` with a single ``MGET``.
+
+        :param variable_paths: delimiter-separated paths to nested values
+        :param coerce_type: cast a type of every value to a specified one
+        :param coercer: perform a type casting with specified callback
+        :param kwargs: additional arguments inherited parser may need
+        :return: a dict ``{variable_path: value}`` of found values only
+        """
+        variable_paths = list(variable_paths)
+        if not variable_paths:
+            return {}
+
+        values = self.client.mget([self.get_storage_key(path) for path in variable_paths])
+        return {
+            path: self.deserialize_value(val, coerce_type=coerce_type, coercer=coercer)
+            for path, val in zip(variable_paths, values)
+            if val is not None
+        }
+
+    def get_storage_key(self, variable_path: str) -> str:
+        """
+        :param variable_path: a delimiter-separated path to a nested value
+        :return: a redis key with ``scope`` and ``key_prefix`` applied
+        """
         if self.scope:
             variable_path = '{0.scope}{0.path_separator}{1}'.format(self, variable_path)
 
         if self.key_prefix:
             variable_path = '{0.key_prefix}:{1}'.format(self, variable_path)
 
-        val = self.client.get(variable_path)
+        return variable_path
 
-        if val is None:
-            return default
+    def deserialize_value(self,
+                          val: bytes,
+                          coerce_type: t.Optional[t.Type] = None,
+                          coercer: t.Optional[t.Callable] = None) -> t.Any:
+        """
+        Deserializes a raw value read from redis: complex objects are deserialized with ``object_deserialize``,
+        anything else is decoded and coerced.
 
+        :param val: a raw value
+        :param coerce_type: cast a type of a value to a specified one
+        :param coercer: perform a type casting with specified callback
+        :return: value
+        """
         if val.startswith(self.object_serialize_prefix):
             # since complex data types are yaml-serialized there's no need to coerce anything
             _val = val[len(self.object_serialize_prefix):]
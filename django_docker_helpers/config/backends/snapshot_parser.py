@@ -0,0 +1,127 @@
+import typing as t
+
+from django_docker_helpers.config.backends.base import BaseParser
+from django_docker_helpers.utils import unflatten_items
+
+
+class SnapshotParser(BaseParser):
+    """
+    Reads config options from a snapshot written with
+    :meth:`~django_docker_helpers.config.ConfigLoader.write_snapshot`, e.g. by the first of many
+    pre-forked workers (see ``snapshot`` option of :meth:`~django_docker_helpers.config.ConfigLoader.from_env`).
+
+    The snapshot is ``mmap``-ed read-only: workers share its pages and unpickle only values they read.
+    Sections are assembled from nested values unless the snapshot stores them as a whole, see
+    :meth:`~django_docker_helpers.config.ConfigLoader.snapshot_items`.
+
+    Example:
+    ::
+
+        configure.write_snapshot('/run/app/config.snapshot')
+
+        parser = SnapshotParser('/run/app/config.snapshot')
+        parser.get('db.port', coerce_type=int)
+    """
+    def __init__(self,
+                 config: t.Optional[str] = None,
+                 path_separator: str = '.',
+                 scope: t.Optional[str] = None):
+        """
+        :param config: a path to a snapshot file
+        :param path_separator: specifies which character separates nested variables, default is ``'.'``
+        :param scope: a global namespace-like variable prefix
+
+        :raises ValueError: if no config specified
+        """
+        super().__init__(scope=scope, config=config, path_separator=path_separator)
+
+        self._snapshot = None
+
+        if not config:
+            raise ValueError('Config should not be empty')
+
+    def __str__(self):
+        return '<{0} config="{1}" scope={2}>'.format(self.__class__.__name__, self.config, self.scope)
+
+    @property
+    def snapshot(self):
+        # type: () -> django_docker_helpers.config.snapshot.Snapshot
+        if self._snapshot is None:
+            from django_docker_helpers.config.snapshot import Snapshot
+            self._snapshot = Snapshot.open(self.config)
+        return self._snapshot
+
+    def get_client(self):
+        raise NotImplementedError
+
+    def _get_key(self, variable_path: str) -> str:
+        if not self.scope:
+            return variable_path
+        return '{0.scope}{0.path_separator}{1}'.format(self, variable_path)
+
+    def get(self,
+            variable_path: str,
+            default: t.Optional[t.Any] = None,
+            coerce_type: t.Optional[t.Type] = None,
+            coercer: t.Optional[t.Callable] = None,
+            **kwargs):
+        """
+        :param variable_path: a delimiter-separated path to a nested value
+        :param default: default value if there's no object by specified path
+        :param coerce_type: cast a type of a value to a specified one
+        :param coercer: perform a type casting with specified callback
+        :param kwargs: additional arguments inherited parser may need
+        :return: value or default
+        """
+        key = self._get_key(variable_path)
+        idx = self.snapshot.find(key)
+        if idx >= 0:
+            return self.coerce(self.snapshot.value(idx), coerce_type=coerce_type, coercer=coercer)
+
+        section = self._get_section(key)
+        if section is None:
+            return default
+        return self.coerce(section, coerce_type=coerce_type, coercer=coercer)
+
+    def _get_section(self, key: str) -> t.Optional[dict]:
+        prefix = key + self.path_separator
+        items = []
+        stored_paths = set()
+        for idx in self.snapshot.iter_prefix(prefix):
+            path = self.snapshot.key(idx)[len(prefix):]
+            parts = path.split(self.path_separator)
+            # list items are stored next to the whole list, skip them
+            if any(self.path_separator.join(parts[:i]) in stored_paths for i in range(1, len(parts))):
+                continue
+            stored_paths.add(path)
+            items.append((path, self.snapshot.value(idx)))
+
+        if not items:
+            return None
+        return unflatten_items(items, separator=self.path_separator)
+
+    def keys(self) -> t.List[str]:
+        """
+        :return: paths of all values and sections inside ``scope``
+        """
+        prefix = self._get_key('') if self.scope else ''
+        keys = {}
+        for idx in self.snapshot.iter_prefix(prefix):
+            parts = self.snapshot.key(idx)[len(prefix):].split(self.path_separator)
+            for i in range(1, len(parts) + 1):
+                keys[self.path_separator.join(parts[:i])] = None
+        return list(keys)
+
+    def warm_up(self):
+        """
+        Opens and maps the snapshot.
+        """
+        return self.snapshot
+
+    def reload(self):
+        """
+        Re-opens the snapshot on the next read.
+        """
+        if self._snapshot is not None:
+            self._snapshot.close()
+        self._snapshot = None
@@ -1,7 +1,8 @@
+import os
 import typing as t
 
 from django_docker_helpers.config.backends.base import BaseParser
-from django_docker_helpers.utils import dotkey
+from django_docker_helpers.utils import dotkey, iter_path_items, iter_paths
 
 
 class YamlParser(BaseParser):
@@ -46,6 +47,9 @@ class YamlParser(BaseParser):
 
         from yaml import load, SafeLoader
 
+        if self.config is None:
+            raise ValueError('Config buffer has been released and cannot be read again')
+
         if isinstance(self.config, str):
             config = open(self.config)
         else:
@@ -57,6 +61,55 @@ class YamlParser(BaseParser):
     def get_client(self):
         raise NotImplementedError
 
+    def _scoped_data(self):
+        if not self.scope:
+            return self.data
+        return dotkey(self.data, self.scope, default=None, separator=self.path_separator)
+
+    def keys(self) -> t.List[str]:
+        """
+        :return: paths of all sections, values and list items inside ``scope``
+        """
+        return list(iter_paths(self._scoped_data(), separator=self.path_separator))
+
+    def iter_items(self) -> t.List[t.Tuple[str, t.Any]]:
+        """
+        :return: ``(path, value)`` of all sections, values and list items inside ``scope``
+        """
+        return list(iter_path_items(self._scoped_data(), separator=self.path_separator))
+
+    def reload(self):
+        """
+        Drops parsed data, the config is read again on the next access
+        (``TextIO`` configs are rewound if they are seekable). Parsed data of a released
+        in-memory buffer is kept: there's nothing to read it from again.
+        """
+        if self.config is None:
+            return
+
+        self._data = None
+        if not isinstance(self.config, str) and hasattr(self.config, 'seek'):
+            self.config.seek(0)
+
+    def warm_up(self):
+        """
+        Reads and parses the config.
+        """
+        self.data
+
+    def release_buffers(self):
+        """
+        Drops a reference to a parsed ``TextIO`` config. A file object is replaced with its path,
+        so it's still reloaded from the file; an in-memory buffer is dropped and
+        :meth:`~django_docker_helpers.config.backends.YamlParser.reload` keeps the parsed data then.
+        File path configs are kept as is.
+        """
+        if self._data is None or self.config is None or isinstance(self.config, str):
+            return
+
+        name = getattr(self.config, 'name', None)
+        self.config = name if isinstance(name, str) and os.path.isfile(name) else None
+
     def get(self,
             variable_path: str,
             default: t.Optional[t.Any] = None,
@@ -0,0 +1,273 @@
+import collections.abc
+import re
+import typing as t
+from collections import namedtuple
+from datetime import timedelta
+from decimal import Decimal
+from functools import lru_cache
+
+from django_docker_helpers.utils import coerce_str_to_bool, default_yaml_object_deserialize, import_from, shred
+
+_COERCERS = {}  # type: t.Dict[t.Any, t.Callable]
+
+
+def register_coercer(target_type: t.Any, coercer: t.Optional[t.Callable] = None):
+    """
+    Registers a ``coercer`` for ``target_type``, so ``coerce_type=target_type`` uses it in every parser.
+    Can be used as a decorator.
+
+    Example:
+    ::
+
+        @register_coercer(Path)
+        def coerce_path(val):
+            return Path(val).expanduser()
+
+    :param target_type: a type
+    :param coercer: a callable taking a raw value and returning a ``target_type`` value
+    :return: ``coercer`` or a decorator if no ``coercer`` specified
+    """
+    if coercer is None:
+        return lambda func: register_coercer(target_type, func)
+
+    _COERCERS[target_type] = coercer
+    get_coercer.cache_clear()
+    find_coercer.cache_clear()
+    return coercer
+
+
+def unwrap_optional(type_hint):
+    """
+    :return: ``T`` for ``t.Optional[T]``, ``None`` for other unions, ``type_hint`` otherwise
+    """
+    if getattr(type_hint, '__origin__', None) is not t.Union:
+        return type_hint
+    args = [arg for arg in type_hint.__args__ if arg is not type(None)]  # noqa: E721
+    if len(args) == 1:
+        return args[0]
+    return None
+
+
+def _identity(val):
+    return val
+
+
+@lru_cache(maxsize=None)
+def find_coercer(coerce_type: t.Any) -> t.Optional[t.Callable]:
+    """
+    Compiles (once per type) a coercer for a registered type, ``t.Optional[...]`` of it,
+    ``t.List[T]`` / ``t.Tuple[T, ...]`` (a comma-separated string or a sequence), ``t.Dict[str, T]``
+    (a YAML / JSON mapping string or a mapping) or ``t.Type[...]`` / ``t.Callable`` (a dot-separated import path).
+
+    :param coerce_type: a type or a type hint
+    :return: a coercer or ``None`` if nothing is known about ``coerce_type``
+    """
+    coerce_type = unwrap_optional(coerce_type)
+    if coerce_type is None or coerce_type is t.Any:
+        return None
+
+    if coerce_type in _COERCERS:
+        return _COERCERS[coerce_type]
+
+    origin = getattr(coerce_type, '__origin__', None)
+    args = [arg for arg in getattr(coerce_type, '__args__', None) or () if arg is not Ellipsis]
+
+    if origin in (list, tuple, collections.abc.Sequence):
+        item_coercer = find_coercer(args[0]) if args else None
+        return _compile_sequence_coercer(tuple if origin is tuple else list, item_coercer or _identity)
+
+    if origin in (dict, collections.abc.Mapping):
+        value_coercer = find_coercer(args[1]) if len(args) == 2 else None
+        return _compile_mapping_coercer(value_coercer or _identity)
+
+    if origin is type or coerce_type is t.Callable or origin is collections.abc.Callable:
+        return coerce_import_path
+
+    return None
+
+
+@lru_cache(maxsize=None)
+def get_coercer(coerce_type: t.Any) -> t.Callable:
+    """
+    A cached coercer for ``coerce_type``: a registered or compiled one (see
+    :func:`~django_docker_helpers.config.coercers.find_coercer`), or the ``coerce_type`` constructor itself.
+    Values of exactly ``coerce_type`` are returned as is.
+
+    :param coerce_type: a type or a type hint
+    :return: a callable taking a raw value
+    """
+    coerce_type = unwrap_optional(coerce_type)
+    coercer = find_coercer(coerce_type)
+    if coercer is None:
+        if not callable(coerce_type):
+            raise TypeError('Cannot coerce values to `{0}`'.format(coerce_type))
+        coercer = coerce_type
+
+    if not isinstance(coerce_type, type):
+        return coercer
+
+    def coerce(val):
+        if type(val) is coerce_type:
+            return val
+        return coercer(val)
+
+    return coerce
+
+
+def comma_str_to_list(raw_val: str) -> t.List[str]:
+    return [item.strip() for item in raw_val.split(',') if item.strip()]
+
+
+def _compile_sequence_coercer(sequence_type: t.Type, item_coercer: t.Callable) -> t.Callable:
+    def coerce(val):
+        if isinstance(val, str):
+            val = comma_str_to_list(val)
+        return sequence_type(item_coercer(item) for item in val)
+
+    return coerce
+
+
+def _compile_mapping_coercer(value_coercer: t.Callable) -> t.Callable:
+    def coerce(val):
+        if isinstance(val, (str, bytes)):
+            val = default_yaml_object_deserialize(val)
+        if not isinstance(val, collections.abc.Mapping):
+            raise ValueError('Expected a mapping, got `{0}`'.format(val))
+        return {key: value_coercer(item) for key, item in val.items()}
+
+    return coerce
+
+
+def coerce_import_path(raw_val: t.Any) -> t.Any:
+    """
+    Imports an object by a dot-separated path, non-string values are returned as is.
+    """
+    if not isinstance(raw_val, str):
+        return raw_val
+    return import_from(*raw_val.rsplit('.', 1))
+
+
+def coerce_decimal(val: t.Any) -> Decimal:
+    # ``Decimal(0.1)`` is ``0.1000000000000000055511151231257827...``
+    return Decimal(str(val) if isinstance(val, float) else val)
+
+
+TIMEDELTA_UNITS = {
+    'us': 'microseconds',
+    'ms': 'milliseconds',
+    's': 'seconds',
+    'm': 'minutes',
+    'h': 'hours',
+    'd': 'days',
+    'w': 'weeks',
+}
+
+TIMEDELTA_RE = re.compile(r'(\d+(?:\.\d+)?)\s*(us|ms|s|m|h|d|w)', re.IGNORECASE)
+
+
+def coerce_timedelta(val: t.Union[str, int, float, timedelta]) -> timedelta:
+    """
+    Converts a number of seconds or a duration string like ``'1h30m'``, ``'500ms'``, ``'2d'`` into ``timedelta``.
+    Supported units: ``us``, ``ms``, ``s``, ``m``, ``h``, ``d``, ``w``.
+
+    :raises ValueError: if ``val`` is not a duration
+    """
+    if isinstance(val, timedelta):
+        return val
+    if isinstance(val, (int, float)):
+        return timedelta(seconds=val)
+
+    val = str(val).strip()
+    try:
+        return timedelta(seconds=float(val))
+    except ValueError:
+        pass
+
+    parts = TIMEDELTA_RE.findall(val)
+    if not parts or TIMEDELTA_RE.sub('', val).strip():
+        raise ValueError('Invalid duration: `{0}`'.format(val))
+
+    kwargs = {}
+    for amount, unit in parts:
+        unit = TIMEDELTA_UNITS[unit.lower()]
+        kwargs[unit] = kwargs.get(unit, 0) + float(amount)
+    return timedelta(**kwargs)
+
+
+class ByteSize(int):
+    """
+    A number of bytes parsed from strings like ``'512'``, ``'64k'``, ``'10MB'`` or ``'1.5GiB'``.
+
+    SI suffixes (``kB``, ``MB``, ``GB``, ``TB``) are powers of 1000, IEC suffixes (``KiB``, ``MiB``, ...)
+    and single letters (``k``, ``m``, ``g``, ``t``) are powers of 1024.
+    """
+    UNITS = {
+        '': 1,
+        'b': 1,
+        'k': 1024, 'kib': 1024, 'kb': 1000,
+        'm': 1024 ** 2, 'mib': 1024 ** 2, 'mb': 1000 ** 2,
+        'g': 1024 ** 3, 'gib': 1024 ** 3, 'gb': 1000 ** 3,
+        't': 1024 ** 4, 'tib': 1024 ** 4, 'tb': 1000 ** 4,
+    }
+    PATTERN = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([a-z]*)\s*$', re.IGNORECASE)
+
+    def __new__(cls, val: t.Union[str, int, float] = 0):
+        if isinstance(val, (bytes, str)):
+            val = val.decode() if isinstance(val, bytes) else val
+            match = cls.PATTERN.match(val)
+            unit = match and cls.UNITS.get(match.group(2).lower())
+            if unit is None:
+                raise ValueError('Invalid byte size: `{0}`'.format(val))
+            val = float(match.group(1)) * unit
+        return super().__new__(cls, int(val))
+
+
+class DSN(namedtuple('DSN', ['scheme', 'username', 'password', 'host', 'port', 'path', 'query'])):
+    """
+    Parts of a URL / DSN like ``postgres://user:pass@db:5432/app?sslmode=require``.
+    ``query`` is a dict of single values, ``password`` is masked in ``repr``.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def parse(cls, val: t.Union[str, 'DSN']) -> 'DSN':
+        if isinstance(val, DSN):
+            return val
+
+        from urllib.parse import parse_qsl, unquote, urlsplit
+
+        parts = urlsplit(str(val).strip())
+        if not parts.scheme or not (parts.netloc or parts.path.startswith('/')):
+            raise ValueError('Invalid DSN: `{0}`'.format(shred('password', val)))
+
+        return cls(
+            scheme=parts.scheme,
+            username=unquote(parts.username) if parts.username else None,
+            password=unquote(parts.password) if parts.password else None,
+            host=parts.hostname,
+            port=parts.port,
+            path=parts.path,
+            query=dict(parse_qsl(parts.query)),
+        )
+
+    @property
+    def name(self) -> str:
+        """
+        ``path`` without a leading slash, e.g. a database name.
+        """
+        return self.path.lstrip('/')
+
+    def __repr__(self):
+        return 'DSN({0})'.format(', '.join(
+            '{0}={1!r}'.format(field, shred(field, value)) for field, value in zip(self._fields, self)
+        ))
+
+
+register_coercer(int, int)
+register_coercer(float, float)
+register_coercer(str, str)
+register_coercer(bool, coerce_str_to_bool)
+register_coercer(Decimal, coerce_decimal)
+register_coercer(timedelta, coerce_timedelta)
+register_coercer(ByteSize, ByteSize)
+register_coercer(DSN, DSN.parse)
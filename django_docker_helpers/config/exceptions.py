@@ -8,3 +8,18 @@ class KVStorageValueIsEmpty(ValueError):
 
 class RequiredValueIsEmpty(ValueError):
     pass
+
+
+class SchemaValidationError(ValueError):
+    def __init__(self, errors: dict):
+        """
+        :param errors: a dict ``{variable_path: error message}`` of all invalid values
+        """
+        self.errors = errors
+        super().__init__('Invalid config: {0}'.format(
+            '; '.join('`{0}`: {1}'.format(path, message) for path, message in errors.items())
+        ))
+
+
+class InvalidSnapshot(ValueError):
+    pass
@@ -0,0 +1,58 @@
+import operator
+import os
+
+from django.utils.functional import SimpleLazyObject, empty, new_method_proxy
+
+
+class LazyConfigValue(SimpleLazyObject):
+    """
+    A proxy to a config value that is read on the first use and cached afterwards, see
+    :meth:`~django_docker_helpers.config.ConfigLoader.lazy` and
+    :meth:`~django_docker_helpers.config.ConfigLoader.lazy_section`.
+
+    It's :class:`django.utils.functional.SimpleLazyObject` that additionally proxies numeric operations,
+    so lazy ``int`` / ``float`` values can be used in arithmetic and as indices.
+
+    .. note::
+
+        ``isinstance`` checks, comparisons, attribute and item access are proxied, but identity checks
+        (``value is None``) and C code that checks exact types (``os.fspath``, ``json.dumps``, socket calls)
+        see the proxy: convert such values explicitly (``str(value)``) or read them with
+        :meth:`~django_docker_helpers.config.ConfigLoader.get`.
+
+    Example:
+    ::
+
+        port = LazyConfigValue(lambda: configure('db.port', coerce_type=int))
+        port + 1  # reads ``db.port`` here
+    """
+    __int__ = new_method_proxy(int)
+    __float__ = new_method_proxy(float)
+    __index__ = new_method_proxy(operator.index)
+    __le__ = new_method_proxy(operator.le)
+    __ge__ = new_method_proxy(operator.ge)
+    __add__ = new_method_proxy(operator.add)
+    __sub__ = new_method_proxy(operator.sub)
+    __mul__ = new_method_proxy(operator.mul)
+    __truediv__ = new_method_proxy(operator.truediv)
+    __mod__ = new_method_proxy(operator.mod)
+    __fspath__ = new_method_proxy(os.fspath)
+
+    @new_method_proxy
+    def __radd__(self, other):
+        return other + self
+
+    @new_method_proxy
+    def __rsub__(self, other):
+        return other - self
+
+    @new_method_proxy
+    def __rmul__(self, other):
+        return other * self
+
+    @property
+    def is_resolved(self) -> bool:
+        """
+        ``True`` if the value has already been read.
+        """
+        return self._wrapped is not empty
@@ -0,0 +1,209 @@
+import bisect
+import os
+import threading
+import typing as t
+import weakref
+
+from django_docker_helpers.config.backends.base import BaseParser
+
+#: upper bounds in seconds of latency histogram buckets: from an in-memory dict lookup to a slow remote backend
+DEFAULT_LATENCY_BUCKETS = (0.00001, 0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+
+#: ``Content-Type`` of :meth:`ConfigMetrics.to_prometheus` output
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# a per-thread shard layout: counters followed by latency bucket counters (the last one is ``+Inf``)
+_CALLS, _HITS, _MISSES, _ERRORS, _LATENCY_SUM, _BUCKETS = range(6)
+
+
+class _ShardHolder:
+    """
+    Lives in a thread-local, so it is collected when its thread exits.
+    """
+    __slots__ = ('shard', '__weakref__')
+
+    def __init__(self, shard: list):
+        self.shard = shard
+
+
+def _retire_shard(shards: t.Dict[int, list], lock: threading.Lock, base: list, shard: list):
+    with lock:
+        for i, value in enumerate(shard):
+            base[i] += value
+        del shards[id(shard)]
+
+
+class ParserMetrics:
+    """
+    Lookup counters and a latency histogram of a parser.
+
+    Every thread writes to its own shard (a plain list), so recording takes no locks;
+    shards are summed up on read. When a thread exits its shard is merged into a shared base,
+    so short-lived threads don't pile up shards. Values read while other threads are recording
+    may be off by the lookups in flight.
+    """
+    def __init__(self, parser: BaseParser, buckets: t.Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        """
+        :param parser: a parser to collect metrics for
+        :param buckets: sorted latency histogram upper bounds in seconds
+        """
+        self.parser = parser
+        self.buckets = tuple(buckets)
+        self._local = threading.local()
+        self._base = self._empty()
+        self._shards = {}  # type: t.Dict[int, list]
+        self._shards_lock = threading.Lock()
+
+    def _empty(self) -> list:
+        return [0, 0, 0, 0, 0.0] + [0] * (len(self.buckets) + 1)
+
+    def _shard(self) -> list:
+        try:
+            return self._local.holder.shard
+        except AttributeError:
+            shard = self._empty()
+            holder = self._local.holder = _ShardHolder(shard)
+            with self._shards_lock:
+                self._shards[id(shard)] = shard
+            weakref.finalize(holder, _retire_shard, self._shards, self._shards_lock, self._base, shard)
+            return shard
+
+    def observe(self, elapsed: float, hits: int = 0, misses: int = 0, errors: int = 0):
+        """
+        Records a parser call.
+
+        :param elapsed: the call latency in seconds
+        :param hits: a number of found paths
+        :param misses: a number of paths the parser doesn't hold
+        :param errors: a number of failed lookups
+        """
+        shard = self._shard()
+        shard[_CALLS] += 1
+        shard[_HITS] += hits
+        shard[_MISSES] += misses
+        shard[_ERRORS] += errors
+        shard[_LATENCY_SUM] += elapsed
+        shard[_BUCKETS + bisect.bisect_left(self.buckets, elapsed)] += 1
+
+    def totals(self) -> list:
+        with self._shards_lock:
+            shards = [list(self._base)] + list(self._shards.values())
+        totals = self._empty()
+        for shard in shards:
+            for i, value in enumerate(shard):
+                totals[i] += value
+        return totals
+
+    def stats(self) -> t.Dict[str, t.Any]:
+        """
+        :return: a dict with ``parser``, ``calls``, ``hits``, ``misses``, ``errors``, ``hit_rate``
+         (``None`` if nothing was looked up), ``latency_sum`` and ``latency_buckets``:
+         a list of cumulative ``(upper bound, count)`` pairs ending with ``(inf, calls)``
+        """
+        totals = self.totals()
+        lookups = totals[_HITS] + totals[_MISSES]
+        cumulative = 0
+        latency_buckets = []
+        for bound, count in zip(self.buckets + (float('inf'),), totals[_BUCKETS:]):
+            cumulative += count
+            latency_buckets.append((bound, cumulative))
+        return {
+            'parser': str(self.parser),
+            'calls': totals[_CALLS],
+            'hits': totals[_HITS],
+            'misses': totals[_MISSES],
+            'errors': totals[_ERRORS],
+            'hit_rate': totals[_HITS] / lookups if lookups else None,
+            'latency_sum': totals[_LATENCY_SUM],
+            'latency_buckets': latency_buckets,
+        }
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_bound(bound: float) -> str:
+    return '+Inf' if bound == float('inf') else repr(float(bound))
+
+
+class ConfigMetrics:
+    """
+    Per-parser metrics of :class:`~django_docker_helpers.config.ConfigLoader` created with
+    ``collect_metrics=True``: parser calls, found / missing / failed lookups and a call latency histogram.
+    Lookups skipped by a negative cache don't reach the parser and are not counted, lookups resolved
+    with the key index are counted as hits of the indexed parser.
+
+    Example:
+    ::
+
+        configure = ConfigLoader.from_env(collect_metrics=True)
+
+        def metrics_view(request):
+            return HttpResponse(configure.metrics.to_prometheus(), content_type=PROMETHEUS_CONTENT_TYPE)
+    """
+    def __init__(self, parsers: t.List[BaseParser], buckets: t.Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        """
+        :param parsers: loader parsers
+        :param buckets: sorted latency histogram upper bounds in seconds
+        """
+        self.parsers = [ParserMetrics(p, buckets=buckets) for p in parsers]
+
+    def __getitem__(self, parser_idx: int) -> ParserMetrics:
+        return self.parsers[parser_idx]
+
+    def stats(self) -> t.List[t.Dict[str, t.Any]]:
+        """
+        :return: :meth:`ParserMetrics.stats` in parsers order
+        """
+        return [parser_metrics.stats() for parser_metrics in self.parsers]
+
+    def to_prometheus(self, prefix: str = 'django_docker_helpers_config') -> str:
+        """
+        Formats metrics in the Prometheus text exposition format. Series are labeled with
+        the parser class name and its index in the loader.
+
+        :param prefix: a metric name prefix
+        :return: a text
+        """
+        calls, lookups, latency = [], [], []
+        for idx, parser_metrics in enumerate(self.parsers):
+            stats = parser_metrics.stats()
+            labels = 'parser="{0}",index="{1}"'.format(_escape_label(parser_metrics.parser.__class__.__name__), idx)
+
+            calls.append('{0}_parser_calls_total{{{1}}} {2}'.format(prefix, labels, stats['calls']))
+            for result, counter in (('hit', 'hits'), ('miss', 'misses'), ('error', 'errors')):
+                lookups.append('{0}_parser_lookups_total{{{1},result="{2}"}} {3}'.format(
+                    prefix, labels, result, stats[counter]
+                ))
+            for bound, count in stats['latency_buckets']:
+                latency.append('{0}_parser_latency_seconds_bucket{{{1},le="{2}"}} {3}'.format(
+                    prefix, labels, _format_bound(bound), count
+                ))
+            latency.append('{0}_parser_latency_seconds_sum{{{1}}} {2!r}'.format(prefix, labels, stats['latency_sum']))
+            latency.append('{0}_parser_latency_seconds_count{{{1}}} {2}'.format(prefix, labels, stats['calls']))
+
+        lines = [
+            '# HELP {0}_parser_calls_total Config parser calls.'.format(prefix),
+            '# TYPE {0}_parser_calls_total counter'.format(prefix),
+        ] + calls + [
+            '# HELP {0}_parser_lookups_total Config parser lookups by result.'.format(prefix),
+            '# TYPE {0}_parser_lookups_total counter'.format(prefix),
+        ] + lookups + [
+            '# HELP {0}_parser_latency_seconds Config parser call latency.'.format(prefix),
+            '# TYPE {0}_parser_latency_seconds histogram'.format(prefix),
+        ] + latency
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str, prefix: str = 'django_docker_helpers_config'):
+        """
+        Writes :meth:`to_prometheus` output for a sidecar (e.g. the node exporter textfile collector),
+        the file is replaced atomically.
+
+        :param path: a file path
+        :param prefix: a metric name prefix
+        """
+        tmp_path = '{0}.{1}.tmp'.format(path, os.getpid())
+        with open(tmp_path, 'w') as fp:
+            fp.write(self.to_prometheus(prefix=prefix))
+        os.replace(tmp_path, path)
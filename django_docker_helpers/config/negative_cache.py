@@ -0,0 +1,140 @@
+import hashlib
+import math
+import time
+import typing as t
+
+from django_docker_helpers.config.backends.base import BaseParser
+
+
+class BloomFilter:
+    """
+    A compact probabilistic set of strings: ``item in bloom_filter`` is never ``False`` for an added item
+    and is ``True`` for a missing item with ``error_rate`` probability.
+
+    Example:
+    ::
+
+        bloom_filter = BloomFilter.from_iterable(['debug', 'db.host'])
+        assert 'debug' in bloom_filter
+    """
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        """
+        :param capacity: an expected number of items
+        :param error_rate: a false positive probability when ``capacity`` items added
+        """
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    @classmethod
+    def from_iterable(cls, items: t.Iterable[str], error_rate: float = 0.01) -> 'BloomFilter':
+        items = list(items)
+        bloom_filter = cls(len(items), error_rate=error_rate)
+        for item in items:
+            bloom_filter.add(item)
+        return bloom_filter
+
+    def _positions(self, item: str) -> t.Generator[int, None, None]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: str):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class NegativeLookupCache:
+    """
+    Remembers variable paths a parser does not hold, so
+    :class:`~django_docker_helpers.config.ConfigLoader` can skip the parser for them entirely.
+
+    - every miss is remembered for ``ttl`` seconds;
+    - if the parser is key-enumerable (implements :meth:`~django_docker_helpers.config.backends.base.BaseParser.keys`)
+      a :class:`BloomFilter` of existing keys is built (and rebuilt every ``ttl`` seconds), so paths that are
+      definitely absent are skipped without even a first miss (paths of case-insensitive parsers
+      are folded with :meth:`~django_docker_helpers.config.backends.base.BaseParser.fold_key` on both sides).
+    """
+    def __init__(self,
+                 parser: BaseParser,
+                 ttl: float = 60,
+                 use_bloom_filter: bool = True,
+                 bloom_filter_error_rate: float = 0.01):
+        """
+        :param parser: a parser to track
+        :param ttl: seconds to remember misses and to keep the bloom filter
+        :param use_bloom_filter: build a bloom filter of keys for key-enumerable parsers
+        :param bloom_filter_error_rate: a false positive probability of the bloom filter
+        """
+        self.parser = parser
+        self.ttl = ttl
+        self.use_bloom_filter = use_bloom_filter
+        self.bloom_filter_error_rate = bloom_filter_error_rate
+
+        self.misses = {}  # type: t.Dict[str, float]
+        self.bloom_filter = None  # type: t.Optional[BloomFilter]
+        self.bloom_filter_expires_at = 0.0
+        self.avoided = 0
+
+    def __str__(self):
+        return '<{0} parser={1} avoided={2}>'.format(self.__class__.__name__, self.parser, self.avoided)
+
+    def _get_bloom_filter(self, now: float) -> t.Optional[BloomFilter]:
+        if not self.use_bloom_filter:
+            return None
+
+        if now < self.bloom_filter_expires_at:
+            return self.bloom_filter
+
+        self.bloom_filter_expires_at = now + self.ttl
+        try:
+            self.bloom_filter = BloomFilter.from_iterable(
+                (self.parser.fold_key(key) for key in self.parser.keys()), self.bloom_filter_error_rate
+            )
+        except NotImplementedError:
+            # the parser can't enumerate its keys, don't try again
+            self.use_bloom_filter = False
+            self.bloom_filter = None
+        except Exception:
+            # errors are reported by the regular lookup, just don't trust stale data
+            self.bloom_filter = None
+
+        return self.bloom_filter
+
+    def is_known_miss(self, variable_path: str) -> bool:
+        """
+        :param variable_path: a path to variable in config
+        :return: ``True`` if the parser definitely does not hold ``variable_path``, so the lookup can be skipped
+        """
+        now = time.monotonic()
+
+        expires_at = self.misses.get(variable_path)
+        if expires_at is not None:
+            if now < expires_at:
+                self.avoided += 1
+                return True
+            self.misses.pop(variable_path, None)
+
+        bloom_filter = self._get_bloom_filter(now)
+        if bloom_filter is not None and self.parser.fold_key(variable_path) not in bloom_filter:
+            self.avoided += 1
+            return True
+
+        return False
+
+    def add_miss(self, variable_path: str):
+        self.misses[variable_path] = time.monotonic() + self.ttl
+
+    def invalidate(self):
+        """
+        Forgets all misses and the bloom filter, e.g. after the parser's storage was updated.
+        """
+        self.misses.clear()
+        self.bloom_filter = None
+        self.bloom_filter_expires_at = 0.0
@@ -0,0 +1,236 @@
+import typing as t
+from functools import lru_cache
+
+from django_docker_helpers.utils import shred
+
+from .coercers import get_coercer
+from .exceptions import SchemaValidationError
+
+if t.TYPE_CHECKING:  # pragma: no cover
+    from . import ConfigLoader
+
+
+def compile_converter(coerce_type: t.Optional[t.Type] = None,
+                      coercer: t.Optional[t.Callable] = None) -> t.Optional[t.Callable]:
+    """
+    Decides once how values are coerced, see :meth:`~django_docker_helpers.config.backends.base.BaseParser.coerce`.
+
+    :param coerce_type: cast a value to a specified type
+    :param coercer: perform the type casting with specified callback
+    :return: a callable taking a raw value or ``None`` if values are passed as is
+    """
+    if coercer is not None:
+        return coercer
+    if coerce_type is None:
+        return None
+    return get_coercer(coerce_type)
+
+
+class Field:
+    """
+    A config option of :class:`~django_docker_helpers.config.schema.ConfigSchema`.
+    """
+    def __init__(self,
+                 coerce_type: t.Optional[t.Type] = None,
+                 default: t.Optional[t.Any] = None,
+                 required: bool = False,
+                 coercer: t.Optional[t.Callable] = None,
+                 path: t.Optional[str] = None):
+        """
+        :param coerce_type: cast a value to a specified type
+        :param default: a default value if the option is not present anywhere
+        :param required: report an error if no ``default`` and no value read
+        :param coercer: perform the type casting with specified callback
+        :param path: a path to the option relative to the schema, default is the attribute name
+        """
+        self.coerce_type = coerce_type
+        self.default = default
+        self.required = required
+        self.coercer = coercer
+        self.path = path
+        self.name = None  # type: t.Optional[str]
+        self.convert = compile_converter(coerce_type, coercer)
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+        if self.path is None:
+            self.path = name
+
+    def __repr__(self):
+        return '<{0} {1} type={2}>'.format(
+            self.__class__.__name__, self.path, getattr(self.coerce_type, '__name__', None)
+        )
+
+
+class Section:
+    """
+    A nested :class:`~django_docker_helpers.config.schema.ConfigSchema`.
+    """
+    def __init__(self, schema: t.Type['ConfigSchema'], path: t.Optional[str] = None):
+        """
+        :param schema: a nested schema
+        :param path: a path to the section relative to the parent schema, default is the attribute name
+        """
+        self.schema = schema
+        self.path = path
+        self.name = None  # type: t.Optional[str]
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+        if self.path is None:
+            self.path = name
+
+
+class ConfigValues:
+    """
+    A base class of immutable ``__slots__``-backed objects
+    :func:`~django_docker_helpers.config.schema.resolve_schema` materializes schemas into.
+    """
+    __slots__ = ()
+
+    def __init__(self, **values):
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: t.Any):
+        raise AttributeError('{0} is immutable'.format(self.__class__.__name__))
+
+    def __delattr__(self, name: str):
+        raise AttributeError('{0} is immutable'.format(self.__class__.__name__))
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.as_dict() == other.as_dict()
+
+    def __repr__(self):
+        return '<{0} {1}>'.format(self.__class__.__name__, ' '.join(
+            '{0}={1!r}'.format(name, shred(name, getattr(self, name))) for name in self.__slots__
+        ))
+
+    def as_dict(self) -> t.Dict[str, t.Any]:
+        """
+        :return: a nested dict of values
+        """
+        return {
+            name: value.as_dict() if isinstance(value, ConfigValues) else value
+            for name, value in ((name, getattr(self, name)) for name in self.__slots__)
+        }
+
+
+class ConfigSchema:
+    """
+    A declarative description of config options. Resolve it with
+    :meth:`~django_docker_helpers.config.ConfigLoader.resolve_schema`: all options are read in one batched
+    pass, coerced with converters compiled at class creation, and validation errors are reported together
+    with :class:`~django_docker_helpers.config.exceptions.SchemaValidationError`.
+
+    The result is an immutable instance of a generated ``__slots__`` class
+    (a :class:`~django_docker_helpers.config.schema.ConfigValues` subclass), so a typo is
+    an ``AttributeError`` right away and attribute access is a plain slot read.
+
+    Example:
+    ::
+
+        class DatabaseConfig(ConfigSchema):
+            host = Field(str, default='localhost')
+            port = Field(int, default=5432)
+            password = Field(str, required=True)
+
+        class ProjectConfig(ConfigSchema):
+            debug = Field(bool, default=False)
+            secret_key = Field(str, required=True)
+            db = Section(DatabaseConfig, path='databases.default')
+
+        config = configure.resolve_schema(ProjectConfig)
+        config.db.port  # 5432
+    """
+    _fields = {}  # type: t.Dict[str, t.Union[Field, Section]]
+    values_class = ConfigValues  # type: t.Type[ConfigValues]
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        fields = {}
+        for base in reversed(cls.__mro__[1:]):
+            fields.update(getattr(base, '_fields', {}))
+        fields.update((name, val) for name, val in vars(cls).items() if isinstance(val, (Field, Section)))
+
+        cls._fields = fields
+        cls.values_class = type(cls.__name__, (ConfigValues,), {
+            '__slots__': tuple(fields),
+            '__module__': cls.__module__,
+            '__qualname__': '{0}.values_class'.format(cls.__qualname__),
+        })
+
+
+@lru_cache(maxsize=None)
+def compile_schema(schema: t.Type[ConfigSchema],
+                   prefix: str = '') -> t.Tuple[t.Tuple[t.Tuple[str, ...], str, Field], ...]:
+    """
+    Flattens ``schema`` (once per class) into a tuple of ``(attribute path, variable path, field)``.
+
+    :param schema: a ``ConfigSchema`` subclass
+    :param prefix: a variable path prefix
+    :return: a tuple of all fields of ``schema`` and its sections
+    """
+    plan = []
+    for name, field in schema._fields.items():
+        path = '{0}.{1}'.format(prefix, field.path) if prefix else field.path
+        if isinstance(field, Section):
+            plan.extend(((name,) + attr_path, variable_path, nested_field)
+                        for attr_path, variable_path, nested_field in compile_schema(field.schema, path))
+        else:
+            plan.append(((name,), path, field))
+    return tuple(plan)
+
+
+def _materialize(schema: t.Type[ConfigSchema],
+                 values: t.Dict[t.Tuple[str, ...], t.Any],
+                 attr_path: t.Tuple[str, ...] = ()) -> ConfigValues:
+    return schema.values_class(**{
+        name: (
+            _materialize(field.schema, values, attr_path + (name,))
+            if isinstance(field, Section) else values[attr_path + (name,)]
+        )
+        for name, field in schema._fields.items()
+    })
+
+
+def resolve_schema(loader: 'ConfigLoader', schema: t.Type[ConfigSchema]) -> ConfigValues:
+    """
+    Reads all options of ``schema`` with a single
+    :meth:`~django_docker_helpers.config.ConfigLoader.lookup_many` pass, coerces them with
+    fields' converters and materializes the result.
+
+    :param loader: a config loader
+    :param schema: a ``ConfigSchema`` subclass
+    :return: an instance of ``schema.values_class``
+
+    :raises config.exceptions.SchemaValidationError: with all coercion errors and empty required values
+    """
+    plan = compile_schema(schema)
+    found = loader.lookup_many([variable_path for _attr_path, variable_path, _field in plan])
+
+    values = {}
+    errors = {}
+    for attr_path, variable_path, field in plan:
+        if variable_path not in found:
+            if field.required and not field.default:
+                errors[variable_path] = 'No default provided and no value read'
+                continue
+            values[attr_path] = loader.get_default(variable_path, default=field.default)
+            continue
+
+        parser, val = found[variable_path]
+        try:
+            values[attr_path] = field.convert(val) if field.convert else val
+        except (TypeError, ValueError) as e:
+            errors[variable_path] = 'Cannot coerce {0!r} read from {1}: {2}'.format(
+                shred(variable_path, val), parser, shred(variable_path, e)
+            )
+            continue
+        loader.enqueue(variable_path, parser, values[attr_path])
+
+    if errors:
+        raise SchemaValidationError(errors)
+
+    return _materialize(schema, values)
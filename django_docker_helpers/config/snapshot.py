@@ -0,0 +1,245 @@
+import bisect
+import mmap
+import os
+import pickle
+import struct
+import time
+import typing as t
+from contextlib import contextmanager
+
+from .exceptions import InvalidSnapshot
+
+MAGIC = b'DDHCFG01'
+
+#: magic, creation time, number of entries
+HEADER = struct.Struct('<8sdI')
+
+#: key offset, key length, value offset, value length
+ENTRY = struct.Struct('<IIII')
+
+#: snapshots handed off with :func:`write_inheritable_snapshot` are read via inherited descriptors
+INHERITED_SNAPSHOT_PREFIX = '/proc/self/fd/'
+
+
+def dump_snapshot(items: t.Iterable[t.Tuple[str, t.Any]], created_at: t.Optional[float] = None) -> bytes:
+    """
+    Serializes ``(path, value)`` pairs into a compact snapshot:
+    a header, a table of fixed-size entries sorted by path, paths and pickled values.
+    Paths are looked up with a binary search right in the (mmap'd) buffer, so nothing is deserialized
+    until it's read.
+
+    :param items: ``(path, value)`` pairs, values must be picklable
+    :param created_at: a unix timestamp to store, default is now
+    :return: a snapshot
+    """
+    items = sorted((path.encode(), pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)) for path, value in items)
+
+    keys_offset = HEADER.size + ENTRY.size * len(items)
+    values_offset = keys_offset + sum(len(key) for key, _value in items)
+
+    entries, keys, values = [], [], []
+    key_pos, value_pos = keys_offset, values_offset
+    for key, value in items:
+        entries.append(ENTRY.pack(key_pos, len(key), value_pos, len(value)))
+        keys.append(key)
+        values.append(value)
+        key_pos += len(key)
+        value_pos += len(value)
+
+    header = HEADER.pack(MAGIC, time.time() if created_at is None else created_at, len(items))
+    return b''.join([header] + entries + keys + values)
+
+
+def write_snapshot(path: str, items: t.Iterable[t.Tuple[str, t.Any]]):
+    """
+    Atomically writes a snapshot of ``items`` to ``path``. The file is readable by the owner only.
+
+    :param path: a file path
+    :param items: ``(path, value)`` pairs
+    """
+    data = dump_snapshot(items)
+    tmp_path = '{0}.{1}.tmp'.format(path, os.getpid())
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        with os.fdopen(fd, 'wb') as fp:
+            fp.write(data)
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+@contextmanager
+def snapshot_lock(path: str):
+    """
+    An exclusive ``flock`` on ``<path>.lock`` held while the first process writes the snapshot,
+    so other processes wait for it instead of resolving the config too.
+    """
+    import fcntl
+
+    with open('{0}.lock'.format(path), 'a') as fp:
+        fcntl.flock(fp.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fp.fileno(), fcntl.LOCK_UN)
+
+
+class Snapshot:
+    """
+    A read-only view of a snapshot written with :func:`~django_docker_helpers.config.snapshot.write_snapshot`.
+
+    The file is ``mmap``-ed, so all processes reading the same snapshot share its pages
+    and values are unpickled only when they are read.
+    """
+    def __init__(self, path: str, buffer: t.Union[bytes, mmap.mmap]):
+        if len(buffer) < HEADER.size:
+            raise InvalidSnapshot('Snapshot `{0}` is truncated'.format(path))
+
+        magic, self.created_at, self.count = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise InvalidSnapshot('`{0}` is not a config snapshot'.format(path))
+
+        self.path = path
+        self.buffer = buffer
+        self._keys = _SnapshotKeys(self)
+
+    @classmethod
+    def open(cls, path: str) -> 'Snapshot':
+        """
+        :param path: a snapshot file path, e.g. ``/proc/self/fd/3`` for an inherited file descriptor
+        :raises InvalidSnapshot: if the file is not a snapshot or anyone but the current user can write it
+        """
+        with open(path, 'rb') as fp:
+            stat = os.fstat(fp.fileno())
+            # snapshots are unpickled: never trust files other users could have written
+            if stat.st_uid != os.getuid() or stat.st_mode & 0o022:
+                raise InvalidSnapshot('Snapshot `{0}` must be writable by its owner only'.format(path))
+            if not stat.st_size:
+                raise InvalidSnapshot('Snapshot `{0}` is empty'.format(path))
+            return cls(path, mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.created_at
+
+    def _entry(self, idx: int) -> t.Tuple[int, int, int, int]:
+        return ENTRY.unpack_from(self.buffer, HEADER.size + ENTRY.size * idx)
+
+    def key(self, idx: int) -> str:
+        key_offset, key_len, _value_offset, _value_len = self._entry(idx)
+        return self.buffer[key_offset:key_offset + key_len].decode()
+
+    def value(self, idx: int) -> t.Any:
+        _key_offset, _key_len, value_offset, value_len = self._entry(idx)
+        return pickle.loads(self.buffer[value_offset:value_offset + value_len])
+
+    def find(self, path: str) -> int:
+        """
+        :return: an index of ``path`` or ``-1``
+        """
+        idx = bisect.bisect_left(self._keys, path.encode())
+        if idx < self.count and self._keys[idx] == path.encode():
+            return idx
+        return -1
+
+    def iter_prefix(self, prefix: str) -> t.Generator[int, None, None]:
+        """
+        Yields indexes of all paths starting with ``prefix`` in sorted order.
+        """
+        prefix = prefix.encode()
+        for idx in range(bisect.bisect_left(self._keys, prefix), self.count):
+            if not self._keys[idx].startswith(prefix):
+                break
+            yield idx
+
+    def close(self):
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+
+
+class _SnapshotKeys(t.Sequence[bytes]):
+    """
+    A lazy sequence of encoded paths for ``bisect``.
+    """
+    def __init__(self, snapshot: Snapshot):
+        self.snapshot = snapshot
+
+    def __len__(self):
+        return self.snapshot.count
+
+    def __getitem__(self, idx):
+        key_offset, key_len, _value_offset, _value_len = self.snapshot._entry(idx)
+        return self.snapshot.buffer[key_offset:key_offset + key_len]
+
+
+def is_fresh_snapshot(path: str, ttl: t.Optional[float] = None) -> bool:
+    """
+    :param path: a snapshot file path
+    :param ttl: max snapshot age in seconds, ``None`` means forever
+    :return: ``True`` if ``path`` is a valid snapshot not older than ``ttl``
+    """
+    try:
+        snapshot = Snapshot.open(path)
+    except (OSError, InvalidSnapshot):
+        return False
+
+    try:
+        return ttl is None or snapshot.age <= ttl
+    finally:
+        snapshot.close()
+
+
+def is_inherited_snapshot(path: str) -> bool:
+    """
+    :param path: a snapshot file path
+    :return: ``True`` if ``path`` refers to an inherited file descriptor written with
+     :func:`~django_docker_helpers.config.snapshot.write_inheritable_snapshot`
+    """
+    return path.startswith(INHERITED_SNAPSHOT_PREFIX)
+
+
+def write_inheritable_snapshot(items: t.Iterable[t.Tuple[str, t.Any]], name: str = 'config-snapshot') -> str:
+    """
+    Writes a snapshot of ``items`` into an anonymous sealed ``memfd`` (or an unlinked private temp file
+    if ``memfd_create`` is not available) that is inherited across ``exec`` and ``fork``.
+
+    :param items: ``(path, value)`` pairs
+    :param name: a memfd name for debugging (``/proc/<pid>/fd``)
+    :return: a path to read the snapshot from in this process and its children:
+     ``/proc/self/fd/<fd>``, or the temp file path if there's no ``/proc``
+    """
+    import tempfile
+
+    data = dump_snapshot(items)
+    sealable = hasattr(os, 'memfd_create') and hasattr(os, 'MFD_ALLOW_SEALING')
+    path = None
+    try:
+        fd = os.memfd_create(name, os.MFD_ALLOW_SEALING) if sealable else os.memfd_create(name)
+        os.fchmod(fd, 0o600)
+    except (AttributeError, OSError):
+        sealable = False
+        fd, path = tempfile.mkstemp(prefix='{0}-'.format(name))
+
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+    if sealable:
+        import fcntl
+        # nobody can change the snapshot after it's handed off
+        fcntl.fcntl(fd, fcntl.F_ADD_SEALS,
+                    fcntl.F_SEAL_SHRINK | fcntl.F_SEAL_GROW | fcntl.F_SEAL_WRITE | fcntl.F_SEAL_SEAL)
+
+    os.set_inheritable(fd, True)
+
+    if os.path.isdir('/proc/self/fd'):
+        if path:
+            os.unlink(path)
+        return '{0}{1}'.format(INHERITED_SNAPSHOT_PREFIX, fd)
+
+    os.close(fd)
+    return path
@@ -1,65 +1,336 @@
-from time import sleep
+import errno
+import os
+import select
+import socket
+import threading
+import time
+import typing as t
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import urlsplit
 
 from django.conf import settings
 from django.core.cache import caches
 from django.core.management import execute_from_command_line
-from django.db import OperationalError, connections
+from django.db import IntegrityError, OperationalError, connections
 
+from django_docker_helpers.profiling import profiled
+from django_docker_helpers.retry import RetrySchedule
 from django_docker_helpers.utils import run_env_once, wf
 
 
+ProbeResult = namedtuple('ProbeResult', ['alias', 'ready', 'attempts', 'elapsed', 'error'])
+
+
+class ReadinessReport(list):
+    """
+    A list of :class:`ProbeResult` (one per alias) returned by
+    :func:`~django_docker_helpers.db.ensure_databases_alive` and
+    :func:`~django_docker_helpers.db.ensure_caches_alive`. It's truthy if all aliases are ready,
+    so it can be used as a plain ``bool``.
+    """
+    def __bool__(self):
+        return all(result.ready for result in self)
+
+    def __getitem__(self, item):
+        if isinstance(item, str):
+            for result in self:
+                if result.alias == item:
+                    return result
+            raise KeyError(item)
+        return super().__getitem__(item)
+
+    @property
+    def failed(self) -> t.List[ProbeResult]:
+        return [result for result in self if not result.ready]
+
+
+DEFAULT_DATABASE_PORTS = {
+    'postgresql': 5432,
+    'postgis': 5432,
+    'mysql': 3306,
+    'oracle': 1521,
+}
+
+#: ``(socket family, address)``: ``(AF_INET, (host, port))`` or ``(AF_UNIX, path)``
+SocketAddress = t.Tuple[int, t.Union[str, t.Tuple[str, int]]]
+
+
+def database_addresses(db_settings: dict) -> t.List[SocketAddress]:
+    """
+    Derives a socket address of a database server from its ``settings.DATABASES`` entry.
+    ``HOST`` starting with ``/`` is a unix socket (a directory for PostgreSQL).
+
+    :param db_settings: a database settings dict
+    :return: a list with an address or an empty list if it's unknown (SQLite, default local sockets, etc)
+    """
+    engine = db_settings.get('ENGINE') or ''
+    vendor = next((name for name in DEFAULT_DATABASE_PORTS if name in engine), None)
+    host = db_settings.get('HOST')
+    if vendor is None or not host:
+        return []
+
+    port = int(db_settings.get('PORT') or DEFAULT_DATABASE_PORTS[vendor])
+    if host.startswith('/'):
+        if vendor in ('postgresql', 'postgis'):
+            return [(socket.AF_UNIX, '{0}/.s.PGSQL.{1}'.format(host.rstrip('/'), port))]
+        return [(socket.AF_UNIX, host)]
+    return [(socket.AF_INET, (host, port))]
+
+
+def cache_addresses(cache_settings: dict) -> t.List[SocketAddress]:
+    """
+    Derives socket addresses of memcached / redis servers from a ``settings.CACHES`` entry:
+    ``host:port``, ``redis://host:port/0``, ``unix:/path`` or ``/path`` locations (a string, a list or
+    a ``;`` / ``,`` separated string).
+
+    :param cache_settings: a cache settings dict
+    :return: a list of addresses, empty for local backends (locmem, file, database, dummy)
+    """
+    # a module path: ``LocMemCache`` is not memcached
+    backend = (cache_settings.get('BACKEND') or '').lower().rsplit('.', 1)[0]
+    if 'redis' in backend:
+        default_port = 6379
+    elif 'memcache' in backend:
+        default_port = 11211
+    else:
+        return []
+
+    locations = cache_settings.get('LOCATION') or []
+    if isinstance(locations, str):
+        locations = locations.replace(',', ';').split(';')
+
+    addresses = []
+    for location in (location.strip() for location in locations):
+        if not location:
+            continue
+        if location.startswith('unix:'):
+            location = location[len('unix:'):]
+            # redis-py style unix:///path
+            location = '/' + location.lstrip('/') if location.startswith('//') else location
+        if location.startswith('/'):
+            addresses.append((socket.AF_UNIX, location))
+            continue
+
+        parts = urlsplit(location if '://' in location else '//' + location)
+        if parts.scheme == 'unix' or (parts.scheme and not parts.hostname):
+            addresses.append((socket.AF_UNIX, parts.path))
+            continue
+        addresses.append((socket.AF_INET, (parts.hostname, parts.port or default_port)))
+    return addresses
+
+
+def _connect(family: int, sockaddr: t.Any, timeout: float):
+    with socket.socket(family, socket.SOCK_STREAM) as sock:
+        sock.setblocking(False)
+        code = sock.connect_ex(sockaddr)
+        if code in (errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN):
+            _r, writable, _x = select.select([], [sock], [], timeout)
+            code = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) if writable else errno.ETIMEDOUT
+        if code:
+            raise ConnectionError('{0} does not accept connections: {1}'.format(
+                ':'.join(map(str, sockaddr[:2])) if isinstance(sockaddr, tuple) else sockaddr, os.strerror(code)
+            ))
+
+
+def check_socket(address: SocketAddress, timeout: float = 1.0):
+    """
+    Checks a server accepts connections with a non-blocking connect: no driver, no handshake, no auth.
+
+    A host name is resolved to all its addresses (e.g. ``::1`` and ``127.0.0.1`` for ``localhost``),
+    they are tried in order till the first successful connect.
+
+    :param address: ``(family, address)``, see :func:`~django_docker_helpers.db.database_addresses`
+    :param timeout: a connect timeout in seconds per resolved address
+    :raises ConnectionError: if the server does not accept connections on any of its addresses
+    """
+    family, sockaddr = address
+    candidates = [(family, sockaddr)]
+    if family == socket.AF_INET:
+        try:
+            candidates = [
+                (_family, _sockaddr)
+                for _family, _type, _proto, _name, _sockaddr in socket.getaddrinfo(*sockaddr, type=socket.SOCK_STREAM)
+            ]
+        except socket.gaierror as e:
+            raise ConnectionError('Cannot resolve {0}: {1}'.format(sockaddr[0], e))
+
+    errors = []
+    for candidate_family, candidate_sockaddr in candidates:
+        try:
+            _connect(candidate_family, candidate_sockaddr, timeout)
+            return
+        except ConnectionError as e:
+            errors.append(str(e))
+        except OSError as e:
+            # e.g. IPv6 is disabled in the container
+            errors.append('{0}: {1}'.format(candidate_sockaddr, e))
+
+    raise ConnectionError('; '.join(errors))
+
+
+def probe_concurrently(aliases: t.Iterable[str],
+                       check: t.Callable[[str], t.Any],
+                       max_retries: t.Optional[int] = 100,
+                       retry_timeout: float = 5,
+                       timeout: t.Optional[float] = None,
+                       errors: t.Tuple[t.Type[Exception], ...] = (Exception,),
+                       cleanup: t.Optional[t.Callable[[str], t.Any]] = None,
+                       precheck: t.Optional[t.Callable[[str], t.Any]] = None) -> ReadinessReport:
+    """
+    Runs ``check(alias)`` for every alias in its own thread until it passes, ``max_retries`` attempts
+    are made or the overall ``timeout`` is over, so the total wait is bounded by the slowest alias
+    instead of the sum of all of them. Every output line is prefixed with an alias.
+
+    Attempts are spaced with :class:`~django_docker_helpers.retry.RetrySchedule`: a few fast polls, then
+    exponential backoff with full jitter up to ``retry_timeout``.
+
+    :param aliases: aliases to check
+    :param check: a callable raising one of ``errors`` if an alias is not ready
+    :param max_retries: a number of attempts to reach every alias, ``None`` means only ``timeout`` counts
+    :param retry_timeout: max delay in seconds between attempts
+    :param timeout: an overall deadline in seconds, ``None`` means only ``max_retries`` count
+    :param errors: exceptions meaning "not ready yet", others are reported right away
+    :param cleanup: a callable run for an alias in its thread after probing (e.g. closes a connection)
+    :param precheck: a cheap callable raising ``OSError`` while an alias can't be ready (e.g. its port is closed),
+     ``check`` runs only after it passes. Repeated precheck errors are reported once
+    :return: a :class:`ReadinessReport` in ``aliases`` order
+    """
+    aliases = list(aliases)
+    started_at = time.monotonic()
+
+    def _probe(alias: str) -> ProbeResult:
+        error = None
+        schedule = RetrySchedule(deadline=timeout, max_attempts=max_retries, max_delay=retry_timeout)
+        try:
+            for attempt in schedule:
+                if precheck is not None:
+                    try:
+                        precheck(alias)
+                    except OSError as e:
+                        if str(e) != str(error):
+                            wf('[{0}] attempt {1}: {2}\n'.format(alias, attempt, e))
+                        error = e
+                        continue
+
+                try:
+                    check(alias)
+                    elapsed = time.monotonic() - started_at
+                    wf('[{0}] [+] ready in {1:.2f}s after {2} attempt(s)\n'.format(alias, elapsed, attempt))
+                    return ProbeResult(alias, True, attempt, elapsed, None)
+                except errors as e:
+                    error = e
+                    wf('[{0}] attempt {1}: {2}\n'.format(alias, attempt, str(e).strip()))
+        except Exception as e:
+            error = e
+            wf('[{0}] [-] {1}\n'.format(alias, e))
+        finally:
+            if cleanup is not None:
+                cleanup(alias)
+
+        return ProbeResult(alias, False, schedule.attempts, time.monotonic() - started_at, error)
+
+    if not aliases:
+        return ReadinessReport()
+
+    with ThreadPoolExecutor(max_workers=len(aliases), thread_name_prefix='probe') as executor:
+        report = ReadinessReport(executor.map(_probe, aliases))
+
+    for result in report.failed:
+        wf('[{0}] Tried {1} time(s) in {2:.2f}s: {3}\n'.format(result.alias, result.attempts, result.elapsed,
+                                                               result.error))
+    return report
+
+
+def _precheck_addresses(addresses: t.List[SocketAddress]):
+    for address in addresses:
+        check_socket(address)
+
+
+def _check_cache(cache_alias: str):
+    cache = caches[cache_alias]
+    cache.set('django-docker-helpers:available-check', '1')
+    assert cache.get('django-docker-helpers:available-check') == '1'
+    cache.delete('django-docker-helpers:available-check')
+
+
+def _check_database(connection_name: str):
+    with connections[connection_name].cursor() as cursor:
+        cursor.execute('SELECT 1')
+        cursor.fetchone()
+
+
+def _readiness_budget(max_retries: t.Optional[int],
+                      retry_timeout: float,
+                      timeout: t.Optional[float]) -> t.Tuple[t.Optional[int], t.Optional[float]]:
+    # jittered delays average half of ``retry_timeout``, so ``max_retries`` attempts alone would give up
+    # about twice as early as fixed ``retry_timeout`` sleeps did: keep retrying for that worst-case wait instead
+    if timeout is None and max_retries is not None:
+        return None, max_retries * retry_timeout
+    return max_retries, timeout
+
+
 @run_env_once
-def ensure_caches_alive(max_retries: int = 100,
+@profiled('db.ensure_caches_alive')
+def ensure_caches_alive(max_retries: t.Optional[int] = 100,
                         retry_timeout: int = 5,
-                        exit_on_failure: bool = True) -> bool:
+                        exit_on_failure: bool = True,
+                        timeout: t.Optional[float] = None) -> ReadinessReport:
     """
-    Checks every cache backend alias in ``settings.CACHES`` until it becomes available. After ``max_retries``
-    attempts to reach any backend are failed it returns ``False``. If ``exit_on_failure`` is set it shuts down with
-    ``exit(1)``.
+    Concurrently checks every cache backend alias in ``settings.CACHES`` until it becomes available
+    (see :func:`~django_docker_helpers.db.probe_concurrently`). After ``max_retries`` attempts to reach
+    any backend are failed (or ``timeout`` is over) the report is falsy. If ``exit_on_failure`` is set it shuts
+    down with ``exit(1)``.
 
     It sets the ``django-docker-helpers:available-check`` key for every cache backend to ensure
     it's receiving connections. If check is passed the key is deleted.
+    Until then memcached / redis servers are polled with a cheap socket connect
+    (see :func:`~django_docker_helpers.db.cache_addresses`).
 
     :param exit_on_failure: set to ``True`` if there's no sense to continue
-    :param int max_retries: a number of attempts to reach cache backend, default is ``100``
-    :param int retry_timeout: a timeout in seconds between attempts, default is ``5``
-    :return: ``True`` if all backends are available ``False`` if any backend check failed
-    """
-    for cache_alias in settings.CACHES.keys():
-        cache = caches[cache_alias]
-        wf('Checking if the cache backed is accessible for the alias `%s`... ' % cache_alias, False)
-        for i in range(max_retries):
-            try:
-                cache.set('django-docker-helpers:available-check', '1')
-                assert cache.get('django-docker-helpers:available-check') == '1'
-                cache.delete('django-docker-helpers:available-check')
-                wf('[+]\n')
-                break
-            except Exception as e:
-                wf(str(e) + '\n')
-                sleep(retry_timeout)
-        else:
-            wf('Tried %s time(s). Shutting down.\n' % max_retries)
-            exit_on_failure and exit(1)
-            return False
-    return True
+    :param int max_retries: a number of attempts to reach cache backend, default is ``100``,
+     ``None`` means only ``timeout`` counts. Without ``timeout`` backends are polled until
+     ``max_retries * retry_timeout`` seconds are over (the longest wait of fixed ``retry_timeout`` pauses)
+    :param int retry_timeout: max delay in seconds between attempts (they back off with jitter), default is ``5``
+    :param timeout: an overall deadline in seconds for all backends
+    :return: a :class:`ReadinessReport`, it's truthy if all backends are available
+    """
+    wf('Checking if cache backends are accessible: {0}\n'.format(', '.join(settings.CACHES.keys())))
+    max_retries, timeout = _readiness_budget(max_retries, retry_timeout, timeout)
+    report = probe_concurrently(settings.CACHES.keys(), _check_cache,
+                                max_retries=max_retries, retry_timeout=retry_timeout, timeout=timeout,
+                                cleanup=lambda alias: caches[alias].close(),
+                                precheck=lambda alias: _precheck_addresses(cache_addresses(settings.CACHES[alias])))
+    if not report:
+        wf('Shutting down.\n')
+        exit_on_failure and exit(1)
+    return report
 
 
 @run_env_once
-def ensure_databases_alive(max_retries: int = 100,
+@profiled('db.ensure_databases_alive')
+def ensure_databases_alive(max_retries: t.Optional[int] = 100,
                            retry_timeout: int = 5,
-                           exit_on_failure: bool = True) -> bool:
+                           exit_on_failure: bool = True,
+                           timeout: t.Optional[float] = None) -> ReadinessReport:
     """
-    Checks every database alias in ``settings.DATABASES`` until it becomes available. After ``max_retries``
-    attempts to reach any backend are failed it returns ``False``. If ``exit_on_failure`` is set it shuts down with
-    ``exit(1)``.
+    Concurrently checks every database alias in ``settings.DATABASES`` until it becomes available
+    (see :func:`~django_docker_helpers.db.probe_concurrently`). After ``max_retries`` attempts to reach
+    any backend are failed (or ``timeout`` is over) the report is falsy. If ``exit_on_failure`` is set it shuts
+    down with ``exit(1)``.
 
-    For every database alias it tries to ``SELECT 1``. If no errors raised it checks the next alias.
+    For every database alias it tries to ``SELECT 1`` in a separate thread (with its own connection that is
+    closed afterwards). Until the server's port (or unix socket) accepts connections it's polled with a cheap
+    socket connect instead (see :func:`~django_docker_helpers.db.database_addresses`).
 
     :param exit_on_failure: set to ``True`` if there's no sense to continue
-    :param int max_retries: number of attempts to reach every database; default is ``100``
-    :param int retry_timeout: timeout in seconds between attempts
-    :return: ``True`` if all backends are available, ``False`` if any backend check failed
+    :param int max_retries: number of attempts to reach every database; default is ``100``,
+     ``None`` means only ``timeout`` counts. Without ``timeout`` databases are polled until
+     ``max_retries * retry_timeout`` seconds are over (the longest wait of fixed ``retry_timeout`` pauses)
+    :param int retry_timeout: max delay in seconds between attempts (they back off with jitter)
+    :param timeout: an overall deadline in seconds for all databases
+    :return: a :class:`ReadinessReport`, it's truthy if all databases are available
     """
     template = """
     =============================
@@ -78,40 +349,279 @@ def ensure_databases_alive(max_retries: int = 100,
             _db_settings['PASSWORD'] = 'set'
 
         wf(template.format(**_db_settings))
-        wf('Checking db connection alive... ', False)
 
-        for i in range(max_retries):
-            try:
-                cursor = connections[connection_name].cursor()
-                cursor.execute('SELECT 1')
-                cursor.fetchone()
-
-                wf('[+]\n')
-                break
-            except OperationalError as e:
-                wf(str(e))
-                sleep(retry_timeout)
-        else:
-            wf('Tried %s time(s). Shutting down.\n' % max_retries)
-            exit_on_failure and exit(1)
+    max_retries, timeout = _readiness_budget(max_retries, retry_timeout, timeout)
+    report = probe_concurrently(list(connections), _check_database,
+                                max_retries=max_retries, retry_timeout=retry_timeout, timeout=timeout,
+                                errors=(OperationalError,), cleanup=lambda alias: connections[alias].close(),
+                                precheck=lambda alias: _precheck_addresses(
+                                    database_addresses(settings.DATABASES[alias])
+                                ))
+    if not report:
+        wf('Shutting down.\n')
+        exit_on_failure and exit(1)
+    return report
+
+
+def migration_files_fingerprint() -> str:
+    """
+    A hash of names, sizes and modification times of migration files of all installed apps.
+    It's computed without importing migrations or building the migration graph.
+    """
+    import hashlib
+    from importlib import import_module
+
+    from django.apps import apps
+    from django.db.migrations.loader import MigrationLoader
+
+    digest = hashlib.sha1()
+    for app_config in apps.get_app_configs():
+        module_name, _explicit = MigrationLoader.migrations_module(app_config.label)
+        if module_name is None:
+            continue
+        try:
+            module = import_module(module_name)
+        except ImportError:
+            continue
+
+        for directory in getattr(module, '__path__', []):
+            for file_name in sorted(os.listdir(directory)):
+                if not file_name.endswith(('.py', '.pyc')) or file_name.startswith('~'):
+                    continue
+                stat = os.stat(os.path.join(directory, file_name))
+                digest.update('{0}:{1}:{2}:{3}\n'.format(
+                    app_config.label, file_name, stat.st_size, stat.st_mtime_ns
+                ).encode())
+    return digest.hexdigest()
+
+
+def applied_migrations_fingerprint(database: str = 'default') -> t.Optional[str]:
+    """
+    A hash of migrations recorded as applied in ``database`` (a single query to ``django_migrations``).
+
+    :return: a hash or ``None`` if there's no migrations table yet
+    """
+    import hashlib
+
+    from django.db.migrations.recorder import MigrationRecorder
+
+    recorder = MigrationRecorder(connections[database])
+    if not recorder.has_table():
+        return None
+    applied = sorted('{0}.{1}'.format(*key) for key in recorder.applied_migrations())
+    return hashlib.sha1('\n'.join(applied).encode()).hexdigest()
+
+
+def migration_plan(database: str = 'default') -> t.List[t.Tuple[t.Any, bool]]:
+    """
+    Computes unapplied migrations for ``database`` like ``migrate`` does (it loads the migration graph,
+    but doesn't render model states).
+
+    :return: a list of ``(migration, backwards)``
+    """
+    from django.db.migrations.executor import MigrationExecutor
+
+    executor = MigrationExecutor(connections[database])
+    return executor.migration_plan(executor.loader.graph.leaf_nodes())
+
+
+def _migrated_state_fingerprint(database: str) -> t.Optional[str]:
+    applied = applied_migrations_fingerprint(database)
+    if applied is None:
+        return None
+    return '{0}:{1}:{2}'.format(database, migration_files_fingerprint(), applied)
+
+
+def _write_fingerprint(fingerprint_file: str, fingerprint: t.Optional[str]):
+    if fingerprint is None:
+        return
+    try:
+        with open(fingerprint_file, 'w') as fp:
+            fp.write(fingerprint)
+    except OSError as e:
+        wf('Cannot write migrations fingerprint `{0}`: {1}\n'.format(fingerprint_file, e))
+
+
+def is_migrated(database: str = 'default', fingerprint_file: t.Optional[str] = None) -> bool:
+    """
+    Checks there's nothing to migrate in ``database``.
+
+    If ``fingerprint_file`` contains the current fingerprint of migration files and applied migrations,
+    the migration graph is not loaded at all. Otherwise the migration plan is computed and, if it's empty,
+    the fingerprint is stored into ``fingerprint_file``.
+
+    :param database: a database alias
+    :param fingerprint_file: a file to cache the fingerprint of the migrated state in
+    :return: ``True`` if there are no unapplied migrations
+    """
+    fingerprint = None
+    if fingerprint_file:
+        fingerprint = _migrated_state_fingerprint(database)
+        if fingerprint is None:
             return False
+        try:
+            with open(fingerprint_file) as fp:
+                if fp.read().strip() == fingerprint:
+                    return True
+        except OSError:
+            pass
+
+    if migration_plan(database):
+        return False
+
+    if fingerprint_file:
+        _write_fingerprint(fingerprint_file, fingerprint)
     return True
 
 
+MIGRATION_LOCK_NAME = 'django-docker-helpers:migrate'
+
+#: a fallback lock table for databases without advisory locks
+LOCK_TABLE = 'django_docker_helpers_lock'
+
+
+def _advisory_lock_key(name: str) -> int:
+    import zlib
+    # a signed 32-bit key fits ``pg_advisory_lock(bigint)`` on every PostgreSQL version
+    return zlib.crc32(name.encode()) - 2 ** 31
+
+
+@contextmanager
+def database_lock(name: str,
+                  database: str = 'default',
+                  timeout: t.Optional[float] = None,
+                  stale_after: t.Optional[float] = 3600):
+    """
+    A cluster-wide lock held in ``database``: a session-level advisory lock on PostgreSQL,
+    a row in the ``django_docker_helpers_lock`` table on other databases. Waiting is spaced with
+    :class:`~django_docker_helpers.retry.RetrySchedule`.
+
+    :param name: a lock name
+    :param database: a database alias
+    :param timeout: max seconds to wait for the lock, ``None`` waits forever
+    :param stale_after: seconds after which a lock table row is considered left by a crashed process and removed
+     (advisory locks are released by PostgreSQL when a session ends), ``None`` keeps rows forever;
+     the holder refreshes its row every ``stale_after / 4`` seconds, so a long migration never gets stale
+    :raises TimeoutError: if the lock was not acquired in ``timeout``
+    """
+    connection = connections[database]
+    if connection.vendor == 'postgresql':
+        key = _advisory_lock_key(name)
+
+        def _acquire() -> bool:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_try_advisory_lock(%s)', [key])
+                return cursor.fetchone()[0]
+
+        def _release():
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_unlock(%s)', [key])
+    else:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'CREATE TABLE IF NOT EXISTS {0} (name VARCHAR(255) PRIMARY KEY, acquired_at REAL NOT NULL)'.format(
+                    connection.ops.quote_name(LOCK_TABLE)
+                )
+            )
+        table = connection.ops.quote_name(LOCK_TABLE)
+
+        def _acquire() -> bool:
+            with connection.cursor() as cursor:
+                if stale_after is not None:
+                    cursor.execute('DELETE FROM {0} WHERE name = %s AND acquired_at < %s'.format(table),
+                                   [name, time.time() - stale_after])
+                try:
+                    cursor.execute('INSERT INTO {0} (name, acquired_at) VALUES (%s, %s)'.format(table),
+                                   [name, time.time()])
+                except IntegrityError:
+                    return False
+            return True
+
+        def _release():
+            with connection.cursor() as cursor:
+                cursor.execute('DELETE FROM {0} WHERE name = %s'.format(table), [name])
+
+        def _heartbeat(stop: threading.Event):
+            # runs in its own thread, so it uses its own connection
+            try:
+                while not stop.wait(stale_after / 4):
+                    try:
+                        with connections[database].cursor() as cursor:
+                            cursor.execute('UPDATE {0} SET acquired_at = %s WHERE name = %s'.format(table),
+                                           [time.time(), name])
+                    except Exception as e:
+                        wf('Cannot refresh the `{0}` lock: {1}\n'.format(name, e))
+            finally:
+                connections[database].close()
+
+    schedule = RetrySchedule(deadline=timeout, max_delay=2)
+    for attempt in schedule:
+        if _acquire():
+            break
+        if attempt == 1:
+            wf('Waiting for the `{0}` lock... '.format(name), False)
+    else:
+        raise TimeoutError('Lock `{0}` was not acquired in {1}s'.format(name, timeout))
+
+    heartbeat, stop_heartbeat = None, threading.Event()
+    if connection.vendor != 'postgresql' and stale_after is not None:
+        heartbeat = threading.Thread(target=_heartbeat, args=(stop_heartbeat,), daemon=True)
+        heartbeat.start()
+
+    try:
+        yield
+    finally:
+        if heartbeat is not None:
+            stop_heartbeat.set()
+            heartbeat.join()
+        _release()
+
+
 @run_env_once
-def migrate(*argv) -> bool:
+@profiled('db.migrate')
+def migrate(*argv,
+            skip_if_migrated: bool = True,
+            fingerprint_file: t.Optional[str] = None,
+            lock: bool = False,
+            lock_timeout: t.Optional[float] = None) -> bool:
     """
     Runs Django migrate command.
 
+    Without ``argv`` the ``default`` database is checked with :func:`~django_docker_helpers.db.is_migrated` first,
+    so the command (it builds the migration graph and renders all model states) is skipped when nothing
+    is unapplied.
+
+    :param argv: ``migrate`` command arguments
+    :param skip_if_migrated: skip the command if there's nothing to migrate
+    :param fingerprint_file: a file to cache the migrated state fingerprint in, may be set with
+     ``MIGRATE_FINGERPRINT_FILE`` environment variable, see :func:`~django_docker_helpers.db.is_migrated`
+    :param lock: hold :func:`~django_docker_helpers.db.database_lock` on the ``default`` database while migrating,
+     so when many replicas start at once only one applies migrations and others find nothing to do
+    :param lock_timeout: max seconds to wait for the lock
     :return: always ``True``
     """
+    if lock:
+        with database_lock(MIGRATION_LOCK_NAME, timeout=lock_timeout):
+            return _migrate(argv, skip_if_migrated, fingerprint_file)
+    return _migrate(argv, skip_if_migrated, fingerprint_file)
+
+
+def _migrate(argv: t.Iterable[str], skip_if_migrated: bool, fingerprint_file: t.Optional[str]) -> bool:
     wf('Applying migrations... ', False)
+    fingerprint_file = fingerprint_file or os.environ.get('MIGRATE_FINGERPRINT_FILE')
+    if skip_if_migrated and not argv and is_migrated(fingerprint_file=fingerprint_file):
+        wf('[SKIP: no unapplied migrations]\n')
+        return True
+
     execute_from_command_line(['./manage.py', 'migrate'] + list(argv))
+    if fingerprint_file and not argv:
+        _write_fingerprint(fingerprint_file, _migrated_state_fingerprint('default'))
     wf('[+]\n')
     return True
 
 
 @run_env_once
+@profiled('db.modeltranslation_sync_translation_fields')
 def modeltranslation_sync_translation_fields() -> bool:
     """
     Runs ``modeltranslation``'s ``sync_translation_fields`` manage.py command:
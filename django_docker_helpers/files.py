@@ -1,17 +1,149 @@
+import hashlib
+import json
+import os
+import shutil
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+
+from django_docker_helpers.profiling import profiled
 from django_docker_helpers.utils import run_env_once, wf
 
+STATIC_MANIFEST_NAME = '.collectstatic-manifest.json'
+
 
 @run_env_once
-def collect_static() -> bool:
+@profiled('files.collect_static')
+def collect_static(incremental: bool = False, max_workers: t.Optional[int] = None) -> bool:
     """
     Runs Django ``collectstatic`` command in silent mode.
 
+    With ``incremental`` set static files are synced with
+    :func:`~django_docker_helpers.files.collect_static_incremental` instead of clearing ``STATIC_ROOT``
+    and copying everything again. It's done for a local ``FileSystemStorage`` only: remote storages
+    and storages that post-process files (like ``ManifestStaticFilesStorage``) always use the command.
+
+    :param incremental: copy only changed files and delete removed ones
+    :param max_workers: a number of threads hashing and copying files in the incremental mode
     :return: always ``True``
     """
     from django.core.management import execute_from_command_line
-    # from django.conf import settings
-    # if not os.listdir(settings.STATIC_ROOT):
+
     wf('Collecting static files... ', False)
+    if incremental and _local_static_root():
+        stats = collect_static_incremental(max_workers=max_workers)
+        wf('[+] {copied} copied, {unchanged} unchanged, {deleted} deleted\n'.format(**stats))
+        return True
+
     execute_from_command_line(['./manage.py', 'collectstatic', '-c', '--noinput', '-v0'])
     wf('[+]\n')
     return True
+
+
+def _local_static_root() -> t.Optional[str]:
+    """
+    :return: a directory ``STATICFILES_STORAGE`` writes to if it's a plain local ``FileSystemStorage``
+     (no post-processing), ``None`` otherwise
+    """
+    from django.contrib.staticfiles.storage import staticfiles_storage
+    from django.core.files.storage import FileSystemStorage
+
+    if not isinstance(staticfiles_storage, FileSystemStorage) or hasattr(staticfiles_storage, 'post_process'):
+        return None
+    return staticfiles_storage.location or None
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as fp:
+        for chunk in iter(lambda: fp.read(64 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _find_static_files() -> t.Dict[str, str]:
+    """
+    :return: ``prefixed path -> source file path`` of all static files, the first finder wins like in ``collectstatic``
+    """
+    from django.contrib.staticfiles.finders import get_finders
+
+    ignore_patterns = ['CVS', '.*', '*~']
+    found = {}
+    for finder in get_finders():
+        for path, storage in finder.list(ignore_patterns):
+            prefixed_path = os.path.join(storage.prefix, path) if getattr(storage, 'prefix', None) else path
+            found.setdefault(prefixed_path, storage.path(path))
+    return found
+
+
+def collect_static_incremental(static_root: t.Optional[str] = None,
+                               max_workers: t.Optional[int] = None) -> t.Dict[str, int]:
+    """
+    Syncs static files found by ``STATICFILES_FINDERS`` into ``static_root``, keeping a manifest
+    (``.collectstatic-manifest.json``) of their content hashes, sizes and modification times:
+
+    * a source with the same size and mtime as recorded is not read at all;
+    * a changed one is hashed, and copied only if its content differs or the target is missing;
+    * files that disappeared from sources are deleted from ``static_root``, other files are left untouched.
+
+    Hashing and copying run in a thread pool.
+
+    :param static_root: a target directory, default is the location of ``STATICFILES_STORAGE``
+    :param max_workers: a number of threads
+    :return: a dict with ``copied``, ``unchanged`` and ``deleted`` counters
+
+    :raises ValueError: if ``static_root`` is not specified and ``STATICFILES_STORAGE`` is not a local
+     ``FileSystemStorage``
+    """
+    static_root = static_root or _local_static_root()
+    if not static_root:
+        raise ValueError('Static files storage is not a local FileSystemStorage, use `collectstatic`')
+    manifest_path = os.path.join(static_root, STATIC_MANIFEST_NAME)
+    try:
+        with open(manifest_path) as fp:
+            manifest = json.load(fp)
+    except (OSError, ValueError):
+        manifest = {}
+
+    found = _find_static_files()
+
+    def _sync(item: t.Tuple[str, str]) -> t.Tuple[str, t.Dict[str, t.Any], bool]:
+        prefixed_path, source = item
+        stat = os.stat(source)
+        target = os.path.join(static_root, prefixed_path)
+        recorded = manifest.get(prefixed_path)
+
+        if recorded and recorded['size'] == stat.st_size and recorded['mtime'] == stat.st_mtime_ns \
+                and os.path.exists(target):
+            return prefixed_path, recorded, False
+
+        digest = _file_digest(source)
+        entry = {'hash': digest, 'size': stat.st_size, 'mtime': stat.st_mtime_ns}
+        if recorded and recorded['hash'] == digest and os.path.exists(target):
+            return prefixed_path, entry, False
+
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copy2(source, target)
+        return prefixed_path, entry, True
+
+    os.makedirs(static_root, exist_ok=True)
+    new_manifest = {}
+    copied = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for prefixed_path, entry, was_copied in executor.map(_sync, found.items()):
+            new_manifest[prefixed_path] = entry
+            copied += was_copied
+
+    deleted = 0
+    for prefixed_path in manifest.keys() - new_manifest.keys():
+        try:
+            os.unlink(os.path.join(static_root, prefixed_path))
+            deleted += 1
+        except FileNotFoundError:
+            pass
+
+    tmp_path = '{0}.{1}.tmp'.format(manifest_path, os.getpid())
+    with open(tmp_path, 'w') as fp:
+        json.dump(new_manifest, fp, separators=(',', ':'))
+    os.replace(tmp_path, manifest_path)
+
+    return {'copied': copied, 'unchanged': len(new_manifest) - copied, 'deleted': deleted}
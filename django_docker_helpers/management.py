@@ -1,14 +1,66 @@
+import gc
+import logging
+import typing as t
+
 from django.core.handlers.wsgi import WSGIHandler
-from django.core.management import execute_from_command_line
 
+from django_docker_helpers.profiling import profiled
 from django_docker_helpers.utils import dot_path, run_env_once, wf
 
+if t.TYPE_CHECKING:  # pragma: no cover
+    from django_docker_helpers.config import ConfigLoader
+
+
+def _creates_with_manager(user_model) -> bool:
+    """
+    :return: ``True`` if users can't be created with bulk queries: the model has no ``is_staff`` or
+     ``is_superuser`` field, or saving it does more than ``bulk_create`` / ``bulk_update`` would do
+     (a custom ``save()`` or ``create_superuser()``, save signal receivers)
+    """
+    from django.contrib.auth.base_user import AbstractBaseUser
+    from django.contrib.auth.models import UserManager
+    from django.db.models.signals import post_save, pre_save
+
+    field_names = {field.name for field in user_model._meta.get_fields()}
+    create_superuser = getattr(type(user_model._default_manager), 'create_superuser', None)
+    return (
+        not {'is_staff', 'is_superuser'} <= field_names or
+        user_model.save is not AbstractBaseUser.save or
+        create_superuser is not UserManager.create_superuser or
+        pre_save.has_listeners(user_model) or
+        post_save.has_listeners(user_model)
+    )
+
+
+def _bulk_create_users(manager, users: list):
+    """
+    Inserts ``users`` skipping ones created concurrently (e.g. by another replica starting at the same time).
+    """
+    import django
+    from django.db import IntegrityError, transaction
+
+    if django.VERSION >= (2, 2):
+        manager.bulk_create(users, ignore_conflicts=True)
+        return
+
+    try:
+        with transaction.atomic(using=manager.db):
+            manager.bulk_create(users)
+    except IntegrityError:
+        for user in users:
+            try:
+                with transaction.atomic(using=manager.db):
+                    user.save(force_insert=True, using=manager.db)
+            except IntegrityError:
+                pass
+
 
 @run_env_once
+@profiled('management.create_admin')
 def create_admin(user_config_path: str = 'CONFIG.superuser') -> bool:
     """
-    Creates a superuser from a specified dict/object bundle located at ``user_config_path``.
-    Skips if the specified object contains no email or no username.
+    Creates superusers from a specified dict/object bundle (or a list of bundles) located at ``user_config_path``.
+    Skips bundles containing no email or no username.
     If a user with the specified username already exists and has no usable password it updates user's password with
     a specified one.
 
@@ -28,60 +80,174 @@ def create_admin(user_config_path: str = 'CONFIG.superuser') -> bool:
 
     To access the ``'user'`` bundle you have to specify: ``local_config.my_var.user``.
 
+    Existing users are fetched with a single query (``get_user_model()`` is respected), missing ones are created
+    with ``bulk_create`` and passwords are updated with ``bulk_update``, so when all users exist and have passwords
+    nothing else is done (passwords are hashed only for users that need them).
+
+    Bulk queries skip ``save()`` and save signals, so if the user model defines its own ``save()``, its manager
+    defines its own ``create_superuser()``, there are ``pre_save`` / ``post_save`` receivers for it or it has
+    no ``is_staff`` / ``is_superuser`` fields, users are created with the manager's ``create_superuser()``
+    and updated with ``save()`` one by one instead.
+
+    Users created concurrently (e.g. by another replica starting at the same time) are skipped.
+
     :param user_config_path: dot-separated path to object or dict, default is ``'CONFIG.superuser'``
-    :return: ``True`` if user has been created, ``False`` otherwise
+    :return: ``True`` if users have been created or already exist, ``False`` otherwise
     """
     from django.conf import settings
     wf('Creating superuser... ', False)
-    username, email, password = [
-        dot_path(settings, '{0}.{1}'.format(user_config_path, 'username')),
-        dot_path(settings, '{0}.{1}'.format(user_config_path, 'email')),
-        dot_path(settings, '{0}.{1}'.format(user_config_path, 'password')),
-    ]
-    if not all([username, email]):
+
+    bundles = dot_path(settings, user_config_path)
+    if isinstance(bundles, (list, tuple)):
+        bundles = ['{0}.{1}'.format(user_config_path, idx) for idx in range(len(bundles))]
+    else:
+        bundles = [user_config_path]
+
+    users = {}
+    for bundle_path in bundles:
+        username, email, password = [
+            dot_path(settings, '{0}.{1}'.format(bundle_path, 'username')),
+            dot_path(settings, '{0}.{1}'.format(bundle_path, 'email')),
+            dot_path(settings, '{0}.{1}'.format(bundle_path, 'password')),
+        ]
+        if all([username, email]):
+            users[username] = (email, password)
+
+    if not users:
         wf('[SKIP: username and email should not be empty]\n')
         return False
 
-    from django.db import IntegrityError
-    try:
-        execute_from_command_line([
-            './manage.py', 'createsuperuser',
-            '--username', username,
-            '--email', email,
-            '--noinput'
-        ])
-    except IntegrityError:
-        pass
+    from django.contrib.auth import get_user_model
+    user_model = get_user_model()
+    username_field = user_model.USERNAME_FIELD
 
-    if password:
-        # after `execute_from_command_line` models are loaded
-        from django.contrib.auth.models import User
-        user = User.objects.get(username=username)
+    existing = {
+        getattr(user, username_field): user
+        for user in user_model._default_manager.filter(**{'{0}__in'.format(username_field): list(users)})
+    }
 
-        # do not change password if it was set before
-        if not user.has_usable_password():
+    created = []
+    updated = []
+    for username, (email, password) in users.items():
+        user = existing.get(username)
+        if user is None:
+            created.append((username, email, password))
+        elif password and not user.has_usable_password():
+            # do not change password if it was set before
             user.set_password(password)
-            user.save()
+            updated.append(user)
+
+    from django.db import IntegrityError, transaction
+
+    manager = user_model._default_manager
+    if _creates_with_manager(user_model):
+        for username, email, password in created:
+            try:
+                with transaction.atomic(using=manager.db):
+                    manager.create_superuser(**{
+                        username_field: username,
+                        user_model.get_email_field_name(): email,
+                        'password': password or None,
+                    })
+            except IntegrityError:
+                # created by another replica
+                pass
+        for user in updated:
+            user.save(update_fields=['password'])
     else:
-        wf('[SKIP update password: password is empty]\n')
+        new_users = []
+        for username, email, password in created:
+            user = user_model(**{
+                username_field: username,
+                user_model.get_email_field_name(): email,
+                'is_staff': True,
+                'is_superuser': True,
+            })
+            if password:
+                user.set_password(password)
+            else:
+                user.set_unusable_password()
+            new_users.append(user)
+        if new_users:
+            _bulk_create_users(manager, new_users)
+        if updated and hasattr(manager, 'bulk_update'):
+            manager.bulk_update(updated, ['password'])
+        else:
+            # ``bulk_update`` appeared in Django 2.2
+            for user in updated:
+                user.save(update_fields=['password'])
 
-    wf('[+]\n')
+    wf('[+] {0} created, {1} password(s) updated, {2} unchanged\n'.format(
+        len(created), len(updated), len(users) - len(created) - len(updated)
+    ))
     return True
 
 
-def run_gunicorn(application: WSGIHandler, gunicorn_module_name: str = 'gunicorn_prod'):
+@profiled('management.prepare_for_fork')
+def prepare_for_fork(*loaders: 'ConfigLoader', warm_up_timeout: t.Optional[float] = None) -> int:
+    """
+    Makes the current process copy-on-write friendly right before a pre-fork server forks workers:
+    warms ``loaders`` up and builds their key indexes (if ``use_key_index`` is set), resolves Django settings,
+    drops raw config buffers (see :meth:`~django_docker_helpers.config.ConfigLoader.release_buffers`),
+    collects garbage and moves all surviving objects into the permanent generation with ``gc.freeze()``
+    (Python 3.7+).
+
+    Without it the cyclic GC of every worker writes to headers of all inherited objects (config trees,
+    parsed YAML, settings, imported modules) and the pages they live on become private copies.
+
+    It's called by :func:`~django_docker_helpers.management.run_gunicorn`. uWSGI loads the application
+    in the master process (unless ``lazy-apps`` is set), so call it at the end of your ``wsgi.py``:
+    ::
+
+        application = get_wsgi_application()
+        prepare_for_fork(configure)
+
+    :param loaders: config loaders used by the project
+    :param warm_up_timeout: see :meth:`~django_docker_helpers.config.ConfigLoader.warm_up`
+    :return: a number of frozen objects, ``0`` if ``gc.freeze`` is not available
+    """
+    for loader in loaders:
+        loader.warm_up(timeout=warm_up_timeout)
+        if loader.use_key_index:
+            loader.build_key_index()
+        loader.release_buffers()
+
+    from django.conf import settings
+    from django.core.exceptions import ImproperlyConfigured
+    try:
+        settings.INSTALLED_APPS
+    except ImproperlyConfigured:
+        pass
+
+    gc.collect()
+    if not hasattr(gc, 'freeze'):
+        return 0
+
+    gc.freeze()
+    return gc.get_freeze_count()
+
+
+def run_gunicorn(application: WSGIHandler,
+                 gunicorn_module_name: str = 'gunicorn_prod',
+                 configure: t.Optional['ConfigLoader'] = None,
+                 freeze: bool = False,
+                 config: t.Optional[t.Dict[str, t.Any]] = None):
     """
     Runs gunicorn with a specified config.
 
     :param application: Django uwsgi application
     :param gunicorn_module_name: gunicorn settings module name
+    :param configure: a config loader to prepare for forking workers
+    :param freeze: call :func:`~django_docker_helpers.management.prepare_for_fork` before gunicorn forks workers,
+     its errors are logged and don't prevent gunicorn from starting
+    :param config: gunicorn settings, ``gunicorn_module_name`` is not used if specified
     :return: ``Application().run()``
     """
     from gunicorn.app.base import Application
 
     class DjangoApplication(Application):
         def init(self, parser, opts, args):
-            cfg = self.get_config_from_module_name(gunicorn_module_name)
+            cfg = config if config is not None else self.get_config_from_module_name(gunicorn_module_name)
             clean_cfg = {}
             for k, v in cfg.items():
                 # Ignore unknown names
@@ -93,4 +259,10 @@ def run_gunicorn(application: WSGIHandler, gunicorn_module_name: str = 'gunicorn
         def load(self) -> WSGIHandler:
             return application
 
+    if freeze:
+        try:
+            prepare_for_fork(*([configure] if configure is not None else []))
+        except Exception as e:
+            logging.getLogger(__name__).error('Cannot prepare for forking workers: {0}'.format(e))
+
     return DjangoApplication().run()
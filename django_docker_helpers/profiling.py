@@ -0,0 +1,261 @@
+import json
+import os
+import threading
+import time
+import typing as t
+from contextlib import contextmanager
+from functools import wraps
+
+from django_docker_helpers.utils import wf
+
+#: a report format version, bump it on incompatible changes of :meth:`Profiler.report`
+REPORT_VERSION = 1
+
+_profiler = None  # type: t.Optional[Profiler]
+
+
+class PhaseStats:
+    """
+    Accumulated timings of a phase, a phase entered many times (e.g. a parser lookup) is aggregated.
+
+    :ivar calls: a number of times the phase ran
+    :ivar errors: a number of runs that raised
+    :ivar wall: a total wall time in seconds
+    :ivar cpu: a total CPU time in seconds of threads the phase ran in
+    :ivar started_at: seconds since the profiling began till the first run
+    :ivar finished_at: seconds since the profiling began till the end of the last run
+    """
+    __slots__ = ('name', 'calls', 'errors', 'wall', 'cpu', 'started_at', 'finished_at')
+
+    def __init__(self, name: str, started_at: float):
+        self.name = name
+        self.calls = 0
+        self.errors = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.started_at = started_at
+        self.finished_at = started_at
+
+    def __repr__(self):
+        return '<PhaseStats {0} calls={1} wall={2:.3f}s cpu={3:.3f}s>'.format(
+            self.name, self.calls, self.wall, self.cpu
+        )
+
+    def as_dict(self) -> t.Dict[str, t.Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class Profiler:
+    """
+    Records wall and CPU time of named phases. Phases may run in different threads and nest
+    (a nested phase's time is included into its parent's one).
+    CPU time is measured with ``time.thread_time()``, i.e. time spent by the thread running the phase.
+    """
+    def __init__(self):
+        self.phases = {}  # type: t.Dict[str, PhaseStats]
+        self.lock = threading.Lock()
+        self.started_at = time.monotonic()
+        self.started_at_unix = time.time()
+        self.cpu_started_at = time.process_time()
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Measures the wrapped block as a run of ``name``.
+
+        :param name: a phase name, dot-separated by convention (``db.migrate``, ``config.get.YamlParser``)
+        """
+        started_at, cpu_started_at = time.monotonic(), time.thread_time()
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self.add(name, started_at, time.monotonic(), time.thread_time() - cpu_started_at, failed)
+
+    def add(self, name: str, started_at: float, finished_at: float, cpu: float, failed: bool = False):
+        """
+        Records a phase run.
+
+        :param name: a phase name
+        :param started_at: ``time.monotonic()`` when the run started
+        :param finished_at: ``time.monotonic()`` when the run finished
+        :param cpu: CPU seconds spent
+        :param failed: the run raised
+        """
+        with self.lock:
+            stats = self.phases.get(name)
+            if stats is None:
+                stats = self.phases[name] = PhaseStats(name, started_at - self.started_at)
+            stats.calls += 1
+            stats.errors += failed
+            stats.wall += finished_at - started_at
+            stats.cpu += cpu
+            stats.finished_at = max(stats.finished_at, finished_at - self.started_at)
+
+    def report(self) -> t.Dict[str, t.Any]:
+        """
+        :return: a JSON-serializable report: totals, environment and phases ordered by their start
+        """
+        from django_docker_helpers import __version__
+
+        with self.lock:
+            phases = sorted(self.phases.values(), key=lambda stats: stats.started_at)
+            return {
+                'version': REPORT_VERSION,
+                'package_version': __version__,
+                'pid': os.getpid(),
+                'started_at': self.started_at_unix,
+                'elapsed': time.monotonic() - self.started_at,
+                'cpu': time.process_time() - self.cpu_started_at,
+                'phases': [stats.as_dict() for stats in phases],
+            }
+
+    @staticmethod
+    def format_report(report: t.Dict[str, t.Any]) -> str:
+        """
+        :param report: a :meth:`report` result
+        :return: a human-readable table
+        """
+        phases = report['phases']
+        width = max([len(stats['name']) for stats in phases] + [len('Phase')])
+        row = '{0:<{width}}  {1:>6}  {2:>9}  {3:>9}  {4:>9}  {5:>9}  {6}\n'
+        lines = [
+            'Startup profile: {0:.3f}s wall, {1:.3f}s CPU\n'.format(report['elapsed'], report['cpu']),
+            row.format('Phase', 'Calls', 'Wall, s', 'CPU, s', 'Start, s', 'End, s', '', width=width),
+        ]
+        for stats in phases:
+            lines.append(row.format(
+                stats['name'], stats['calls'],
+                '{0:.3f}'.format(stats['wall']), '{0:.3f}'.format(stats['cpu']),
+                '{0:.3f}'.format(stats['started_at']), '{0:.3f}'.format(stats['finished_at']),
+                '[-] {0} failed'.format(stats['errors']) if stats['errors'] else '',
+                width=width,
+            ).rstrip() + '\n')
+        return ''.join(lines)
+
+    def write_report(self, path: str) -> t.Dict[str, t.Any]:
+        """
+        Writes :meth:`report` as JSON, the file is replaced atomically.
+
+        :param path: a file path
+        :return: the report
+        """
+        report = self.report()
+        tmp_path = '{0}.{1}.tmp'.format(path, os.getpid())
+        with open(tmp_path, 'w') as fp:
+            json.dump(report, fp, indent=2)
+        os.replace(tmp_path, path)
+        return report
+
+
+class _NoopPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NOOP_PHASE = _NoopPhase()
+
+
+def active_profiler() -> t.Optional[Profiler]:
+    """
+    :return: a profiler started with :func:`start_profiling` or ``None``
+    """
+    return _profiler
+
+
+def phase(name: str, *format_args):
+    """
+    Measures the wrapped block with the active profiler, does nothing if profiling is not started.
+    ::
+
+        with phase('config.get.{0}', parser.__class__.__name__):
+            ...
+
+    :param name: a phase name
+    :param format_args: ``name.format()`` arguments, it's formatted only if profiling is started
+    :return: a context manager
+    """
+    profiler = _profiler
+    if profiler is None:
+        return _NOOP_PHASE
+    return profiler.phase(name.format(*format_args) if format_args else name)
+
+
+def profiled(name: str) -> t.Callable:
+    """
+    A decorator measuring every call of a function as a ``name`` phase if profiling is started.
+
+    :param name: a phase name
+    :return: a decorator
+    """
+    def decorator(f: t.Callable) -> t.Callable:
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            with phase(name):
+                return f(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def start_profiling() -> Profiler:
+    """
+    Starts recording phases of the instrumented helpers (readiness checks, migrations, ``collectstatic``,
+    superuser creation, ``ConfigLoader`` warm-up and lookups per parser). A running profiler is kept.
+
+    :return: the active profiler
+    """
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler()
+    return _profiler
+
+
+def stop_profiling(report_path: t.Optional[str] = None, print_table: bool = True) -> t.Optional[t.Dict[str, t.Any]]:
+    """
+    Stops profiling, writes the JSON report and prints a table with :func:`~django_docker_helpers.utils.wf`.
+
+    :param report_path: a JSON report path, default is the ``STARTUP_PROFILE_FILE`` env variable,
+     nothing is written if neither is set
+    :param print_table: print a human-readable table
+    :return: the report or ``None`` if profiling was not started
+    """
+    global _profiler
+    profiler, _profiler = _profiler, None
+    if profiler is None:
+        return None
+
+    report_path = report_path or os.environ.get('STARTUP_PROFILE_FILE')
+    report = profiler.write_report(report_path) if report_path else profiler.report()
+    if print_table:
+        wf(Profiler.format_report(report))
+    return report
+
+
+@contextmanager
+def profile_startup(report_path: t.Optional[str] = None, print_table: bool = True):
+    """
+    Profiles the wrapped block, see :func:`start_profiling` and :func:`stop_profiling`.
+    ::
+
+        with profile_startup('/tmp/startup-profile.json'):
+            configure = ConfigLoader.from_env()
+            default_startup().run(exit_on_failure=True)
+
+    :param report_path: a JSON report path, default is the ``STARTUP_PROFILE_FILE`` env variable
+    :param print_table: print a human-readable table
+    :return: the active profiler
+    """
+    profiler = start_profiling()
+    try:
+        with profiler.phase('total'):
+            yield profiler
+    finally:
+        stop_profiling(report_path, print_table=print_table)
@@ -0,0 +1,99 @@
+import random
+import time
+import typing as t
+
+
+class RetrySchedule:
+    """
+    Spaces out retries of a readiness check: a short fast-poll phase (a service that becomes ready
+    a moment after the first failure costs ~``fast_interval``), then exponential backoff with full jitter
+    capped by ``max_delay`` (so a fleet of restarted containers doesn't retry in lockstep),
+    bounded by a global ``deadline`` and / or ``max_attempts``.
+
+    Iterating yields attempt numbers starting with ``1`` and sleeps before every attempt but the first.
+    The iteration stops when the next attempt would start after the deadline or ``max_attempts`` are made.
+
+    Example:
+    ::
+
+        for attempt in RetrySchedule(deadline=30):
+            try:
+                connection.ensure_connection()
+                break
+            except OperationalError:
+                pass
+        else:
+            raise TimeoutError('Database is not ready')
+    """
+    def __init__(self,
+                 deadline: t.Optional[float] = None,
+                 max_attempts: t.Optional[int] = None,
+                 fast_attempts: int = 3,
+                 fast_interval: float = 0.1,
+                 base_delay: float = 0.25,
+                 max_delay: float = 5,
+                 multiplier: float = 2,
+                 rng: t.Optional[random.Random] = None):
+        """
+        :param deadline: seconds from the first attempt after which no attempts are started, ``None`` is no deadline
+        :param max_attempts: a max number of attempts, ``None`` means unlimited
+        :param fast_attempts: a number of retries made every ``fast_interval`` before backing off
+        :param fast_interval: a delay in seconds between fast-poll retries (jittered between its half and full value)
+        :param base_delay: the first backoff delay cap in seconds
+        :param max_delay: max backoff delay in seconds
+        :param multiplier: backoff growth factor
+        :param rng: a random generator to draw jitter from
+        """
+        self.deadline = deadline
+        self.max_attempts = max_attempts
+        self.fast_attempts = fast_attempts
+        self.fast_interval = fast_interval
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.rng = rng or random.Random()
+
+        self.attempts = 0
+        self.started_at = None  # type: t.Optional[float]
+
+    def delay(self, retry: int) -> float:
+        """
+        :param retry: a retry number starting with ``1``
+        :return: a delay in seconds before the ``retry``
+        """
+        if retry <= self.fast_attempts:
+            return self.rng.uniform(self.fast_interval / 2, self.fast_interval)
+
+        exponent = retry - self.fast_attempts - 1
+        cap = min(self.max_delay, self.base_delay * self.multiplier ** exponent)
+        return self.rng.uniform(0, cap)
+
+    @property
+    def elapsed(self) -> float:
+        return 0.0 if self.started_at is None else time.monotonic() - self.started_at
+
+    @property
+    def remaining(self) -> t.Optional[float]:
+        """
+        Seconds left till the deadline, ``None`` if there's no deadline.
+        """
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - self.elapsed)
+
+    def __iter__(self) -> t.Generator[int, None, None]:
+        self.started_at = time.monotonic()
+        self.attempts = 0
+
+        while self.max_attempts is None or self.attempts < self.max_attempts:
+            if self.attempts:
+                pause = self.delay(self.attempts)
+                remaining = self.remaining
+                if remaining is not None:
+                    if remaining <= 0:
+                        return
+                    pause = min(pause, remaining)
+                time.sleep(pause)
+
+            self.attempts += 1
+            yield self.attempts
@@ -0,0 +1,342 @@
+import sys
+import threading
+import time
+import typing as t
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from io import StringIO
+
+from django_docker_helpers.utils import wf
+
+
+class Task:
+    """
+    A startup step of :class:`~django_docker_helpers.startup.Startup`: ``func(*args, **kwargs)``
+    that runs after all ``depends_on`` tasks succeed.
+    """
+    def __init__(self,
+                 name: str,
+                 func: t.Callable,
+                 args: t.Iterable = (),
+                 kwargs: t.Optional[dict] = None,
+                 depends_on: t.Iterable[str] = ()):
+        self.name = name
+        self.func = func
+        self.args = tuple(args)
+        self.kwargs = kwargs or {}
+        self.depends_on = tuple(depends_on)
+
+    def __repr__(self):
+        return '<Task {0} depends_on={1}>'.format(self.name, list(self.depends_on))
+
+    def __call__(self):
+        try:
+            return self.func(*self.args, **self.kwargs)
+        finally:
+            # every task runs in a pool thread: don't leave its connections open
+            from django.db import connections
+            connections.close_all()
+
+
+class _CapturedStream:
+    """
+    A ``sys.stdout`` / ``sys.stderr`` replacement: writes of threads that called :meth:`capture` are collected
+    into per-thread buffers, other threads write to the wrapped stream.
+    """
+    def __init__(self, stream: t.TextIO):
+        self.stream = stream
+        self._local = threading.local()
+
+    def __getattr__(self, name: str):
+        return getattr(self.stream, name)
+
+    def capture(self):
+        self._local.buffer = StringIO()
+
+    def release(self) -> str:
+        buffer, self._local.buffer = self._local.buffer, None
+        return buffer.getvalue()
+
+    def write(self, s: str) -> int:
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None:
+            return self.stream.write(s)
+        return buffer.write(s)
+
+    def writelines(self, lines: t.Iterable[str]):
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        if getattr(self._local, 'buffer', None) is None:
+            self.stream.flush()
+
+
+class TaskResult:
+    """
+    :ivar started_at: seconds since the startup began, ``None`` if the task was skipped
+    :ivar finished_at: seconds since the startup began, ``None`` if the task was skipped
+    :ivar error: an exception the task raised (``SystemExit`` included)
+    :ivar skipped: ``True`` if a dependency failed and the task didn't run
+    :ivar stdout: the task output if it was captured
+    :ivar stderr: the task error output if it was captured
+    """
+    def __init__(self,
+                 task: Task,
+                 started_at: t.Optional[float] = None,
+                 finished_at: t.Optional[float] = None,
+                 result: t.Any = None,
+                 error: t.Optional[BaseException] = None,
+                 skipped: bool = False,
+                 stdout: str = '',
+                 stderr: str = ''):
+        self.task = task
+        self.started_at = started_at
+        self.finished_at = finished_at
+        self.result = result
+        self.error = error
+        self.skipped = skipped
+        self.stdout = stdout
+        self.stderr = stderr
+
+    @property
+    def name(self) -> str:
+        return self.task.name
+
+    @property
+    def ok(self) -> bool:
+        return not self.skipped and self.error is None
+
+    @property
+    def elapsed(self) -> float:
+        if self.skipped:
+            return 0.0
+        return self.finished_at - self.started_at
+
+    def __repr__(self):
+        return '<TaskResult {0} ok={1} elapsed={2:.2f}s>'.format(self.name, self.ok, self.elapsed)
+
+
+class StartupReport(OrderedDict):
+    """
+    ``task name -> TaskResult`` in the order tasks were added. It's truthy if all tasks succeeded.
+    """
+    def __init__(self, *args, elapsed: float = 0.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.elapsed = elapsed
+
+    def __bool__(self):
+        return all(result.ok for result in self.values())
+
+    @property
+    def critical_path(self) -> t.List[TaskResult]:
+        """
+        The chain of dependencies that finished last: shortening anything else doesn't speed the startup up.
+        """
+        finished = [result for result in self.values() if not result.skipped]
+        if not finished:
+            return []
+
+        path = [max(finished, key=lambda result: result.finished_at)]
+        while True:
+            deps = [self[name] for name in path[-1].task.depends_on if not self[name].skipped]
+            if not deps:
+                break
+            path.append(max(deps, key=lambda result: result.finished_at))
+        return path[::-1]
+
+    def summary(self) -> str:
+        lines = ['Startup finished in {0:.2f}s'.format(self.elapsed)]
+        width = max([len(name) for name in self] or [0])
+        for name, result in self.items():
+            if result.skipped:
+                lines.append('  {0:<{1}}  [SKIP: a dependency failed]'.format(name, width))
+                continue
+            lines.append('  {0:<{1}}  {2:7.2f}s .. {3:7.2f}s  {4}'.format(
+                name, width, result.started_at, result.finished_at,
+                '[+]' if result.ok else '[-] {0!r}'.format(result.error)
+            ))
+        lines.append('Critical path: {0}'.format(' -> '.join(
+            '{0} ({1:.2f}s)'.format(result.name, result.elapsed) for result in self.critical_path
+        )))
+        return '\n'.join(lines) + '\n'
+
+
+class Startup:
+    """
+    Runs container entry point helpers as a dependency graph: a task starts as soon as all its
+    dependencies succeed, independent tasks run in parallel threads (e.g. ``collectstatic``
+    doesn't wait for the database). Dependents of a failed task are skipped.
+
+    Example:
+    ::
+
+        startup = Startup()
+        startup.add('databases', ensure_databases_alive, 100)
+        startup.add('caches', ensure_caches_alive, 100)
+        startup.add('collectstatic', collect_static)
+        startup.add('migrate', migrate, depends_on=['databases'])
+        startup.add('create_admin', create_admin, 'SUPERUSER', depends_on=['migrate'])
+        startup.run(exit_on_failure=True)
+
+    See :func:`~django_docker_helpers.startup.default_startup` for the usual graph.
+    """
+    def __init__(self):
+        self.tasks = OrderedDict()  # type: t.Dict[str, Task]
+
+    def add(self, name: str, func: t.Callable, *args, depends_on: t.Iterable[str] = (), **kwargs) -> Task:
+        """
+        Declares a task.
+
+        :param name: a unique task name
+        :param func: a callable
+        :param args: ``func`` positional arguments
+        :param depends_on: names of tasks that have to succeed first
+        :param kwargs: ``func`` keyword arguments
+        :return: the task
+
+        :raises ValueError: if a task with the same name exists
+        """
+        if name in self.tasks:
+            raise ValueError('Task `{0}` is already declared'.format(name))
+        task = Task(name, func, args=args, kwargs=kwargs, depends_on=depends_on)
+        self.tasks[name] = task
+        return task
+
+    def validate(self):
+        """
+        :raises ValueError: if a dependency is unknown or dependencies are circular
+        """
+        for task in self.tasks.values():
+            unknown = [name for name in task.depends_on if name not in self.tasks]
+            if unknown:
+                raise ValueError('Task `{0}` depends on unknown tasks: {1}'.format(task.name, ', '.join(unknown)))
+
+        resolved = set()
+        pending = list(self.tasks.values())
+        while pending:
+            ready = [task for task in pending if set(task.depends_on) <= resolved]
+            if not ready:
+                raise ValueError('Circular dependencies: {0}'.format(', '.join(task.name for task in pending)))
+            resolved.update(task.name for task in ready)
+            pending = [task for task in pending if task.name not in resolved]
+
+    def run(self,
+            max_workers: t.Optional[int] = None,
+            exit_on_failure: bool = False,
+            capture_output: bool = True) -> StartupReport:
+        """
+        Runs all tasks and writes a timing summary with the critical path.
+
+        :param max_workers: max tasks running at once, default is the number of tasks
+        :param exit_on_failure: ``exit(1)`` if any task failed
+        :param capture_output: collect ``sys.stdout`` / ``sys.stderr`` writes of every task and write them
+         at once when the task finishes, so the output of concurrent tasks doesn't interleave
+        :return: a :class:`StartupReport`
+        """
+        self.validate()
+
+        results = {}  # type: t.Dict[str, TaskResult]
+        pending = OrderedDict(self.tasks)
+        running = {}
+        started_at = time.monotonic()
+
+        stdout = stderr = None
+        if capture_output:
+            stdout, stderr = _CapturedStream(sys.stdout), _CapturedStream(sys.stderr)
+
+        def _run(task: Task) -> TaskResult:
+            if capture_output:
+                stdout.capture()
+                stderr.capture()
+
+            task_started_at = time.monotonic() - started_at
+            try:
+                task_result = TaskResult(task, task_started_at, result=task())
+            except BaseException as e:
+                task_result = TaskResult(task, task_started_at, error=e)
+            task_result.finished_at = time.monotonic() - started_at
+
+            if capture_output:
+                task_result.stdout, task_result.stderr = stdout.release(), stderr.release()
+            return task_result
+
+        if capture_output:
+            sys.stdout, sys.stderr = stdout, stderr
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers or max(len(self.tasks), 1),
+                                    thread_name_prefix='startup') as executor:
+                while pending or running:
+                    changed = True
+                    while changed:
+                        changed = False
+                        for name, task in list(pending.items()):
+                            deps = [results.get(dep) for dep in task.depends_on]
+                            if any(dep is not None and not dep.ok for dep in deps):
+                                results[name] = TaskResult(task, skipped=True)
+                            elif all(dep is not None for dep in deps):
+                                running[executor.submit(_run, task)] = name
+                            else:
+                                continue
+                            del pending[name]
+                            changed = True
+
+                    if not running:
+                        break
+
+                    done, _not_done = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        result = future.result()
+                        results[running.pop(future)] = result
+                        for output, stream in ((result.stdout, sys.stdout), (result.stderr, sys.stderr)):
+                            if output:
+                                stream.write(output)
+                                stream.flush()
+                        if result.error is not None:
+                            wf('Task `{0}` failed: {1!r}\n'.format(result.name, result.error))
+        finally:
+            if capture_output:
+                sys.stdout, sys.stderr = stdout.stream, stderr.stream
+
+        report = StartupReport(((name, results[name]) for name in self.tasks), elapsed=time.monotonic() - started_at)
+        wf(report.summary())
+
+        if not report and exit_on_failure:
+            exit(1)
+        return report
+
+
+def default_startup(max_retries: t.Optional[int] = 100,
+                    timeout: t.Optional[float] = None,
+                    user_config_path: t.Optional[str] = 'CONFIG.superuser',
+                    static: bool = True) -> Startup:
+    """
+    Declares the usual container start: waits for databases and caches (concurrently), applies migrations,
+    syncs modeltranslation fields and creates a superuser, while ``collectstatic`` runs alongside.
+
+    :param max_retries: passed to :func:`~django_docker_helpers.db.ensure_databases_alive` and
+     :func:`~django_docker_helpers.db.ensure_caches_alive`
+    :param timeout: an overall readiness deadline in seconds
+    :param user_config_path: passed to :func:`~django_docker_helpers.management.create_admin`,
+     ``None`` skips the task
+    :param static: run :func:`~django_docker_helpers.files.collect_static`
+    :return: a :class:`Startup` to add project specific tasks to and run
+    """
+    from django_docker_helpers.db import (
+        ensure_caches_alive, ensure_databases_alive, migrate, modeltranslation_sync_translation_fields
+    )
+    from django_docker_helpers.files import collect_static
+    from django_docker_helpers.management import create_admin
+
+    startup = Startup()
+    # ``exit(1)`` only raises ``SystemExit`` in a task thread: the task fails and its dependents are skipped
+    readiness = dict(max_retries=max_retries, timeout=timeout, exit_on_failure=True)
+    startup.add('databases', ensure_databases_alive, **readiness)
+    startup.add('caches', ensure_caches_alive, **readiness)
+    startup.add('migrate', migrate, depends_on=['databases'])
+    startup.add('modeltranslation', modeltranslation_sync_translation_fields, depends_on=['migrate'])
+    if user_config_path:
+        startup.add('create_admin', create_admin, user_config_path, depends_on=['migrate'])
+    if static:
+        startup.add('collectstatic', collect_static)
+    return startup
@@ -6,16 +6,21 @@ import typing as t
 from decimal import Decimal
 from functools import wraps
 
-from docker_check import checker as docker_checker
-from dpath.util import get
-from yaml import SafeLoader
-from yaml import dump as dump_yaml
-from yaml import load as yaml_load
 
+# NOTE: ``docker_check``, ``dpath`` and ``yaml`` are imported on first use: this module is on the import path
+# of every ``manage.py`` invocation and every worker, and none of them are needed to just import it.
 
 # noinspection PyPep8Naming
-def default_yaml_object_deserialize(stream, Loader=SafeLoader):
-    return yaml_load(stream, Loader=Loader)
+def default_yaml_object_deserialize(stream, Loader=None):
+    from yaml import SafeLoader, load
+
+    return load(stream, Loader=Loader or SafeLoader)
+
+
+def default_yaml_object_serialize(data) -> str:
+    from yaml import dump
+
+    return dump(data)
 
 
 ENV_STR_BOOL_COERCE_MAP = {
@@ -156,6 +161,8 @@ def dotkey(obj: dict, path: str, default=None, separator='.'):
     :param default: default for KeyError
     :return: dict value or default value
     """
+    from dpath.util import get
+
     try:
         return get(obj, path, separator=separator)
     except KeyError:
@@ -183,6 +190,127 @@ def _materialize_dict(bundle: dict, separator: str = '.') -> t.Generator[t.Tuple
             yield '{0}{1}{2}'.format(path_prefix, separator, nested_path), nested_val
 
 
+def iter_path_items(obj: t.Union[dict, list, tuple],
+                    separator: str = '.',
+                    prefix: str = '') -> t.Generator[t.Tuple[str, t.Any], None, None]:
+    """
+    Yields ``(path, value)`` of every node in a nested ``obj``: dict keys and list indices, both sections
+    and leaves. Every yielded path is resolvable with :func:`~django_docker_helpers.utils.dotkey`.
+
+    :param obj: a dict (or list) to traverse
+    :param separator: build paths with a given separator
+    :param prefix: prepend all paths with ``prefix``
+    :return: a generator of tuples ``(path, value)``
+
+    Example:
+    >>> list(iter_path_items({'test': {'path': [1]}, 'key': 'val'}, '.'))
+    >>> [('test', {'path': [1]}), ('test.path', [1]), ('test.path.0', 1), ('key', 'val')]
+    """
+    if isinstance(obj, dict):
+        items = obj.items()
+    elif isinstance(obj, (list, tuple)):
+        items = enumerate(obj)
+    else:
+        return
+
+    for key, val in items:
+        path = '{0}{1}{2}'.format(prefix, separator, key) if prefix else str(key)
+        yield path, val
+        yield from iter_path_items(val, separator=separator, prefix=path)
+
+
+def iter_paths(obj: t.Union[dict, list, tuple],
+               separator: str = '.',
+               prefix: str = '') -> t.Generator[str, None, None]:
+    """
+    Yields paths of every node in a nested ``obj``, see :func:`~django_docker_helpers.utils.iter_path_items`.
+
+    Example:
+    >>> list(iter_paths({'test': {'path': [1]}, 'key': 'val'}, '.'))
+    >>> ['test', 'test.path', 'test.path.0', 'key']
+    """
+    for path, _val in iter_path_items(obj, separator=separator, prefix=prefix):
+        yield path
+
+
+_MISSING = object()
+
+
+def deep_merge(base: t.Any, override: t.Any, case_insensitive: bool = False) -> t.Any:
+    """
+    Recursively merges ``override`` into ``base`` without mutating any of them. Non-dict values
+    (including lists) of ``override`` replace ``base`` values.
+
+    The result shares structure with the inputs: sub-dicts that are not changed by the merge are reused
+    as is and if nothing is changed ``base`` itself is returned, so treat the result as read-only.
+
+    Example:
+    >>> base = {'db': {'host': 'localhost', 'port': 5432}, 'cache': {'ttl': 1}}
+    >>> merged = deep_merge(base, {'db': {'host': 'db'}})
+    >>> merged == {'db': {'host': 'db', 'port': 5432}, 'cache': {'ttl': 1}}
+    >>> merged['cache'] is base['cache']
+
+    :param base: a value with a lower precedence
+    :param override: a value with a higher precedence
+    :param case_insensitive: match ``override`` string keys with ``base`` keys ignoring case
+     (e.g. ``override`` is read from the environment), matched keys keep their ``base`` spelling
+    :return: a merged value
+    """
+    if not isinstance(base, dict) or not isinstance(override, dict):
+        return override
+    if not base:
+        return override
+    if not override:
+        return base
+
+    base_keys = None
+    if case_insensitive:
+        base_keys = {key.lower(): key for key in base if isinstance(key, str)}
+
+    merged = None
+    for key, val in override.items():
+        if base_keys is not None and isinstance(key, str):
+            key = base_keys.get(key.lower(), key)
+        base_val = base.get(key, _MISSING)
+        new_val = val if base_val is _MISSING else deep_merge(base_val, val, case_insensitive=case_insensitive)
+        if new_val is base_val:
+            continue
+        if merged is None:
+            merged = dict(base)
+        merged[key] = new_val
+
+    return base if merged is None else merged
+
+
+def unflatten_items(items: t.Iterable[t.Tuple[str, t.Any]], separator: str = '.') -> dict:
+    """
+    Builds a nested dict from ``(path, value)`` pairs, the opposite of
+    :func:`~django_docker_helpers.utils.iter_path_items`. Values of deeper paths are merged into values
+    of shallower ones with :func:`~django_docker_helpers.utils.deep_merge`.
+
+    Example:
+    >>> unflatten_items([('db.host', 'db'), ('db.port', '5432'), ('debug', 'true')])
+    >>> {'db': {'host': 'db', 'port': '5432'}, 'debug': 'true'}
+
+    :param items: an iterable of ``(path, value)`` tuples
+    :param separator: a path separator
+    :return: a nested dict
+    """
+    result = {}
+    owned = {id(result)}  # dicts created here, values' own dicts are never mutated
+    for path, value in sorted(items, key=lambda item: item[0].count(separator)):
+        *parents, leaf = path.split(separator)
+        node = result
+        for part in parents:
+            child = node.get(part)
+            if id(child) not in owned:
+                child = node[part] = dict(child) if isinstance(child, dict) else {}
+                owned.add(id(child))
+            node = child
+        node[leaf] = deep_merge(node[leaf], value) if leaf in node else value
+    return result
+
+
 def materialize_dict(bundle: dict, separator: str = '.') -> t.List[t.Tuple[str, t.Any]]:
     """
     Transforms a given ``bundle`` into a *sorted* list of tuples with materialized value paths and values:
@@ -229,7 +357,7 @@ def materialize_dict(bundle: dict, separator: str = '.') -> t.List[t.Tuple[str,
 def mp_serialize_dict(
         bundle: dict,
         separator: str = '.',
-        serialize: t.Optional[t.Callable] = dump_yaml,
+        serialize: t.Optional[t.Callable] = default_yaml_object_serialize,
         value_prefix: str = '::YAML::\n') -> t.List[t.Tuple[str, bytes]]:
     """
     Transforms a given ``bundle`` into a *sorted* list of tuples with materialized value paths and values:
@@ -303,7 +431,7 @@ def mp_serialize_dict(
 def wf(raw_str: str,
        flush: bool = True,
        prevent_completion_polluting: bool = True,
-       stream: t.TextIO = sys.stdout):
+       stream: t.Optional[t.TextIO] = None):
     """
     Writes a given ``raw_str`` into a ``stream``. Ignores output if ``prevent_completion_polluting`` is set and there's
     no extra ``sys.argv`` arguments present (a bash completion issue).
@@ -317,6 +445,8 @@ def wf(raw_str: str,
     if prevent_completion_polluting and len(sys.argv) <= 1:
         return
 
+    # resolved on every call to follow ``sys.stdout`` replacements, e.g. by ``Startup.run()``
+    stream = stream or sys.stdout
     stream.write(raw_str)
     flush and hasattr(stream, 'flush') and stream.flush()
 
@@ -433,6 +563,8 @@ def is_dockerized(flag_name: str = 'DOCKERIZED', strict: bool = False) -> bool:
     if flag is not None:
         return flag
 
+    from docker_check import checker as docker_checker
+
     if docker_checker.is_inside_container():
         return True
 
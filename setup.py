@@ -25,10 +25,10 @@ setup(
         'Operating System :: OS Independent',
         'Programming Language :: Python',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
         'License :: OSI Approved :: MIT License',
     ],
+    python_requires='>=3.7',
     install_requires=[
         'django',
         'docker-check',
@@ -36,5 +36,11 @@ setup(
         'gunicorn',
         'pyaml',
         'terminaltables',
-    ]
+    ],
+    extras_require={
+        'async': [
+            'aiohttp',
+            'redis>=5.0.1',
+        ],
+    }
 )
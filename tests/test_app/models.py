@@ -1,3 +1,4 @@
+from django.contrib.auth.base_user import AbstractBaseUser, BaseUserManager
 from django.db import models
 
 
@@ -7,3 +8,25 @@ class Author(models.Model):
 
     def __str__(self):
         return self.name
+
+
+class MemberManager(BaseUserManager):
+    def create_superuser(self, username, email, password=None):
+        user = self.model(username=username, email=self.normalize_email(email), is_admin=True)
+        user.set_password(password)
+        user.save(using=self._db)
+        return user
+
+
+class Member(AbstractBaseUser):
+    """
+    A custom user model without ``is_staff`` and ``is_superuser`` fields.
+    """
+    username = models.CharField(max_length=150, unique=True)
+    email = models.EmailField()
+    is_admin = models.BooleanField(default=False)
+
+    objects = MemberManager()
+
+    USERNAME_FIELD = 'username'
+    EMAIL_FIELD = 'email'
@@ -0,0 +1,229 @@
+# noinspection PyPackageRequirements
+import pytest
+
+import asyncio
+import base64
+
+from django_docker_helpers.config import exceptions
+from django_docker_helpers.config.async_loader import AsyncConfigLoader
+from django_docker_helpers.config.backends import *
+from django_docker_helpers.config.backends.async_mpt_consul_parser import AsyncConsulKVClient
+from django_docker_helpers.profiling import start_profiling, stop_profiling
+from django_docker_helpers.utils import mp_serialize_dict
+
+pytestmark = [pytest.mark.config_loader, pytest.mark.async_loader]
+
+SAMPLE = {
+    'project': {
+        'debug': True,
+        'mixed': ['ascii', 1, {'d': 1}],
+        'nested': {
+            'a': {
+                'b': 2
+            }
+        }
+    }
+}
+
+
+class FakeAsyncRedis:
+    """
+    A local stand-in for ``redis.asyncio.Redis``.
+    """
+    def __init__(self, data: dict):
+        self.data = data
+        self.calls = 0
+        self.closed = False
+
+    async def get(self, key: str):
+        self.calls += 1
+        await asyncio.sleep(0)
+        return self.data.get(key)
+
+    async def aclose(self):
+        self.closed = True
+
+
+class FakeAsyncConsul:
+    """
+    A local stand-in for :class:`~django_docker_helpers.config.backends.async_mpt_consul_parser.AsyncConsulKVClient`.
+    """
+    def __init__(self, data: dict):
+        self.data = data
+        self.calls = 0
+
+    @property
+    def kv(self):
+        return self
+
+    async def get(self, key: str, **params):
+        self.calls += 1
+        await asyncio.sleep(0)
+        if key not in self.data:
+            return '1', None
+        return '1', {'Key': key, 'Value': self.data[key]}
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def async_redis_parser():
+    parser = AsyncMPTRedisParser(scope='project')
+    aclient = FakeAsyncRedis(dict(mp_serialize_dict(SAMPLE, separator='.')))
+    parser.get_async_client = lambda: aclient
+    return parser
+
+
+@pytest.fixture
+def async_consul_parser():
+    parser = AsyncMPTConsulParser(scope='project')
+    aclient = FakeAsyncConsul(dict(mp_serialize_dict(SAMPLE, separator='/')))
+    parser.get_async_client = lambda: aclient
+    return parser
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+# noinspection PyMethodMayBeStatic,PyShadowingNames
+class AsyncConfigLoaderTest:
+    def test__async_mpt_redis_parser__aget(self, async_redis_parser: AsyncMPTRedisParser):
+        p = async_redis_parser
+        assert run(p.aget('nested.a.b')) == '2'
+        assert run(p.aget('nested.a.b', coerce_type=int)) == 2
+        assert run(p.aget('debug', coerce_type=bool)) is True
+        assert run(p.aget('mixed')) == ['ascii', 1, {'d': 1}]
+        assert run(p.aget('nothing', default=42)) == 42
+
+        run(p.aclose())
+        assert p._aclient is None
+
+    def test__aclient__per_event_loop(self):
+        p = AsyncMPTRedisParser(scope='project')
+        p.get_async_client = lambda: FakeAsyncRedis({})
+
+        async def same_loop_clients():
+            return p.aclient, p.aclient
+
+        first, second = run(same_loop_clients())
+        assert first is second, 'Ensure the client is cached within a loop'
+
+        third, _ = run(same_loop_clients())
+        assert third is not first, 'Ensure a client is not reused in another loop'
+        assert not first.closed
+
+        async def close():
+            aclient = p.aclient
+            await p.aclose()
+            return aclient
+
+        assert run(close()).closed
+        assert p._aclient is None
+
+    def test__async_mpt_consul_parser__aget(self, async_consul_parser: AsyncMPTConsulParser):
+        p = async_consul_parser
+        assert run(p.aget('nested.a.b', coerce_type=int)) == 2
+        assert run(p.aget('debug', coerce_type=bool)) is True
+        assert run(p.aget('mixed')) == ['ascii', 1, {'d': 1}]
+        assert run(p.aget('nothing', default=42)) == 42
+
+    def test__async_parsers__keep_from_env_options(self):
+        env = {
+            'CONFIG__PARSERS': 'AsyncMPTRedisParser,AsyncMPTConsulParser',
+            'ASYNCMPTREDISPARSER__PORT': '6380',
+            'ASYNCMPTCONSULPARSER__SCOPE': 'project',
+        }
+        loader = AsyncConfigLoader.from_env(env=env)
+        assert isinstance(loader, AsyncConfigLoader)
+        redis_parser, consul_parser = loader.parsers
+        assert redis_parser.client_options['port'] == 6380
+        assert consul_parser.scope == 'project'
+
+    def test__aget__priority(self, async_redis_parser, async_consul_parser):
+        loader = AsyncConfigLoader(parsers=[
+            EnvironmentParser(scope='project', env={'PROJECT__DEBUG': 'false'}),
+            async_consul_parser,
+            async_redis_parser,
+            YamlParser(config='./tests/data/config.yml', scope='project'),
+        ])
+
+        assert run(loader.aget('debug', coerce_type=bool)) is False, 'Ensure sync parsers go first'
+        assert run(loader.aget('nested.a.b', coerce_type=int)) == 2
+        assert async_consul_parser.get_async_client().calls == 1
+        assert async_redis_parser.get_async_client().calls == 0, 'Ensure values are taken from the first async parser'
+
+        assert run(loader.aget('name')) == 'wroom-wroom', 'Ensure the last sync parser is queried'
+        assert run(loader.aget('nothing.here', default='x')) == 'x'
+        assert loader.config_read_queue[-1].is_default
+
+        with pytest.raises(exceptions.RequiredValueIsEmpty):
+            run(loader.aget('nothing.here', required=True))
+
+    def test__aget_many(self, async_redis_parser):
+        loader = AsyncConfigLoader(parsers=[
+            async_redis_parser,
+            YamlParser(config='./tests/data/config.yml', scope='project'),
+        ])
+        res = run(loader.aget_many(['nested.a.b', 'name', 'nothing'], default=0))
+        assert res == {'nested.a.b': '2', 'name': 'wroom-wroom', 'nothing': 0}
+
+        run(loader.aclose())
+        assert async_redis_parser._aclient is None
+
+    def test__aget__silent(self):
+        class BrokenParser(AsyncBaseParser):
+            async def aget(self, variable_path, default=None, **kwargs):
+                raise ConnectionError('nope')
+
+        loader = AsyncConfigLoader(parsers=[BrokenParser()], silent=True, suppress_logs=True)
+        assert run(loader.aget('debug', default=1)) == 1
+
+        loader = AsyncConfigLoader(parsers=[BrokenParser()])
+        with pytest.raises(ConnectionError):
+            run(loader.aget('debug'))
+
+    def test__aget__profiled(self, async_redis_parser):
+        loader = AsyncConfigLoader(parsers=[
+            async_redis_parser,
+            YamlParser(config='./tests/data/config.yml', scope='project'),
+        ], use_key_index=False)
+        profiler = start_profiling()
+        try:
+            assert run(loader.aget('name')) == 'wroom-wroom'
+        finally:
+            stop_profiling()
+        assert profiler.phases['config.get.AsyncMPTRedisParser'].calls == 1
+        assert profiler.phases['config.get.YamlParser'].calls == 1
+
+    def test__async_consul_kv_client(self):
+        web = pytest.importorskip('aiohttp.web')
+
+        async def handler(request):
+            key = request.match_info['key']
+            if key != 'project/debug':
+                return web.Response(status=404, headers={'X-Consul-Index': '7'})
+            body = [{'Key': key, 'Value': base64.b64encode(b'true').decode()}]
+            return web.json_response(body, headers={'X-Consul-Index': '7'})
+
+        async def main():
+            app = web.Application()
+            app.router.add_get('/v1/kv/{key:.*}', handler)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, '127.0.0.1', 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+
+            client = AsyncConsulKVClient(port=port)
+            try:
+                return await client.kv.get('project/debug'), await client.kv.get('project/nothing')
+            finally:
+                await client.close()
+                await runner.cleanup()
+
+        (index, data), missing = run(main())
+        assert index == '7'
+        assert data['Value'] == b'true'
+        assert missing == ('7', None)
@@ -81,3 +81,16 @@ class EnvironmentBackendTest:
         p = EnvironmentParser(env={}, path_separator='/')
         with pytest.raises(NotImplementedError):
             p.get_client()
+
+    def test__iter_items(self):
+        env = {
+            'PROJECT__DB__HOST': 'localhost',
+            'PROJECT__DEBUG': '1',
+            'PROJECT__mixed__Case': '1',
+            'PROJECTILE': '1',
+            'OTHER': '1',
+        }
+        parser = EnvironmentParser(scope='project', env=env)
+        assert sorted(parser.iter_items()) == [('db.host', 'localhost'), ('debug', '1')]
+        assert sorted(parser.keys()) == ['db.host', 'debug']
+        assert all(parser.get(k) == v for k, v in parser.iter_items())
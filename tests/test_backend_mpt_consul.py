@@ -2,7 +2,9 @@
 import pytest
 
 import os
+from unittest import mock
 
+from django_docker_helpers.config import ConfigLoader
 from django_docker_helpers.config.backends.mpt_consul_parser import MPTConsulParser
 from django_docker_helpers.utils import mp_serialize_dict
 
@@ -53,3 +55,38 @@ class MPTConsulBackendTest:
     def test__mpt_consul_parser__scope(self, store_consul_config):
         p = MPTConsulParser(host=CONSUL_HOST, port=CONSUL_PORT, scope='nested', path_separator='.')
         assert p.get('a.b') == '2'
+
+    def test__mpt_consul_parser__iter_items(self):
+        p = MPTConsulParser(scope='nested')
+        p._client = mock.Mock()
+        p._client.kv.get.return_value = (1, [
+            {'Key': 'nested/', 'Value': None},
+            {'Key': 'nested/a/b', 'Value': b'2'},
+            {'Key': 'nested/c', 'Value': b'::YAML::\n[1, 2]\n'},
+        ])
+
+        assert p.iter_items() == [('a.b', '2'), ('c', [1, 2])]
+        p._client.kv.get.assert_called_once_with('nested/', recurse=True)
+
+    def test__mpt_consul_parser__keys__no_scope(self):
+        p = MPTConsulParser()
+        p._client = mock.Mock()
+        with pytest.raises(NotImplementedError):
+            p.keys()
+        with pytest.raises(NotImplementedError):
+            p.iter_items()
+        p._client.kv.get.assert_not_called()
+
+        loader = ConfigLoader(parsers=[p], use_key_index=True)
+        assert loader.non_enumerable_parsers == [p], 'Ensure the whole kv store is not indexed'
+
+    def test__mpt_consul_parser__iter_section_items(self):
+        p = MPTConsulParser(scope='nested')
+        p._client = mock.Mock()
+        p._client.kv.get.return_value = (1, [
+            {'Key': 'nested/db/', 'Value': None},
+            {'Key': 'nested/db/host', 'Value': b'localhost'},
+        ])
+
+        assert p.iter_section_items('db') == [('host', 'localhost')]
+        p._client.kv.get.assert_called_once_with('nested/db/', recurse=True)
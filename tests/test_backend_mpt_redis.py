@@ -2,7 +2,9 @@
 import pytest
 
 import os
+from unittest import mock
 
+from django_docker_helpers.config import ConfigLoader
 from django_docker_helpers.config.backends.mpt_redis_parser import MPTRedisParser
 from django_docker_helpers.utils import mp_serialize_dict
 
@@ -66,3 +68,29 @@ class MPTRedisBackendTest:
         p = MPTRedisParser(host=REDIS_HOST, port=REDIS_PORT, scope='nested', path_separator='.', key_prefix='my-prefix')
         assert p.get('a.b') == '2'
         assert p.get('a.b', coerce_type=int) == 2
+
+    def test__mpt_redis__iter_items(self):
+        p = MPTRedisParser(scope='nested', key_prefix='my-prefix')
+        p._client = mock.Mock()
+        p._client.scan_iter.return_value = [b'my-prefix:nested.a.b', b'my-prefix:nested.c']
+        p._client.mget.return_value = [b'2', b'::YAML::\n[1, 2]\n']
+
+        assert p.iter_items() == [('a.b', '2'), ('c', [1, 2])]
+        p._client.scan_iter.assert_called_once_with(match='my-prefix:nested.*')
+        p._client.mget.assert_called_once_with(['my-prefix:nested.a.b', 'my-prefix:nested.c'])
+
+    def test__mpt_redis__iter_section_items(self):
+        p = MPTRedisParser(scope='nested', key_prefix='my-prefix')
+        p._client = mock.Mock()
+        p._client.scan_iter.return_value = [b'my-prefix:nested.db.host', b'my-prefix:nested.db.options.ssl']
+        p._client.mget.return_value = [b'localhost', b'true']
+
+        assert p.iter_section_items('db') == [('host', 'localhost'), ('options.ssl', 'true')]
+        p._client.scan_iter.assert_called_once_with(match='my-prefix:nested.db.*')
+        p._client.mget.assert_called_once_with(['my-prefix:nested.db.host', 'my-prefix:nested.db.options.ssl'])
+
+        p._client.get.return_value = None
+        loader = ConfigLoader(parsers=[p])
+        with mock.patch.object(p, 'iter_items') as iter_items:
+            assert loader.get_section('db') == {'host': 'localhost', 'options': {'ssl': 'true'}}
+            iter_items.assert_not_called()
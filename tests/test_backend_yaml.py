@@ -1,6 +1,8 @@
 # noinspection PyPackageRequirements
 import pytest
 
+from io import StringIO
+
 from django_docker_helpers.config.backends.yaml_parser import YamlParser
 
 pytestmark = [pytest.mark.backend, pytest.mark.yaml]
@@ -43,3 +45,36 @@ class YamlBackendTest:
         p = YamlParser('./tests/data/config.yml', scope='development', path_separator='/')
         with pytest.raises(NotImplementedError):
             p.get_client()
+
+    def test__iter_items(self):
+        p = YamlParser('./tests/data/config.yml', scope='development')
+        items = dict(p.iter_items())
+        assert items['up.down.above'] == [1, 2, 3]
+        assert items['up.down.above.2'] == 3
+        assert items['list_of_dicts.1.b2'] == 2
+        assert sorted(p.keys()) == sorted(items)
+
+    def test__release_buffers(self):
+        p = YamlParser(StringIO('a:\n  b: 1\n'))
+        p.release_buffers()
+        assert p.config is not None, 'Ensure nothing is dropped before parsing'
+
+        p.warm_up()
+        p.release_buffers()
+        assert p.config is None
+        assert p.get('a.b') == 1
+        p.reload()
+        assert p.get('a.b') == 1, 'Ensure a released buffer keeps parsed data on reload'
+
+        with open('./tests/data/config.yml') as fp:
+            p = YamlParser(fp)
+            p.warm_up()
+        p.release_buffers()
+        assert p.config == './tests/data/config.yml', 'Ensure file objects are replaced with their paths'
+        p.reload()
+        assert p.get('project.name') == 'wroom-wroom'
+
+        p = YamlParser('./tests/data/config.yml')
+        p.warm_up()
+        p.release_buffers()
+        assert p.config == './tests/data/config.yml'
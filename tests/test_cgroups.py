@@ -0,0 +1,103 @@
+# noinspection PyPackageRequirements
+import pytest
+
+import os
+from unittest import mock
+
+from django_docker_helpers.cgroups import (
+    auto_size_workers, auto_tune_uwsgi, available_cpus, cpu_quota, memory_limit, process_cgroups
+)
+
+pytestmark = pytest.mark.cgroups
+
+
+def _write(path, content: str):
+    os.makedirs(os.path.dirname(str(path)), exist_ok=True)
+    with open(str(path), 'w') as fp:
+        fp.write(content)
+
+
+@pytest.fixture
+def cgroup_v1(tmp_path):
+    root = tmp_path / 'v1' / 'cgroup'
+    proc_cgroup = tmp_path / 'v1' / 'proc_cgroup'
+    _write(proc_cgroup, '4:memory:/docker/app\n3:cpu,cpuacct:/docker/app\n0::/\n')
+    _write(root / 'cpu,cpuacct' / 'docker' / 'app' / 'cpu.cfs_quota_us', '150000\n')
+    _write(root / 'cpu,cpuacct' / 'docker' / 'app' / 'cpu.cfs_period_us', '100000\n')
+    _write(root / 'cpu,cpuacct' / 'cpu.cfs_quota_us', '-1\n')
+    _write(root / 'memory' / 'docker' / 'app' / 'memory.limit_in_bytes', '9223372036854771712\n')
+    _write(root / 'memory' / 'docker' / 'memory.limit_in_bytes', '{0}\n'.format(1024 ** 3))
+    return str(root), str(proc_cgroup)
+
+
+@pytest.fixture
+def cgroup_v2(tmp_path):
+    root = tmp_path / 'v2' / 'cgroup'
+    proc_cgroup = tmp_path / 'v2' / 'proc_cgroup'
+    _write(proc_cgroup, '0::/\n')
+    _write(root / 'cgroup.controllers', 'cpu memory\n')
+    _write(root / 'cpu.max', '50000 100000\n')
+    _write(root / 'memory.max', '{0}\n'.format(512 * 1024 ** 2))
+    return str(root), str(proc_cgroup)
+
+
+# noinspection PyMethodMayBeStatic,PyShadowingNames
+class CgroupsTest:
+    def test__process_cgroups(self, cgroup_v1):
+        _root, proc_cgroup = cgroup_v1
+        assert process_cgroups(proc_cgroup) == {
+            'memory': '/docker/app', 'cpu': '/docker/app', 'cpuacct': '/docker/app', '': '/'
+        }
+
+    def test__cgroup_v1(self, cgroup_v1):
+        assert cpu_quota(*cgroup_v1) == 1.5
+        assert memory_limit(*cgroup_v1) == 1024 ** 3, 'Ensure parent limits are respected'
+
+    def test__cgroup_v2(self, cgroup_v2):
+        assert cpu_quota(*cgroup_v2) == 0.5
+        assert memory_limit(*cgroup_v2) == 512 * 1024 ** 2
+        assert available_cpus(*cgroup_v2) == 0.5
+
+        with open(os.path.join(cgroup_v2[0], 'cpu.max'), 'w') as fp:
+            fp.write('max 100000\n')
+        assert cpu_quota(*cgroup_v2) is None
+
+    def test__no_cgroups(self, tmp_path):
+        args = str(tmp_path / 'nothing'), str(tmp_path / 'nothing')
+        assert cpu_quota(*args) is None
+        assert memory_limit(*args) is None
+        assert available_cpus(*args) >= 1
+
+    @mock.patch('os.sched_getaffinity', return_value=set(range(8)), create=True)
+    def test__auto_size_workers(self, _sched_getaffinity, cgroup_v1, cgroup_v2):
+        # 1.5 CPUs rounded up
+        assert auto_size_workers(root=cgroup_v1[0], proc_cgroup=cgroup_v1[1]) == (5, 1)
+        # 1 GiB fits 4 workers of 256 MiB, threads make up the rest
+        assert auto_size_workers(
+            worker_memory=256 * 1024 ** 2, root=cgroup_v1[0], proc_cgroup=cgroup_v1[1]
+        ) == (4, 2)
+        assert auto_size_workers(
+            worker_memory=1024 ** 3, root=cgroup_v2[0], proc_cgroup=cgroup_v2[1]
+        ) == (1, 3)
+        assert auto_size_workers(workers=2, threads=8, root=cgroup_v2[0], proc_cgroup=cgroup_v2[1]) == (2, 8)
+
+    @mock.patch('os.sched_getaffinity', return_value=set(range(8)), create=True)
+    def test__auto_tune_uwsgi(self, _sched_getaffinity, cgroup_v2):
+        cfg = auto_tune_uwsgi(root=cgroup_v2[0], proc_cgroup=cgroup_v2[1])
+        assert (cfg['processes'], cfg['threads'], cfg['cheaper']) == (3, 1, 1)
+        assert 'enable-threads' not in cfg
+        assert 'cheaper' not in auto_tune_uwsgi(processes=1, root=cgroup_v2[0], proc_cgroup=cgroup_v2[1])
+        assert 'cheaper' not in auto_tune_uwsgi(processes=1, cheaper=2, root=cgroup_v2[0], proc_cgroup=cgroup_v2[1])
+        cfg = auto_tune_uwsgi(processes=4, cheaper=8, root=cgroup_v2[0], proc_cgroup=cgroup_v2[1])
+        assert (cfg['cheaper'], cfg['cheaper-initial']) == (3, 3)
+        cfg = auto_tune_uwsgi(processes=4, cheaper=2, root=cgroup_v2[0], proc_cgroup=cgroup_v2[1])
+        assert cfg['cheaper'] == 2
+        assert auto_tune_uwsgi(processes=4, threads=2, root=cgroup_v2[0], proc_cgroup=cgroup_v2[1]) == {
+            'processes': 4,
+            'threads': 2,
+            'enable-threads': True,
+            'cheaper-algo': 'spare',
+            'cheaper': 1,
+            'cheaper-initial': 1,
+            'cheaper-step': 1,
+        }
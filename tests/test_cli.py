@@ -70,3 +70,92 @@ class DjangoCliTest:
 
             # NOTE: it's necessary to make environ clean
             os.environ.clear()
+
+    def test_command__config_handoff(self, tmp_path):
+        config = tmp_path / 'config.yml'
+        config.write_text('uwsgi:\n  socket: 0.0.0.0:80\nproject:\n  name: handoff\n')
+        env = {'CONFIG__PARSERS': 'YamlParser', 'YAMLPARSER__CONFIG': str(config)}
+
+        with mock.patch.dict(os.environ, env, clear=True), mock.patch(
+                'django_docker_helpers.cli.django.management.commands.run_configured_uwsgi.os.execvp'
+        ) as mocked__os_execvp:
+            call_command('run_configured_uwsgi', '-f', str(tmp_path / 'uwsgi.ini'), '--config-handoff')
+            mocked__os_execvp.assert_called_once()
+
+            # workers started by uWSGI inherit the snapshot and never read the yaml again
+            config.unlink()
+            from django_docker_helpers.config import ConfigLoader
+            assert ConfigLoader.from_env().get('project.name') == 'handoff'
+            os.close(int(os.environ['CONFIG__SNAPSHOT'].rsplit('/', 1)[1]))
+
+        with mock.patch.dict(os.environ, env, clear=True), mock.patch(
+                'django_docker_helpers.cli.django.management.commands.run_configured_uwsgi.os.execvp'
+        ):
+            config.write_text('uwsgi:\n  socket: 0.0.0.0:80\n')
+            call_command('run_configured_uwsgi', '-f', str(tmp_path / 'uwsgi.ini'))
+            assert 'CONFIG__SNAPSHOT' not in os.environ, 'Ensure the handoff is opt-in'
+
+        env = dict(env, CONFIG__PARSERS='EnvironmentParser,YamlParser', SECRET_KEY='secret')
+        with mock.patch.dict(os.environ, env, clear=True), mock.patch(
+                'django_docker_helpers.cli.django.management.commands.run_configured_uwsgi.os.execvp'
+        ):
+            err = StringIO()
+            call_command('run_configured_uwsgi', '-f', str(tmp_path / 'uwsgi.ini'), '--config-handoff', stderr=err)
+            assert 'CONFIG__SNAPSHOT' not in os.environ, 'Ensure the environment is never snapshotted'
+            assert 'unscoped EnvironmentParser' in err.getvalue()
+
+    def test_run_configured_gunicorn(self, tmp_path):
+        config = tmp_path / 'config.yml'
+        config.write_text('gunicorn:\n  bind: 0.0.0.0:8000\n  threads: 2\n')
+        env = {'CONFIG__PARSERS': 'YamlParser', 'YAMLPARSER__CONFIG': str(config), 'GUNICORN__WORKERS': '3'}
+
+        with mock.patch.dict(os.environ, env, clear=True), mock.patch(
+                'django_docker_helpers.cli.django.management.commands.run_configured_gunicorn.run_gunicorn'
+        ) as mocked__run_gunicorn:
+            out = StringIO()
+            call_command('run_configured_gunicorn', '--print', '--cgroup-root', str(tmp_path), stdout=out)
+
+            mocked__run_gunicorn.assert_called_once()
+            assert mocked__run_gunicorn.call_args[1]['config'] == {'bind': '0.0.0.0:8000', 'workers': 3, 'threads': 2}
+            assert 'workers = 3' in out.getvalue()
+
+    @mock.patch('os.sched_getaffinity', return_value=set(range(8)), create=True)
+    def test_command__auto_tune(self, _sched_getaffinity, tmp_path):
+        cgroup_root = tmp_path / 'cgroup'
+        cgroup_root.mkdir()
+        (cgroup_root / 'cgroup.controllers').write_text('cpu memory\n')
+        (cgroup_root / 'cpu.max').write_text('200000 100000\n')
+        (cgroup_root / 'memory.max').write_text('{0}\n'.format(1024 ** 3))
+
+        config = tmp_path / 'config.yml'
+        config.write_text('uwsgi:\n  socket: 0.0.0.0:80\n  cheaper: 3\n')
+        env = {'CONFIG__PARSERS': 'YamlParser', 'YAMLPARSER__CONFIG': str(config)}
+
+        with mock.patch.dict(os.environ, env, clear=True), mock.patch(
+                'django_docker_helpers.cli.django.management.commands.run_configured_uwsgi.os.execvp'
+        ):
+            out = StringIO()
+            call_command('run_configured_uwsgi', '--print', '-f', str(tmp_path / 'uwsgi.ini'),
+                         '--auto-tune', '--worker-memory', '256MiB', '--cgroup-root', str(cgroup_root), stdout=out)
+
+            # 2 CPUs => 5 processes, but 1 GiB fits 4 processes of 256 MiB
+            assert 'auto-tuned: processes = 4\n' in out.getvalue()
+            assert 'auto-tuned: threads = 2\n' in out.getvalue()
+            assert 'auto-tuned: cheaper ' not in out.getvalue(), 'Ensure explicit values are not tuned'
+
+            ini = (tmp_path / 'uwsgi.ini').read_text()
+            assert 'processes = 4\n' in ini
+            assert 'enable-threads = true\n' in ini
+            assert 'cheaper = 3\n' in ini
+            assert 'cheaper-algo = spare\n' in ini
+
+            config.write_text('uwsgi:\n  socket: 0.0.0.0:80\n  cheaper: 8\n  cheaper-algo: busyness\n')
+            out = StringIO()
+            call_command('run_configured_uwsgi', '--print', '-f', str(tmp_path / 'uwsgi.ini'),
+                         '--auto-tune', '--worker-memory', '256MiB', '--cgroup-root', str(cgroup_root), stdout=out)
+
+            assert 'auto-tuned: cheaper = 3\n' in out.getvalue(), 'Ensure cheaper is less than processes'
+            ini = (tmp_path / 'uwsgi.ini').read_text()
+            assert 'cheaper = 3\n' in ini
+            assert 'cheaper-algo = busyness\n' in ini
+            assert 'cheaper-step' not in ini, 'Ensure cheaper-* options are not mixed with explicit ones'
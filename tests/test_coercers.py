@@ -0,0 +1,91 @@
+# noinspection PyPackageRequirements
+import pytest
+
+import typing as t
+from datetime import timedelta
+from decimal import Decimal
+
+from django_docker_helpers.config.backends import *
+from django_docker_helpers.config.coercers import (
+    DSN, ByteSize, coerce_timedelta, find_coercer, get_coercer, register_coercer
+)
+
+pytestmark = [pytest.mark.config_loader, pytest.mark.coercers]
+
+
+# noinspection PyMethodMayBeStatic
+class CoercersTest:
+    def test__get_coercer__cached(self):
+        assert get_coercer(t.List[int]) is get_coercer(t.List[int])
+        assert get_coercer(int)(5) == 5
+        assert get_coercer(t.Optional[int])('5') == 5
+        assert find_coercer(object) is None
+        assert get_coercer(list)('ab') == ['a', 'b'], 'Ensure plain types keep constructor behaviour'
+
+        with pytest.raises(TypeError):
+            get_coercer(t.Union[int, str])
+
+    def test__generics(self):
+        assert get_coercer(t.List[int])('1, 2,,3') == [1, 2, 3]
+        assert get_coercer(t.List[bool])(['on', 'off']) == [True, False]
+        assert get_coercer(t.Tuple[str, ...])('a,b') == ('a', 'b')
+        assert get_coercer(t.Dict[str, int])('{a: "1", b: 2}') == {'a': 1, 'b': 2}
+        assert get_coercer(t.Dict[str, t.Any])({'a': '1'}) == {'a': '1'}
+        assert get_coercer(t.Type[BaseParser])('django_docker_helpers.config.backends.YamlParser') is YamlParser
+
+        with pytest.raises(ValueError):
+            get_coercer(t.Dict[str, int])('- 1')
+
+    def test__timedelta(self):
+        assert coerce_timedelta('1h30m') == timedelta(hours=1, minutes=30)
+        assert coerce_timedelta('500ms') == timedelta(milliseconds=500)
+        assert coerce_timedelta('2.5') == timedelta(seconds=2.5)
+        assert coerce_timedelta(60) == timedelta(minutes=1)
+        assert get_coercer(timedelta)('1w 2d') == timedelta(days=9)
+
+        with pytest.raises(ValueError):
+            coerce_timedelta('5 minutes')
+
+    def test__byte_size(self):
+        assert ByteSize('512') == 512
+        assert ByteSize('64k') == 64 * 1024
+        assert ByteSize('10MB') == 10 * 1000 ** 2
+        assert ByteSize('1.5GiB') == int(1.5 * 1024 ** 3)
+        assert isinstance(get_coercer(ByteSize)('1m'), ByteSize)
+
+        with pytest.raises(ValueError):
+            ByteSize('10 parsecs')
+
+    def test__decimal(self):
+        assert get_coercer(Decimal)(0.1) == Decimal('0.1')
+        assert get_coercer(Decimal)('1.10') == Decimal('1.10')
+
+    def test__dsn(self):
+        dsn = get_coercer(DSN)('postgres://user:p%40ss@db:5433/app?sslmode=require')
+        assert dsn == DSN('postgres', 'user', 'p@ss', 'db', 5433, '/app', {'sslmode': 'require'})
+        assert dsn.name == 'app'
+        assert 'p@ss' not in repr(dsn)
+
+        with pytest.raises(ValueError):
+            DSN.parse('db:5432')
+
+    def test__register_coercer(self):
+        class Upper(str):
+            pass
+
+        @register_coercer(Upper)
+        def coerce_upper(val):
+            return Upper(val.upper())
+
+        assert BaseParser.coerce('abc', coerce_type=Upper) == 'ABC'
+
+    def test__parsers_share_coercers(self):
+        parser = EnvironmentParser(env={'SIZE': '1k', 'TIMEOUT': '2s', 'HOSTS': 'a,b', 'DEBUG': 'off'})
+        assert parser.get('size', coerce_type=ByteSize) == 1024
+        assert parser.get('timeout', coerce_type=timedelta) == timedelta(seconds=2)
+        assert parser.get('hosts', coerce_type=t.List[str]) == ['a', 'b']
+        assert parser.get('debug', coerce_type=bool) is False
+
+        parser = YamlParser(config='./tests/data/config.yml')
+        assert parser.get('hosts', coerce_type=t.List[str]) == ['localhost', '127.0.0.1']
+        assert parser.get('debug', coerce_type=bool) is True
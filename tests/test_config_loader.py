@@ -2,8 +2,12 @@
 import pytest
 
 import os
+import time
+import typing as t
+from io import StringIO
+from unittest import mock
 
-from django_docker_helpers.config import ConfigLoader, exceptions
+from django_docker_helpers.config import ConfigLoader, exceptions, get_parser_options_schema
 from django_docker_helpers.config.backends import *
 from django_docker_helpers.utils import mp_serialize_dict
 
@@ -82,6 +86,23 @@ def store_redis_config():
     return c
 
 
+class SlowParser(BaseParser):
+    def __init__(self, delay: float = 0, fail: bool = False):
+        super().__init__()
+        self.delay = delay
+        self.fail = fail
+        self.warmed_up = False
+
+    def warm_up(self):
+        time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError('nope')
+        self.warmed_up = True
+
+    def get(self, variable_path: str, default: t.Optional[t.Any] = None, **kwargs):
+        return default
+
+
 @pytest.fixture
 def loader():
     env = {
@@ -175,6 +196,38 @@ class ConfigLoaderTest:
         res = ConfigLoader.load_parser_options_from_env(EnvironmentParser, env)
         assert res == {'scope': 'deep'}
 
+    def test__load_parser_options_from_env__coercion(self):
+        env = {
+            'CONSULPARSER__VERIFY': 'off',
+            'CONSULPARSER__KV_GET_OPTS': '{"consistency": "stale"}',
+            'CONSULPARSER__INNER_PARSER_CLASS': 'django_docker_helpers.config.backends.YamlParser',
+            'CONSULPARSER__PORT': '8501',
+        }
+        res = ConfigLoader.load_parser_options_from_env(ConsulParser, env)
+        assert res == {
+            'verify': False,
+            'kv_get_opts': {'consistency': 'stale'},
+            'inner_parser_class': YamlParser,
+            'port': 8501,
+        }
+
+        class ListParser(BaseParser):
+            def __init__(self, hosts: t.Optional[t.List[str]] = None, ports: t.List[int] = None):
+                super().__init__()
+
+        res = ConfigLoader.load_parser_options_from_env(ListParser, {
+            'LISTPARSER__HOSTS': 'a,b',
+            'LISTPARSER__PORTS': '1,2',
+        })
+        assert res == {'hosts': ['a', 'b'], 'ports': [1, 2]}
+
+    def test__get_parser_options_schema__cached(self):
+        schema = get_parser_options_schema(RedisParser)
+        assert schema is get_parser_options_schema(RedisParser)
+        assert schema.env_var_names['host'] == 'REDISPARSER__HOST'
+        assert 'endpoint' in schema.accepted_keys
+        assert 'self' not in schema.arg_names
+
     def test__config_read_queue(self,
                                 loader: ConfigLoader,
                                 store_mpt_consul_config,
@@ -206,3 +259,188 @@ class ConfigLoaderTest:
 
         with pytest.raises(exceptions.RequiredValueIsEmpty):
             loader.get('some.nonexistent_var', required=True)
+
+    def test__warm_up__concurrent(self):
+        parsers = [SlowParser(0.3), SlowParser(0.3), SlowParser(0.3), YamlParser('./tests/data/config.yml')]
+        loader = ConfigLoader(parsers=parsers)
+
+        started_at = time.monotonic()
+        report = loader.warm_up()
+        assert time.monotonic() - started_at < 0.8, 'Ensure parsers are warmed up concurrently'
+
+        assert all(p.warmed_up for p in parsers[:3])
+        assert parsers[3]._data is not None
+        assert [r.error for r in report] == [None] * 4
+        assert all(r.elapsed >= 0.3 for r in report[:3])
+        assert loader.warm_up_report is report
+
+    def test__warm_up__timeout_and_errors(self):
+        loader = ConfigLoader(parsers=[SlowParser(5), SlowParser(fail=True)], suppress_logs=True)
+
+        started_at = time.monotonic()
+        slow, failed = loader.warm_up(timeout=0.2)
+        assert time.monotonic() - started_at < 1
+
+        assert isinstance(slow.error, TimeoutError)
+        assert isinstance(failed.error, ConnectionError)
+
+    def test__warm_up__attempts(self):
+        flaky = SlowParser(fail=True)
+        calls = []
+
+        def warm_up():
+            calls.append(time.monotonic())
+            flaky.fail = len(calls) < 3
+            SlowParser.warm_up(flaky)
+
+        flaky.warm_up = warm_up
+        loader = ConfigLoader(parsers=[flaky, SlowParser(fail=True)], suppress_logs=True)
+
+        recovered, failed = loader.warm_up(timeout=5, attempts=3)
+        assert recovered.error is None and flaky.warmed_up
+        assert len(calls) == 3
+        assert calls[-1] - calls[0] < 1, 'Ensure first retries are fast'
+        assert isinstance(failed.error, ConnectionError)
+
+    def test__from_env__warm_up(self):
+        env = {
+            'CONFIG__PARSERS': 'YamlParser',
+            'CONFIG__WARM_UP': '1',
+            'CONFIG__WARM_UP_TIMEOUT': '10',
+            'YAMLPARSER__CONFIG': './tests/data/config.yml',
+        }
+        loader = ConfigLoader.from_env(env=env)
+        assert len(loader.warm_up_report) == 1
+        assert loader.parsers[0]._data is not None
+
+    def test__key_index(self):
+        env = {'PROJECT__NAME': 'from-env', 'PROJECT__DESCRIPTION__NAME': 'env-description'}
+        env_parser = EnvironmentParser(scope='project', env=env)
+        slow_parser = SlowParser()
+        yaml_parser = YamlParser(config='./tests/data/config.yml', scope='project')
+        loader = ConfigLoader(parsers=[env_parser, slow_parser, yaml_parser], use_key_index=True)
+
+        assert loader.get('name') == 'from-env'
+        assert loader.get('a', coerce_type=str) == '1'
+        assert loader.get('description') == {'name': 'something', 'aname': 'smth'}
+        assert loader.get('description.name') == 'env-description'
+        assert loader.get('nothing', default=1) == 1
+
+        assert loader.key_index['name'] == 0
+        assert loader.key_index['a'] == 2
+        assert loader._not_indexed == [1], 'Ensure non-enumerable parsers are queried as usual'
+        assert loader.get_lookup_plan('name') == ([], 0)
+        assert loader.get_lookup_plan('a') == ([1], 2)
+        assert loader.get_lookup_plan('a', extra=1) == (range(3), None)
+        assert loader.config_read_queue[0].parser_name == str(env_parser)
+
+    def test__key_index__case_insensitive_env(self):
+        env = {'PROJECT__DEBUG': 'true', 'PROJECT__NAME': 'from-env'}
+        yaml_parser = YamlParser(StringIO('project:\n  DEBUG: false\n  Name: from-yaml\n'), scope='project')
+        loader = ConfigLoader(parsers=[EnvironmentParser(scope='project', env=env), yaml_parser], use_key_index=True)
+
+        assert loader.get('DEBUG') == 'true'
+        assert loader.get('debug') == 'true'
+        assert loader.get('Name') == 'from-env', 'Ensure parsers precedence is kept for folded paths'
+        assert loader.get_many(['DEBUG', 'NaMe']) == {'DEBUG': 'true', 'NaMe': 'from-env'}
+        assert loader.get_lookup_plan('DEBUG') == ([], 0)
+
+        loader = ConfigLoader(parsers=[yaml_parser, EnvironmentParser(scope='project', env=env)], use_key_index=True)
+        assert loader.get('DEBUG') is False
+        assert loader.get('NAME') == 'from-env'
+
+    def test__key_index__reload(self):
+        env = {'PROJECT__NAME': 'from-env'}
+        env_parser = EnvironmentParser(scope='project', env=env)
+        yaml_parser = YamlParser(config='./tests/data/config.yml', scope='project')
+        loader = ConfigLoader(parsers=[env_parser, yaml_parser], use_key_index=True)
+        assert loader.get('name') == 'from-env'
+
+        env.pop('PROJECT__NAME')
+        env['PROJECT__NEW__VALUE'] = '1'
+        assert loader.get('name') == 'from-env', 'Ensure indexed values are snapshots'
+
+        with mock.patch.object(yaml_parser, 'iter_items', wraps=yaml_parser.iter_items) as yaml_iter_items:
+            loader.reload(env_parser)
+            yaml_iter_items.assert_not_called()
+
+        assert loader.get('name') == 'wroom-wroom'
+        assert loader.get('new.value', coerce_type=int) == 1
+        assert 'name' in loader.key_index
+
+        yaml_parser.reload()
+        assert yaml_parser._data is None
+
+    def test__get_section(self):
+        env = {'PROJECT__DESCRIPTION__NAME': 'from-env', 'PROJECT__DESCRIPTION__EXTRA__FLAG': 'on'}
+        yaml_parser = YamlParser(config='./tests/data/config.yml', scope='project')
+        loader = ConfigLoader(parsers=[EnvironmentParser(scope='project', env=env), SlowParser(), yaml_parser])
+
+        section = loader.get_section('description')
+        assert section == {'name': 'from-env', 'aname': 'smth', 'extra': {'flag': 'on'}}
+        assert yaml_parser.get('description.name') == 'something', 'Ensure parsers data is not mutated'
+        assert loader.config_read_queue[-1].parser_name == str(loader.parsers[0])
+
+        assert loader.get_section('name') is None, 'Ensure non-dict values are ignored'
+        assert loader.get_section('nothing', default={}) == {}
+        with pytest.raises(exceptions.RequiredValueIsEmpty):
+            loader.get_section('nothing', required=True)
+
+    def test__get_section__case_insensitive_env(self):
+        yaml_parser = YamlParser(StringIO('DATABASES:\n  default:\n    HOST: localhost\n    PORT: 5432\n'))
+        loader = ConfigLoader(parsers=[
+            EnvironmentParser(env={'DATABASES__DEFAULT__HOST': 'db', 'DATABASES__DEFAULT__NAME': 'app'}),
+            yaml_parser,
+        ])
+
+        section = loader.get_section('DATABASES')
+        assert section == {'default': {'HOST': 'db', 'PORT': 5432, 'name': 'app'}}
+        assert yaml_parser.get('DATABASES.default.HOST') == 'localhost'
+
+    def test__get_section__structural_sharing(self):
+        yaml_parser = YamlParser(config='./tests/data/config.yml')
+        loader = ConfigLoader(parsers=[
+            EnvironmentParser(env={'DEVELOPMENT__UP__DOWN__ABOVE': '[]'}),
+            yaml_parser,
+        ], use_key_index=True)
+
+        section = loader.get_section('development')
+        assert section['up']['down']['above'] == '[]'
+        assert section['list_of_dicts'] is yaml_parser.get('development.list_of_dicts')
+        assert yaml_parser.get('development.up.down.above') == [1, 2, 3]
+
+    def test__lazy(self):
+        env = {'PROJECT__PORT': '8000', 'PROJECT__DESCRIPTION__NAME': 'from-env'}
+        yaml_parser = YamlParser(config='./tests/data/config.yml', scope='project')
+        loader = ConfigLoader(parsers=[EnvironmentParser(scope='project', env=env), yaml_parser])
+
+        with mock.patch.object(loader, 'get', wraps=loader.get) as get:
+            port = loader.lazy('port', coerce_type=int)
+            name = loader.lazy('name')
+            get.assert_not_called()
+
+            assert not port.is_resolved
+            assert port + 1 == 8001
+            assert 1 + port == 8001
+            assert int(port) == 8000 and port.is_resolved
+            assert name == 'wroom-wroom'
+            assert name.upper() == 'WROOM-WROOM'
+            assert isinstance(name, str)
+            assert get.call_count == 2, 'Ensure values are read once'
+
+        secret = loader.lazy('secret', required=True)
+        with pytest.raises(exceptions.RequiredValueIsEmpty):
+            bool(secret)
+
+    def test__lazy_section(self):
+        env = {'PROJECT__DESCRIPTION__NAME': 'from-env'}
+        loader = ConfigLoader(parsers=[
+            EnvironmentParser(scope='project', env=env),
+            YamlParser(config='./tests/data/config.yml', scope='project'),
+        ])
+
+        description = loader.lazy_section('description')
+        assert not loader.config_read_queue
+        assert description['name'] == 'from-env'
+        assert dict(description) == {'name': 'from-env', 'aname': 'smth'}
+        assert len(loader.config_read_queue) == 1
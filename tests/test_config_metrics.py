@@ -0,0 +1,108 @@
+# noinspection PyPackageRequirements
+import pytest
+
+import gc
+import threading
+from io import StringIO
+
+from django_docker_helpers.config import ConfigLoader
+from django_docker_helpers.config.backends import *
+from django_docker_helpers.config.metrics import ConfigMetrics, ParserMetrics
+
+pytestmark = [pytest.mark.config_loader, pytest.mark.metrics]
+
+
+class BrokenParser(BaseParser):
+    def get(self, variable_path: str, default=None, coerce_type=None, coercer=None, **kwargs):
+        raise ConnectionError('down')
+
+
+@pytest.fixture
+def loader():
+    return ConfigLoader(parsers=[
+        EnvironmentParser(scope='project', env={'PROJECT__DEBUG': 'true'}),
+        YamlParser(StringIO('project:\n  debug: false\n  name: test\n'), scope='project'),
+    ], collect_metrics=True)
+
+
+# noinspection PyMethodMayBeStatic
+class ConfigMetricsTest:
+    def test__disabled(self):
+        loader = ConfigLoader(parsers=[YamlParser(StringIO('a: 1\n'))])
+        assert loader.metrics is None
+        assert loader.get('a') == 1
+
+    def test__get(self, loader: ConfigLoader):
+        assert loader.get('debug') == 'true'
+        assert loader.get('name') == 'test'
+        assert loader.get('missing') is None
+
+        env_stats, yaml_stats = loader.metrics.stats()
+        assert env_stats['calls'] == 3 and env_stats['hits'] == 1 and env_stats['misses'] == 2
+        assert yaml_stats['calls'] == 2 and yaml_stats['hits'] == 1 and yaml_stats['misses'] == 1
+        assert yaml_stats['hit_rate'] == 0.5
+        assert yaml_stats['latency_buckets'][-1] == (float('inf'), 2)
+        assert yaml_stats['latency_sum'] > 0
+
+    def test__errors(self):
+        loader = ConfigLoader(parsers=[BrokenParser(), YamlParser(StringIO('a: 1\n'))],
+                              silent=True, suppress_logs=True, collect_metrics=True)
+        assert loader.get('a') == 1
+        broken_stats = loader.metrics[0].stats()
+        assert broken_stats['errors'] == 1 and broken_stats['hit_rate'] is None
+
+        loader.silent = False
+        with pytest.raises(ConnectionError):
+            loader.get('a')
+        assert loader.metrics[0].stats()['errors'] == 2
+
+    def test__key_index_and_get_many(self, loader: ConfigLoader):
+        loader.use_key_index = True
+        assert loader.get('name') == 'test'
+        assert loader.get_many(['debug', 'name', 'missing']) == {'debug': 'true', 'name': 'test', 'missing': None}
+
+        env_stats, yaml_stats = loader.metrics.stats()
+        assert yaml_stats['hits'] == 2 and yaml_stats['misses'] == 0
+        assert env_stats['hits'] == 1
+
+    def test__threads(self):
+        metrics = ParserMetrics(YamlParser(StringIO('a: 1\n')), buckets=(0.1, 1))
+
+        def _observe():
+            for _ in range(1000):
+                metrics.observe(0.5, hits=1)
+
+        threads = [threading.Thread(target=_observe) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        gc.collect()
+        assert len(metrics._shards) == 0, 'Ensure shards of exited threads are merged'
+        metrics.observe(0.01, misses=1)
+
+        stats = metrics.stats()
+        assert stats['calls'] == 4001 and stats['hits'] == 4000 and stats['misses'] == 1
+        assert stats['latency_buckets'] == [(0.1, 1), (1, 4001), (float('inf'), 4001)]
+        assert len(metrics._shards) == 1
+
+    def test__to_prometheus(self, loader: ConfigLoader, tmp_path):
+        loader.get('name')
+        text = loader.metrics.to_prometheus()
+        lines = text.splitlines()
+
+        assert '# TYPE django_docker_helpers_config_parser_latency_seconds histogram' in lines
+        assert 'django_docker_helpers_config_parser_calls_total{parser="YamlParser",index="1"} 1' in lines
+        assert 'django_docker_helpers_config_parser_lookups_total{parser="EnvironmentParser",index="0",' \
+               'result="miss"} 1' in lines
+        assert 'django_docker_helpers_config_parser_latency_seconds_bucket{parser="YamlParser",index="1",' \
+               'le="+Inf"} 1' in lines
+        assert 'django_docker_helpers_config_parser_latency_seconds_count{parser="YamlParser",index="1"} 1' in lines
+
+        path = tmp_path / 'config.prom'
+        loader.metrics.write_prometheus(str(path), prefix='app')
+        assert path.read_text().startswith('# HELP app_parser_calls_total')
+
+    def test__from_env(self):
+        loader = ConfigLoader.from_env(parser_modules=['EnvironmentParser'], env={'CONFIG__COLLECT_METRICS': 'true'})
+        assert isinstance(loader.metrics, ConfigMetrics)
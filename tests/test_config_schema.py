@@ -0,0 +1,102 @@
+# noinspection PyPackageRequirements
+import pytest
+
+from django_docker_helpers.config import ConfigLoader, exceptions
+from django_docker_helpers.config.backends import *
+from django_docker_helpers.config.schema import ConfigSchema, Field, Section, compile_schema
+from django_docker_helpers.utils import mp_serialize_dict
+
+pytestmark = [pytest.mark.config_loader, pytest.mark.schema]
+
+
+class FakeRedis:
+    """
+    A local stand-in for ``redis.Redis`` counting round trips.
+    """
+    def __init__(self, data: dict):
+        self.data = data
+        self.calls = 0
+
+    def get(self, key: str):
+        self.calls += 1
+        return self.data.get(key)
+
+    def mget(self, keys):
+        self.calls += 1
+        return [self.data.get(key) for key in keys]
+
+
+class DescriptionConfig(ConfigSchema):
+    name = Field(str)
+    aname = Field(str, default='-')
+    extra = Field(int, default=0)
+
+
+class ProjectConfig(ConfigSchema):
+    debug = Field(bool, default=False)
+    port = Field(int, default=8000)
+    name = Field(required=True)
+    a = Field(str)
+    description = Section(DescriptionConfig)
+    replicas = Field(int, path='deploy.replicas', default=1)
+
+
+@pytest.fixture
+def redis_parser():
+    parser = MPTRedisParser(scope='project')
+    parser._client = FakeRedis(dict(mp_serialize_dict({'project': {'port': 9000, 'deploy': {'replicas': 3}}})))
+    return parser
+
+
+# noinspection PyMethodMayBeStatic,PyShadowingNames
+class ConfigSchemaTest:
+    def test__compile_schema(self):
+        plan = compile_schema(ProjectConfig)
+        assert [path for _attr_path, path, _field in plan] == [
+            'debug', 'port', 'name', 'a', 'description.name', 'description.aname', 'description.extra',
+            'deploy.replicas',
+        ]
+        assert compile_schema(ProjectConfig) is plan
+
+    def test__resolve_schema(self, redis_parser):
+        loader = ConfigLoader(parsers=[
+            EnvironmentParser(scope='project', env={'PROJECT__DEBUG': 'true', 'PROJECT__DESCRIPTION__EXTRA': '5'}),
+            redis_parser,
+            YamlParser(config='./tests/data/config.yml', scope='project'),
+        ])
+        config = loader.resolve_schema(ProjectConfig)
+
+        assert config.debug is True
+        assert config.port == 9000
+        assert config.replicas == 3
+        assert config.name == 'wroom-wroom'
+        assert config.a == '1'
+        assert config.description.as_dict() == {'name': 'something', 'aname': 'smth', 'extra': 5}
+        assert redis_parser.client.calls == 1, 'Ensure redis is queried with a single MGET'
+
+        with pytest.raises(AttributeError):
+            config.debug = False
+        with pytest.raises(AttributeError):
+            config.typo
+        assert not hasattr(config, '__dict__')
+        assert type(config) is ProjectConfig.values_class
+
+    def test__resolve_schema__reports_all_errors(self):
+        loader = ConfigLoader(parsers=[
+            EnvironmentParser(scope='project', env={'PROJECT__PORT': 'http', 'PROJECT__DESCRIPTION__EXTRA': 'x'}),
+        ])
+        with pytest.raises(exceptions.SchemaValidationError) as e:
+            loader.resolve_schema(ProjectConfig)
+
+        assert sorted(e.value.errors) == ['description.extra', 'name', 'port']
+
+    def test__get_many(self, redis_parser):
+        loader = ConfigLoader(parsers=[
+            EnvironmentParser(scope='project', env={'PROJECT__PORT': '1'}),
+            redis_parser,
+            YamlParser(config='./tests/data/config.yml', scope='project'),
+        ])
+        values = loader.get_many(['port', 'deploy.replicas', 'name', 'nothing'], coerce_type=str, default='-')
+        assert values == {'port': '1', 'deploy.replicas': '3', 'name': 'wroom-wroom', 'nothing': '-'}
+        assert redis_parser.client.calls == 1
+        assert [item.is_default for item in loader.config_read_queue] == [False, False, False, True]
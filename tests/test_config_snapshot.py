@@ -0,0 +1,201 @@
+# noinspection PyPackageRequirements
+import pytest
+
+import multiprocessing
+import os
+import subprocess
+import sys
+import typing as t
+from io import StringIO
+
+from django_docker_helpers.config import ConfigLoader, exceptions
+from django_docker_helpers.config.backends import *
+from django_docker_helpers.config.snapshot import (
+    Snapshot, dump_snapshot, is_fresh_snapshot, write_inheritable_snapshot, write_snapshot
+)
+
+pytestmark = [pytest.mark.config_loader, pytest.mark.snapshot]
+
+
+class CountingYamlParser(YamlParser):
+    """
+    Appends a line to ``counter`` on every enumeration, it's visible across processes.
+    """
+    def __init__(self, config: t.Optional[str] = None, counter: t.Optional[str] = None):
+        super().__init__(config=config)
+        self.counter = counter
+
+    def iter_items(self):
+        with open(self.counter, 'a') as fp:
+            fp.write('{0}\n'.format(os.getpid()))
+        return super().iter_items()
+
+
+def _load_from_env(env: dict, queue):
+    loader = ConfigLoader.from_env(parser_modules=[], env=env, extra={'counter': env['COUNTER']})
+    queue.put(loader.get('project.name'))
+
+
+@pytest.fixture
+def snapshot_loader(tmp_path):
+    env = {'APP__PROJECT__DESCRIPTION__NAME': 'from-env', 'APP__PROJECT__PORT': '8000'}
+    loader = ConfigLoader(parsers=[
+        EnvironmentParser(scope='app', env=env),
+        YamlParser(config='./tests/data/config.yml'),
+    ])
+    path = str(tmp_path / 'config.snapshot')
+    loader.write_snapshot(path)
+    return loader, ConfigLoader(parsers=[SnapshotParser(config=path)])
+
+
+# noinspection PyMethodMayBeStatic,PyShadowingNames
+class ConfigSnapshotTest:
+    def test__snapshot_format(self, tmp_path):
+        items = [('b', 1), ('a.b', [1, 2]), ('a.c', {'x': None}), ('ab', 'юникод')]
+        snapshot = Snapshot('memory', dump_snapshot(items))
+
+        assert snapshot.count == 4
+        assert [snapshot.key(idx) for idx in range(snapshot.count)] == ['a.b', 'a.c', 'ab', 'b']
+        assert snapshot.value(snapshot.find('ab')) == 'юникод'
+        assert snapshot.find('a') == -1
+        assert [snapshot.key(idx) for idx in snapshot.iter_prefix('a.')] == ['a.b', 'a.c']
+
+        with pytest.raises(exceptions.InvalidSnapshot):
+            Snapshot('memory', b'garbage' * 10)
+
+        path = str(tmp_path / 'snapshot')
+        write_snapshot(path, items)
+        assert os.stat(path).st_mode & 0o777 == 0o600
+        assert is_fresh_snapshot(path) and not is_fresh_snapshot(path, ttl=-1)
+
+        os.chmod(path, 0o666)
+        with pytest.raises(exceptions.InvalidSnapshot):
+            Snapshot.open(path)
+
+    def test__snapshot_parser(self, snapshot_loader):
+        live_loader, loader = snapshot_loader
+        for path in ['debug', 'hosts', 'hosts.1', 'project.name', 'development.list_of_dicts', 'my.deep.nested']:
+            assert loader.get(path) == live_loader.get(path)
+
+        assert loader.get('project.port', coerce_type=int) == 8000
+        assert loader.get('project.description.name') == 'from-env'
+        assert loader.get('project.description') == {'name': 'something', 'aname': 'smth'}, \
+            'Ensure a section is taken from the parser holding it like in a live loader'
+        assert loader.get('development.up') == {'down': {'above': [1, 2, 3]}}
+        assert loader.get('nothing', default=1) == 1
+
+        p = loader.parsers[0]
+        assert {'debug', 'project', 'project.description', 'project.description.name'} <= set(p.keys())
+        assert SnapshotParser(config=p.config, scope='project').get('description.aname') == 'smth'
+
+    def test__snapshot_items__live_precedence(self, tmp_path):
+        env = {'PROJECT__DEBUG': 'true', 'PROJECT__DB__HOST': 'envhost', 'PROJECT__CACHE__TTL': '1'}
+        yaml_parser = YamlParser(StringIO(
+            'project:\n  DEBUG: false\n  db:\n    host: yhost\n    port: 5432\n  cache:\n    TTL: 10\n'
+        ), scope='project')
+        live_loader = ConfigLoader(parsers=[EnvironmentParser(scope='project', env=env), yaml_parser])
+        path = str(tmp_path / 'config.snapshot')
+        live_loader.write_snapshot(path)
+        loader = ConfigLoader(parsers=[SnapshotParser(config=path)])
+
+        for variable_path in ['DEBUG', 'debug', 'db', 'db.host', 'db.port', 'cache', 'cache.TTL', 'cache.ttl']:
+            assert loader.get(variable_path) == live_loader.get(variable_path), variable_path
+        assert loader.get('DEBUG') == 'true'
+        assert loader.get('db') == {'host': 'yhost', 'port': 5432}
+
+    def test__snapshot_items__refused(self, tmp_path):
+        class NonEnumerableParser(BaseParser):
+            def get(self, variable_path, default=None, **kwargs):
+                return 'value'
+
+        path = str(tmp_path / 'config.snapshot')
+        with pytest.raises(ValueError, match='cannot enumerate'):
+            ConfigLoader(parsers=[
+                NonEnumerableParser(), YamlParser(config='./tests/data/config.yml'),
+            ]).write_snapshot(path)
+        with pytest.raises(ValueError, match='unscoped EnvironmentParser'):
+            ConfigLoader(parsers=[EnvironmentParser(env={'SECRET_KEY': 'secret'})]).write_snapshot(path)
+        assert not os.path.exists(path)
+
+        env = {
+            'CONFIG__PARSERS': 'EnvironmentParser,YamlParser',
+            'CONFIG__SNAPSHOT': path,
+            'YAMLPARSER__CONFIG': './tests/data/config.yml',
+            'SECRET_KEY': 'secret',
+        }
+        with pytest.raises(ValueError, match='unscoped EnvironmentParser'):
+            ConfigLoader.from_env(env=env)
+        assert not os.path.exists(path)
+
+    def test__from_env__snapshot(self, tmp_path):
+        path = str(tmp_path / 'config.snapshot')
+        env = {
+            'CONFIG__PARSERS': 'YamlParser',
+            'CONFIG__SNAPSHOT': path,
+            'YAMLPARSER__CONFIG': './tests/data/config.yml',
+        }
+        loader = ConfigLoader.from_env(env=env)
+        assert [type(p) for p in loader.parsers] == [SnapshotParser]
+        assert loader.get('project.name') == 'wroom-wroom'
+
+        env['YAMLPARSER__CONFIG'] = './nothing.yml'
+        assert ConfigLoader.from_env(env=env).get('project.name') == 'wroom-wroom', 'Ensure the snapshot is reused'
+
+        env['CONFIG__SNAPSHOT_TTL'] = '-1'
+        with pytest.raises(FileNotFoundError):
+            ConfigLoader.from_env(env=env)
+
+    def test__from_env__snapshot__written_once(self, tmp_path):
+        counter = str(tmp_path / 'counter')
+        env = {
+            'CONFIG__PARSERS': '{0}.CountingYamlParser'.format(__name__),
+            'CONFIG__SNAPSHOT': str(tmp_path / 'config.snapshot'),
+            'COUNTINGYAMLPARSER__CONFIG': './tests/data/config.yml',
+            'COUNTER': counter,
+        }
+        ctx = multiprocessing.get_context('fork')
+        queue = ctx.Queue()
+        processes = [ctx.Process(target=_load_from_env, args=(env, queue)) for _ in range(4)]
+        for process in processes:
+            process.start()
+        results = [queue.get(timeout=30) for _ in processes]
+        for process in processes:
+            process.join()
+
+        assert results == ['wroom-wroom'] * 4
+        with open(counter) as fp:
+            assert len(fp.readlines()) == 1, 'Ensure only the first process resolves the config'
+
+    def test__from_env__inherited_snapshot__missing_fd(self):
+        r, w = os.pipe()
+        os.close(r)
+        os.close(w)
+        env = {
+            'CONFIG__PARSERS': 'YamlParser',
+            'CONFIG__SNAPSHOT': '/proc/self/fd/{0}'.format(r),
+            'CONFIG__SUPPRESS_LOGS': '1',
+            'YAMLPARSER__CONFIG': './tests/data/config.yml',
+        }
+        loader = ConfigLoader.from_env(env=env)
+        assert [type(p) for p in loader.parsers] == [YamlParser], 'Ensure parsers are used if the fd is not inherited'
+        assert loader.get('project.name') == 'wroom-wroom'
+
+    def test__write_inheritable_snapshot(self, snapshot_loader):
+        loader, _snapshot_loader = snapshot_loader
+        location = write_inheritable_snapshot(loader.snapshot_items())
+        fd = int(location.rsplit('/', 1)[1])
+        try:
+            assert os.get_inheritable(fd)
+            assert os.fstat(fd).st_mode & 0o777 == 0o600
+
+            # a fresh interpreter gets the resolved config across exec without reading any parser
+            env = dict(os.environ, CONFIG__PARSERS='YamlParser', YAMLPARSER__CONFIG='./nothing.yml',
+                       CONFIG__SNAPSHOT=location)
+            output = subprocess.check_output([
+                sys.executable, '-c',
+                'from django_docker_helpers.config import ConfigLoader; '
+                'print(ConfigLoader.from_env().get("project.description.name"))'
+            ], env=env, pass_fds=(fd,))
+            assert output.decode().strip() == 'from-env'
+        finally:
+            os.close(fd)
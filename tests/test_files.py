@@ -0,0 +1,105 @@
+# noinspection PyPackageRequirements
+import pytest
+
+import os
+import time
+from unittest.mock import patch
+
+import django
+from django.core.files.storage import Storage
+from django.test import override_settings
+
+from django_docker_helpers.files import STATIC_MANIFEST_NAME, collect_static, collect_static_incremental
+
+pytestmark = pytest.mark.files
+
+
+class RemoteStorage(Storage):
+    """
+    A stand-in for S3 and other remote storages.
+    """
+
+
+def _staticfiles_storage_settings(backend: str) -> dict:
+    # ``STORAGES`` appeared in Django 4.2, ``STATICFILES_STORAGE`` was removed in 5.1
+    if django.VERSION >= (4, 2):
+        return {'STORAGES': {
+            'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+            'staticfiles': {'BACKEND': backend},
+        }}
+    return {'STATICFILES_STORAGE': backend}
+
+
+def _generate_tree(root, count: int):
+    for i in range(count):
+        directory = os.path.join(str(root), 'dir_{0}'.format(i % 50))
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, 'file_{0}.css'.format(i)), 'w') as fp:
+            fp.write('.c{0} {{ color: #{0:06x}; }}\n'.format(i))
+
+
+# noinspection PyMethodMayBeStatic
+class CollectStaticTest:
+    def test__collect_static_incremental(self, tmp_path):
+        source, static_root = tmp_path / 'src', tmp_path / 'static'
+        _generate_tree(source, 20)
+
+        with override_settings(STATICFILES_DIRS=[str(source)], STATIC_ROOT=str(static_root)):
+            assert collect_static_incremental() == {'copied': 20, 'unchanged': 0, 'deleted': 0}
+            assert (static_root / 'dir_1' / 'file_1.css').read_text() == '.c1 { color: #000001; }\n'
+            assert (static_root / STATIC_MANIFEST_NAME).exists()
+
+            assert collect_static_incremental() == {'copied': 0, 'unchanged': 20, 'deleted': 0}
+
+            (source / 'dir_1' / 'file_1.css').write_text('changed')
+            # touched, but the same content
+            os.utime(str(source / 'dir_2' / 'file_2.css'), (time.time() + 10, time.time() + 10))
+            (source / 'dir_3' / 'file_3.css').unlink()
+            (static_root / 'untracked.txt').write_text('keep me')
+
+            assert collect_static_incremental() == {'copied': 1, 'unchanged': 18, 'deleted': 1}
+            assert (static_root / 'dir_1' / 'file_1.css').read_text() == 'changed'
+            assert not (static_root / 'dir_3' / 'file_3.css').exists()
+            assert (static_root / 'untracked.txt').exists()
+
+            (static_root / 'dir_4' / 'file_4.css').unlink()
+            assert collect_static_incremental()['copied'] == 1, 'Ensure missing targets are restored'
+
+    def test__collect_static__incremental(self, tmp_path):
+        source, static_root = tmp_path / 'src', tmp_path / 'static'
+        _generate_tree(source, 3)
+
+        with override_settings(STATICFILES_DIRS=[str(source)], STATIC_ROOT=str(static_root)), \
+                patch('django_docker_helpers.files.wf') as wf:
+            assert collect_static(incremental=True)
+            assert any('3 copied' in arg[0][0] for arg in wf.call_args_list)
+
+    def test__collect_static_incremental__many_files(self, tmp_path):
+        source, static_root = tmp_path / 'src', tmp_path / 'static'
+        _generate_tree(source, 3000)
+
+        with override_settings(STATICFILES_DIRS=[str(source)], STATIC_ROOT=str(static_root)):
+            assert collect_static_incremental() == {'copied': 3000, 'unchanged': 0, 'deleted': 0}
+
+            with patch('django_docker_helpers.files._file_digest') as file_digest, \
+                    patch('django_docker_helpers.files.shutil.copy2') as copy2:
+                assert collect_static_incremental() == {'copied': 0, 'unchanged': 3000, 'deleted': 0}
+            file_digest.assert_not_called()
+            copy2.assert_not_called()
+
+    def test__collect_static__not_local_storage(self, tmp_path):
+        storage_settings = _staticfiles_storage_settings('{0}.RemoteStorage'.format(__name__))
+        with override_settings(STATIC_ROOT=str(tmp_path / 'static'), **storage_settings), \
+                patch('django.core.management.execute_from_command_line') as execute, \
+                patch('django_docker_helpers.files.wf'):
+            assert collect_static.__wrapped__(incremental=True)
+            execute.assert_called_once()
+            with pytest.raises(ValueError):
+                collect_static_incremental()
+        assert not (tmp_path / 'static').exists(), 'Ensure nothing is copied to the local disk'
+
+        with override_settings(STATIC_ROOT=None), \
+                patch('django.core.management.execute_from_command_line') as execute, \
+                patch('django_docker_helpers.files.wf'):
+            assert collect_static.__wrapped__(incremental=True)
+            execute.assert_called_once()
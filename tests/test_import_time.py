@@ -0,0 +1,60 @@
+# noinspection PyPackageRequirements
+import pytest
+
+import subprocess
+import sys
+
+pytestmark = pytest.mark.import_time
+
+# third party modules that used to make up most of the package import time
+HEAVY_MODULES = ('yaml', 'dpath', 'docker_check', 'redis', 'consul', 'aiohttp', 'inspect')
+
+# parsers and helpers that are imported on the first access only
+LAZY_MODULES = (
+    'django_docker_helpers.config.async_loader',
+    'django_docker_helpers.config.coercers',
+    'django_docker_helpers.config.backends.yaml_parser',
+    'django_docker_helpers.config.backends.redis_parser',
+    'django_docker_helpers.config.backends.mpt_redis_parser',
+    'django_docker_helpers.config.backends.consul_parser',
+    'django_docker_helpers.config.backends.mpt_consul_parser',
+    'django_docker_helpers.config.backends.async_mpt_redis_parser',
+    'django_docker_helpers.config.backends.async_mpt_consul_parser',
+)
+
+
+def imported_modules(module_name: str) -> set:
+    """
+    Imports ``module_name`` in a clean interpreter and returns names of all modules loaded after that.
+    """
+    proc = subprocess.run(
+        [sys.executable, '-c', 'import sys, {0}; print("\\n".join(sys.modules))'.format(module_name)],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, check=True,
+    )
+    return set(proc.stdout.splitlines())
+
+
+# noinspection PyMethodMayBeStatic
+class ImportTimeTest:
+    def test__config__does_not_import_heavy_modules(self):
+        modules = imported_modules('django_docker_helpers.config')
+        assert 'django_docker_helpers.config' in modules
+        for module_name in HEAVY_MODULES:
+            assert module_name not in modules, 'Ensure `{0}` is imported lazily'.format(module_name)
+
+    def test__config__does_not_import_parsers(self):
+        modules = imported_modules('django_docker_helpers.config')
+        for module_name in LAZY_MODULES:
+            assert module_name not in modules, 'Ensure `{0}` is imported lazily'.format(module_name)
+
+    def test__backends__lazy_access(self):
+        from django_docker_helpers.config import backends
+        from django_docker_helpers.config.backends.yaml_parser import YamlParser
+
+        assert backends.YamlParser is YamlParser
+        assert 'YamlParser' in dir(backends)
+        with pytest.raises(AttributeError):
+            getattr(backends, 'NoSuchParser')
+
+        from django_docker_helpers import config
+        assert config.YamlParser is YamlParser
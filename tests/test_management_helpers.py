@@ -1,27 +1,102 @@
 # noinspection PyPackageRequirements
 import pytest
 
+import gc
+import os
+import re
+import socket
+import threading
+import time
+from io import StringIO
 from unittest.mock import patch
 
-from django_docker_helpers.db import ensure_caches_alive, ensure_databases_alive, migrate
+from django_docker_helpers.db import (
+    ReadinessReport, cache_addresses, check_socket, database_addresses, database_lock, ensure_caches_alive,
+    ensure_databases_alive, is_migrated, migrate, probe_concurrently
+)
 from django_docker_helpers.files import collect_static
-from django_docker_helpers.management import create_admin
+from django_docker_helpers.config import ConfigLoader
+from django_docker_helpers.config.backends import YamlParser
+from django_docker_helpers.management import create_admin, prepare_for_fork, run_gunicorn
 
 pytestmark = pytest.mark.management
 
 
+def _worker_private_dirty(freeze: bool) -> int:
+    """
+    Forks a "master" that loads a big config (and optionally prepares for fork), which in turn forks
+    a "worker" running a full GC pass, and returns the worker's ``Private_Dirty`` in kB.
+    """
+    read_fd, write_fd = os.pipe()
+    master_pid = os.fork()
+    if not master_pid:
+        try:
+            os.close(read_fd)
+            config = StringIO('\n'.join(
+                'section_{0}: {{name: item-{0}, values: [{0}, {0}.5, on], nested: {{key: value-{0}}}}}'.format(i)
+                for i in range(4000)
+            ))
+            loader = ConfigLoader(parsers=[YamlParser(config)])
+            if freeze:
+                prepare_for_fork(loader)
+            else:
+                loader.warm_up()
+                loader.key_index
+                gc.collect()
+
+            worker_pid = os.fork()
+            if not worker_pid:
+                gc.collect()
+                with open('/proc/self/smaps_rollup') as fp:
+                    dirty = re.search(r'^Private_Dirty:\s+(\d+)', fp.read(), re.M).group(1)
+                os.write(write_fd, dirty.encode())
+                os._exit(0)
+            os.waitpid(worker_pid, 0)
+        finally:
+            os._exit(0)
+
+    os.close(write_fd)
+    with os.fdopen(read_fd) as fp:
+        dirty = int(fp.read())
+    os.waitpid(master_pid, 0)
+    return dirty
+
+
 # noinspection PyMethodMayBeStatic
 class ManagementTest:
     @pytest.mark.django_db
     def test__migrate(self):
         with patch('django_docker_helpers.db.wf') as wf:
-            assert migrate()
+            assert migrate(skip_if_migrated=False)
             assert any('[+]' in arg[0][0] for arg in wf.call_args_list)
 
+    @pytest.mark.django_db
+    def test__migrate__skip(self, tmp_path):
+        fingerprint_file = str(tmp_path / 'migrations.fingerprint')
+        with patch('django_docker_helpers.db.wf') as wf, \
+                patch('django_docker_helpers.db.execute_from_command_line') as execute_from_command_line:
+            assert migrate(fingerprint_file=fingerprint_file)
+            execute_from_command_line.assert_not_called()
+            assert any('[SKIP' in arg[0][0] for arg in wf.call_args_list)
+
+        assert is_migrated()
+        assert open(fingerprint_file).read().startswith('default:')
+        with patch('django_docker_helpers.db.migration_plan') as migration_plan:
+            assert is_migrated(fingerprint_file=fingerprint_file)
+            # the migration graph is not loaded
+            migration_plan.assert_not_called()
+
+        with open(fingerprint_file, 'w') as fp:
+            fp.write('outdated')
+        with patch('django_docker_helpers.db.migration_plan', return_value=[('0002_new', False)]):
+            assert not is_migrated(fingerprint_file=fingerprint_file)
+
     @pytest.mark.django_db
     def test__ensure_databases_alive(self):
         with patch('django_docker_helpers.db.wf') as wf:
-            assert ensure_databases_alive(max_retries=1)
+            report = ensure_databases_alive(max_retries=1)
+            assert report
+            assert report['default'].ready and report['default'].attempts == 1
             assert any('[+]' in arg[0][0] for arg in wf.call_args_list)
 
     def test__ensure_caches_alive(self):
@@ -29,6 +104,15 @@ class ManagementTest:
             assert ensure_caches_alive(max_retries=1, exit_on_failure=False)
             assert any('[+]' in arg[0][0] for arg in wf.call_args_list)
 
+    def test__ensure_alive__default_deadline(self):
+        with patch('django_docker_helpers.db.probe_concurrently', return_value=ReadinessReport()) as probe:
+            ensure_caches_alive(max_retries=10, retry_timeout=3, exit_on_failure=False)
+            assert probe.call_args[1]['max_retries'] is None
+            assert probe.call_args[1]['timeout'] == 30, 'Ensure the worst-case wait of fixed pauses is kept'
+
+            ensure_databases_alive(max_retries=10, retry_timeout=3, timeout=5, exit_on_failure=False)
+            assert probe.call_args[1]['max_retries'] == 10 and probe.call_args[1]['timeout'] == 5
+
     def test__collect_static(self):
         with patch('django_docker_helpers.files.wf') as wf:
             assert collect_static()
@@ -39,3 +123,329 @@ class ManagementTest:
         with patch('django_docker_helpers.management.wf') as wf:
             assert create_admin()
             assert any('[+]' in arg[0][0] for arg in wf.call_args_list)
+
+    @pytest.mark.django_db
+    def test__create_admin__list(self, settings, django_assert_num_queries):
+        from django.contrib.auth import get_user_model
+        user_model = get_user_model()
+        user_model.objects.create_user('existing', 'existing@example.com')
+
+        settings.SUPERUSERS = [
+            {'username': 'existing', 'email': 'existing@example.com', 'password': 'qwe'},
+            {'username': 'new', 'email': 'new@example.com', 'password': 'asd'},
+            {'username': 'no_password', 'email': 'no_password@example.com'},
+            {'username': 'no_email'},
+        ]
+        with patch('django_docker_helpers.management.wf'):
+            # select, bulk insert and bulk update
+            with django_assert_num_queries(3):
+                assert create_admin.__wrapped__('SUPERUSERS')
+
+        assert user_model.objects.get(username='existing').check_password('qwe')
+        new = user_model.objects.get(username='new')
+        assert new.is_superuser and new.is_staff and new.check_password('asd')
+        assert not user_model.objects.get(username='no_password').has_usable_password()
+        assert not user_model.objects.filter(username='no_email').exists()
+
+    @pytest.mark.django_db
+    def test__create_admin__save_signals(self, settings):
+        from django.contrib.auth import get_user_model
+        from django.db.models.signals import post_save
+        user_model = get_user_model()
+        user_model.objects.create_user('existing', 'existing@example.com')
+
+        saved = []
+
+        def receiver(sender, instance, created, **kwargs):
+            saved.append((instance.username, created))
+
+        settings.SUPERUSERS = [
+            {'username': 'existing', 'email': 'existing@example.com', 'password': 'qwe'},
+            {'username': 'new', 'email': 'new@example.com', 'password': 'asd'},
+        ]
+        post_save.connect(receiver, sender=user_model)
+        try:
+            with patch('django_docker_helpers.management.wf'):
+                assert create_admin.__wrapped__('SUPERUSERS')
+        finally:
+            post_save.disconnect(receiver, sender=user_model)
+
+        assert sorted(saved) == [('existing', False), ('new', True)], 'Ensure signal receivers are not bypassed'
+        assert user_model.objects.get(username='existing').check_password('qwe')
+        new = user_model.objects.get(username='new')
+        assert new.is_superuser and new.is_staff and new.check_password('asd')
+
+    @pytest.mark.django_db
+    def test__create_admin__custom_user_model(self, settings):
+        from tests.test_app.models import Member
+
+        settings.SUPERUSERS = [{'username': 'member', 'email': 'member@example.com', 'password': 'qwe'}]
+        with patch('django_docker_helpers.management.wf'), \
+                patch('django.contrib.auth.get_user_model', return_value=Member):
+            assert create_admin.__wrapped__('SUPERUSERS')
+
+        member = Member.objects.get(username='member')
+        assert member.is_admin and member.check_password('qwe')
+
+    @pytest.mark.django_db
+    def test__create_admin__created_concurrently(self):
+        from django.contrib.auth import get_user_model
+        from django.db.models.signals import post_save
+        user_model = get_user_model()
+        user_model.objects.create_superuser('admin', 'admin@example.com', 'old')
+
+        def receiver(**kwargs):
+            pass
+
+        # another replica creates the user after it has been looked up
+        with patch('django_docker_helpers.management.wf'), \
+                patch.object(user_model._default_manager, 'filter', return_value=[]):
+            assert create_admin.__wrapped__()
+            with patch('django.VERSION', (2, 1)):
+                assert create_admin.__wrapped__()
+
+            post_save.connect(receiver, sender=user_model)
+            try:
+                assert create_admin.__wrapped__()
+            finally:
+                post_save.disconnect(receiver, sender=user_model)
+
+        assert user_model.objects.filter(username='admin').count() == 1
+        assert user_model.objects.get(username='admin').check_password('old')
+
+    @pytest.mark.django_db
+    def test__create_admin__exists(self, settings, django_assert_num_queries):
+        from django.contrib.auth import get_user_model
+        user_model = get_user_model()
+        user_model.objects.create_superuser('admin', 'admin@example.com', 'old')
+
+        with patch('django_docker_helpers.management.wf') as wf, \
+                patch('django.core.management.execute_from_command_line') as execute:
+            with django_assert_num_queries(1):
+                assert create_admin.__wrapped__()
+            assert not execute.called
+            assert any('1 unchanged' in arg[0][0] for arg in wf.call_args_list)
+
+        # an existing password is not overwritten
+        assert user_model.objects.get(username='admin').check_password('old')
+
+    def test__create_admin__skip(self, settings):
+        settings.SUPERUSERS = [{'username': 'no_email'}]
+        with patch('django_docker_helpers.management.wf') as wf:
+            assert not create_admin.__wrapped__('SUPERUSERS')
+            assert any('SKIP' in arg[0][0] for arg in wf.call_args_list)
+
+    def test__prepare_for_fork(self):
+        config = StringIO('a:\n  b: 1\n')
+        loader = ConfigLoader(parsers=[YamlParser(config)])
+        try:
+            with patch.object(loader, 'build_key_index') as build_key_index:
+                frozen = prepare_for_fork(loader)
+                build_key_index.assert_not_called()
+            assert loader.get('a.b') == 1
+            assert loader.parsers[0].config is None
+
+            if hasattr(gc, 'freeze'):
+                assert frozen > 0
+
+            loader = ConfigLoader(parsers=[YamlParser(StringIO('a: 1\n'))], use_key_index=True)
+            prepare_for_fork(loader)
+            assert loader.key_index == {'a': 0}
+        finally:
+            if hasattr(gc, 'unfreeze'):
+                gc.unfreeze()
+
+    def test__run_gunicorn__freeze_errors(self):
+        loader = ConfigLoader(parsers=[YamlParser(StringIO('a: 1\n'))])
+        with patch.object(loader, 'warm_up', side_effect=ConnectionError('down')), \
+                patch('gunicorn.app.base.Application.__init__', return_value=None), \
+                patch('gunicorn.app.base.Application.run', return_value='ran') as run, \
+                patch('django_docker_helpers.management.prepare_for_fork', wraps=prepare_for_fork) as prepare:
+            assert run_gunicorn(None, configure=loader) == 'ran'
+            prepare.assert_not_called()
+
+            with patch('django_docker_helpers.management.logging.getLogger') as get_logger:
+                assert run_gunicorn(None, configure=loader, freeze=True) == 'ran'
+            assert 'down' in get_logger.return_value.error.call_args[0][0]
+            assert run.call_count == 2
+
+    @pytest.mark.skipif(not hasattr(gc, 'freeze') or not os.path.exists('/proc/self/smaps_rollup'),
+                        reason='gc.freeze and /proc/self/smaps_rollup are required')
+    def test__prepare_for_fork__private_dirty(self):
+        unfrozen = _worker_private_dirty(freeze=False)
+        frozen = _worker_private_dirty(freeze=True)
+        # a GC pass in a worker doesn't touch frozen objects, their pages stay shared with the master
+        assert frozen < unfrozen * 0.75, 'Private dirty per worker: {0} kB frozen, {1} kB not'.format(frozen, unfrozen)
+
+    def test__probe_concurrently(self):
+        ready_at = time.monotonic() + 0.3
+
+        def check(alias):
+            if alias != 'fast' and time.monotonic() < ready_at:
+                raise ConnectionError('{0} is not ready'.format(alias))
+
+        with patch('django_docker_helpers.db.wf'):
+            started_at = time.monotonic()
+            report = probe_concurrently(['fast', 'slow-1', 'slow-2', 'slow-3'], check, retry_timeout=0.1)
+            elapsed = time.monotonic() - started_at
+
+        assert report
+        assert [result.alias for result in report] == ['fast', 'slow-1', 'slow-2', 'slow-3']
+        assert report['fast'].attempts == 1
+        assert report['slow-3'].attempts > 1
+        assert elapsed < 0.6, 'Ensure aliases are probed concurrently'
+
+    def test__probe_concurrently__deadline(self):
+        def check(alias):
+            raise ConnectionError('never ready')
+
+        cleaned_up = []
+        with patch('django_docker_helpers.db.wf') as wf:
+            started_at = time.monotonic()
+            report = probe_concurrently(['a', 'b'], check, retry_timeout=10, timeout=0.2, cleanup=cleaned_up.append)
+            elapsed = time.monotonic() - started_at
+
+        assert not report
+        assert elapsed < 1
+        assert sorted(cleaned_up) == ['a', 'b']
+        assert [result.alias for result in report.failed] == ['a', 'b']
+        assert isinstance(report['a'].error, ConnectionError)
+        assert any('[a] Tried' in arg[0][0] for arg in wf.call_args_list)
+
+    def test__database_addresses(self):
+        assert database_addresses({'ENGINE': 'django.db.backends.sqlite3', 'NAME': 'db.sqlite'}) == []
+        assert database_addresses({'ENGINE': 'django.db.backends.postgresql', 'HOST': ''}) == []
+        assert database_addresses({'ENGINE': 'django.db.backends.postgresql', 'HOST': 'db'}) == [
+            (socket.AF_INET, ('db', 5432))
+        ]
+        assert database_addresses({'ENGINE': 'django.db.backends.mysql', 'HOST': 'db', 'PORT': '3307'}) == [
+            (socket.AF_INET, ('db', 3307))
+        ]
+        assert database_addresses({'ENGINE': 'django.contrib.gis.db.backends.postgis', 'HOST': '/run/pg/'}) == [
+            (socket.AF_UNIX, '/run/pg/.s.PGSQL.5432')
+        ]
+
+    def test__cache_addresses(self):
+        assert cache_addresses({'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'a:1'}) == []
+        assert cache_addresses({
+            'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+            'LOCATION': '10.0.0.1:11211;mc;unix:/tmp/memcached.sock',
+        }) == [
+            (socket.AF_INET, ('10.0.0.1', 11211)),
+            (socket.AF_INET, ('mc', 11211)),
+            (socket.AF_UNIX, '/tmp/memcached.sock'),
+        ]
+        assert cache_addresses({
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': ['redis://:pass@cache:6380/1', 'rediss://cache-2/0', 'unix:///run/redis.sock'],
+        }) == [
+            (socket.AF_INET, ('cache', 6380)),
+            (socket.AF_INET, ('cache-2', 6379)),
+            (socket.AF_UNIX, '/run/redis.sock'),
+        ]
+
+    def test__check_socket(self, tmp_path):
+        with socket.socket() as server:
+            server.bind(('127.0.0.1', 0))
+            server.listen(1)
+            check_socket((socket.AF_INET, server.getsockname()))
+            port = server.getsockname()[1]
+
+        with pytest.raises(ConnectionError):
+            check_socket((socket.AF_INET, ('127.0.0.1', port)))
+
+        # the first resolved address is down, the second one accepts connections
+        with socket.socket() as server:
+            server.bind(('127.0.0.1', 0))
+            server.listen(1)
+            resolved = [
+                (socket.AF_INET, socket.SOCK_STREAM, 6, '', ('127.0.0.1', port)),
+                (socket.AF_INET, socket.SOCK_STREAM, 6, '', server.getsockname()),
+            ]
+            with patch('django_docker_helpers.db.socket.getaddrinfo', return_value=resolved):
+                check_socket((socket.AF_INET, ('dual-stack.local', port)))
+
+        with patch('django_docker_helpers.db.socket.getaddrinfo', return_value=resolved), \
+                pytest.raises(ConnectionError) as e:
+            check_socket((socket.AF_INET, ('dual-stack.local', port)))
+        assert str(e.value).count('does not accept connections') == 2
+
+        path = str(tmp_path / 'server.sock')
+        with pytest.raises(ConnectionError):
+            check_socket((socket.AF_UNIX, path))
+        with socket.socket(socket.AF_UNIX) as server:
+            server.bind(path)
+            server.listen(1)
+            check_socket((socket.AF_UNIX, path))
+
+    def test__probe_concurrently__precheck(self):
+        checked = []
+
+        def precheck(alias):
+            raise ConnectionError('{0}:5432 does not accept connections'.format(alias))
+
+        with patch('django_docker_helpers.db.wf') as wf:
+            report = probe_concurrently(['db'], checked.append, max_retries=5, retry_timeout=0.01, precheck=precheck)
+
+        assert not report
+        assert report['db'].attempts == 5
+        assert checked == [], 'Ensure the expensive check waits for the port'
+        assert sum('does not accept connections' in arg[0][0] for arg in wf.call_args_list) == 2, \
+            'Ensure repeated errors are reported once (and in the summary)'
+
+    @pytest.mark.django_db(transaction=True)
+    def test__database_lock(self):
+        from django.db import connections
+
+        events = []
+
+        def replica(name: str):
+            try:
+                with database_lock('test-lock', timeout=5):
+                    events.append(('acquired', name))
+                    time.sleep(0.2)
+                    events.append(('released', name))
+            finally:
+                connections.close_all()
+
+        with patch('django_docker_helpers.db.wf'):
+            threads = [threading.Thread(target=replica, args=(str(i),)) for i in range(3)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            # holders never overlap
+            assert len(events) == 6
+            assert all(events[i][0] == 'acquired' and events[i + 1] == ('released', events[i][1])
+                       for i in range(0, 6, 2))
+
+            with database_lock('test-lock'):
+                with pytest.raises(TimeoutError):
+                    with database_lock('test-lock', timeout=0.2):
+                        pass
+
+            # the lock is released
+            with database_lock('test-lock', timeout=0):
+                pass
+
+    @pytest.mark.django_db(transaction=True)
+    def test__database_lock__heartbeat(self):
+        with patch('django_docker_helpers.db.wf') as wf:
+            with database_lock('test-heartbeat', stale_after=0.2):
+                time.sleep(0.5)
+                with pytest.raises(TimeoutError):
+                    with database_lock('test-heartbeat', timeout=0.1, stale_after=0.2):
+                        pass
+
+            with database_lock('test-heartbeat', timeout=0, stale_after=0.2):
+                pass
+        assert not any('Cannot refresh' in arg[0][0] for arg in wf.call_args_list)
+
+    @pytest.mark.django_db(transaction=True)
+    def test__migrate__lock(self):
+        with patch('django_docker_helpers.db.wf') as wf, \
+                patch('django_docker_helpers.db.execute_from_command_line') as execute_from_command_line:
+            assert migrate(lock=True, lock_timeout=5)
+            execute_from_command_line.assert_not_called()
+            assert any('[SKIP' in arg[0][0] for arg in wf.call_args_list)
@@ -0,0 +1,170 @@
+# noinspection PyPackageRequirements
+import pytest
+
+import fnmatch
+import typing as t
+from unittest import mock
+
+from django_docker_helpers.config import ConfigLoader
+from django_docker_helpers.config.backends import *
+from django_docker_helpers.config.negative_cache import BloomFilter, NegativeLookupCache
+from django_docker_helpers.utils import mp_serialize_dict
+
+pytestmark = [pytest.mark.config_loader, pytest.mark.negative_cache]
+
+
+class FakeRedis:
+    """
+    A local stand-in for ``redis.Redis``.
+    """
+    def __init__(self, data: dict):
+        self.data = data
+        self.get_calls = 0
+        self.scan_calls = 0
+
+    def get(self, key: str):
+        self.get_calls += 1
+        return self.data.get(key)
+
+    def scan_iter(self, match: str = '*'):
+        self.scan_calls += 1
+        return [key.encode() for key in self.data if fnmatch.fnmatchcase(key, match)]
+
+
+class FakeConsulKV:
+    def __init__(self, data: dict):
+        self.data = data
+
+    def get(self, key: str, keys: bool = False, **kwargs):
+        if keys:
+            return 1, [k for k in self.data if k.startswith(key)] or None
+        if key not in self.data:
+            return 1, None
+        return 1, {'Value': self.data[key]}
+
+
+class FakeConsul:
+    def __init__(self, data: dict):
+        self.kv = FakeConsulKV(data)
+
+
+class CountingParser(BaseParser):
+    """
+    A non-enumerable remote parser.
+    """
+    remote_lookups = True
+
+    def __init__(self, data: t.Optional[dict] = None):
+        super().__init__()
+        self.data = data or {}
+        self.calls = 0
+
+    def get(self, variable_path: str, default: t.Optional[t.Any] = None, **kwargs):
+        self.calls += 1
+        return self.data.get(variable_path, default)
+
+
+@pytest.fixture
+def mpt_redis_parser():
+    parser = MPTRedisParser(scope='project', key_prefix='pfx')
+    data = {'pfx:' + k: v for k, v in mp_serialize_dict({'project': {'a': {'b': 1}, 'c': 'd'}}, separator='.')}
+    data['pfx:other.x'] = b'1'
+    parser._client = FakeRedis(data)
+    return parser
+
+
+# noinspection PyMethodMayBeStatic,PyShadowingNames
+class NegativeCacheTest:
+    def test__bloom_filter(self):
+        items = ['key.%d' % i for i in range(1000)]
+        bloom_filter = BloomFilter.from_iterable(items, error_rate=0.01)
+        assert all(item in bloom_filter for item in items), 'Ensure no false negatives'
+
+        false_positives = sum('missing.%d' % i in bloom_filter for i in range(10000))
+        assert false_positives < 300
+
+        assert 'anything' not in BloomFilter.from_iterable([])
+
+    def test__parser_keys(self, mpt_redis_parser):
+        assert sorted(mpt_redis_parser.keys()) == ['a.b', 'c']
+
+        p = MPTRedisParser()
+        p._client = FakeRedis({'a': b'1'})
+        with pytest.raises(NotImplementedError):
+            p.keys()
+        assert p.client.scan_calls == 0, 'Ensure the whole database is never scanned'
+
+        p = MPTRedisParser(scope='pro*ject', key_prefix='[pfx]?')
+        p._client = mock.Mock(scan_iter=mock.Mock(return_value=[b'[pfx]?:pro*ject.a']))
+        assert p.keys() == ['a']
+        p.client.scan_iter.assert_called_once_with(match='\\[pfx\\]\\?:pro\\*ject.*')
+
+        p = MPTConsulParser(scope='project')
+        p._client = FakeConsul(dict(mp_serialize_dict({'project': {'a': {'b': 1}}, 'x': 1}, separator='/')))
+        assert p.keys() == ['a.b']
+
+        p = YamlParser('./tests/data/config.yml')
+        assert {'debug', 'my', 'my.deep.nested.variable', 'hosts', 'hosts.1'} <= set(p.keys())
+        assert all(p.get(key, default=p.sentinel) is not p.sentinel for key in p.keys())
+
+        with pytest.raises(NotImplementedError):
+            BaseParser().keys()
+
+    def test__ttl_miss_set(self):
+        parser = CountingParser()
+        cache = NegativeLookupCache(parser, ttl=10)
+
+        with mock.patch('django_docker_helpers.config.negative_cache.time.monotonic', return_value=100):
+            assert not cache.is_known_miss('a')
+            cache.add_miss('a')
+            assert cache.is_known_miss('a')
+            assert not cache.use_bloom_filter, 'Ensure non-enumerable parsers are detected'
+
+        with mock.patch('django_docker_helpers.config.negative_cache.time.monotonic', return_value=111):
+            assert not cache.is_known_miss('a'), 'Ensure misses expire'
+
+        assert cache.avoided == 1
+
+    def test__loader__skips_known_misses(self, mpt_redis_parser):
+        counting_parser = CountingParser()
+        loader = ConfigLoader(parsers=[
+            counting_parser,
+            mpt_redis_parser,
+            YamlParser(config='./tests/data/config.yml', scope='project'),
+        ], negative_cache_ttl=60)
+
+        for _ in range(5):
+            assert loader.get('name') == 'wroom-wroom'
+            assert loader.get('a.b', coerce_type=int) == 1
+
+        assert counting_parser.calls == 2, 'Ensure only the first miss hits the parser'
+        assert mpt_redis_parser.client.get_calls == 5, 'Ensure the bloom filter skips absent keys'
+        assert mpt_redis_parser.client.scan_calls == 1
+        assert loader.remote_calls_avoided == 8 + 5
+
+        stats = loader.negative_cache_stats()
+        assert [s['bloom_filter'] for s in stats] == [False, True, True]
+        assert stats[0]['misses'] == 2
+
+    def test__loader__case_insensitive_env(self):
+        env = {'PROJECT__DEBUG': 'true', 'PROJECT__MIXED__CASE': '1'}
+        loader = ConfigLoader(parsers=[EnvironmentParser(scope='project', env=env)], negative_cache_ttl=60)
+
+        assert loader.get('DEBUG') == 'true'
+        assert loader.get('debug') == 'true'
+        assert loader.get('Mixed.Case') == '1'
+        assert loader.get('missing') is None
+        assert loader.negative_caches[0].bloom_filter is not None
+        assert loader.negative_caches[0].avoided == 1
+
+    def test__loader__does_not_cache_with_kwargs(self):
+        counting_parser = CountingParser()
+        loader = ConfigLoader(parsers=[counting_parser], negative_cache_ttl=60)
+        loader.get('a', extra_option=1)
+        loader.get('a', extra_option=1)
+        assert counting_parser.calls == 2
+
+    def test__from_env__negative_cache_ttl(self):
+        loader = ConfigLoader.from_env(parser_modules=['EnvironmentParser'], env={'CONFIG__NEGATIVE_CACHE_TTL': '5'})
+        assert loader.negative_caches[0].ttl == 5
+        assert ConfigLoader.from_env(parser_modules=['EnvironmentParser'], env={}).negative_caches is None
@@ -0,0 +1,94 @@
+# noinspection PyPackageRequirements
+import pytest
+
+import json
+import time
+from io import StringIO
+from unittest.mock import patch
+
+from django_docker_helpers.config import ConfigLoader
+from django_docker_helpers.config.backends import YamlParser
+from django_docker_helpers.profiling import (
+    Profiler, active_profiler, phase, profile_startup, profiled, start_profiling, stop_profiling
+)
+
+pytestmark = pytest.mark.profiling
+
+
+@pytest.fixture
+def profiler():
+    profiler = start_profiling()
+    yield profiler
+    stop_profiling(print_table=False)
+
+
+# noinspection PyMethodMayBeStatic
+class ProfilerTest:
+    def test__phase(self):
+        profiler = Profiler()
+        for _ in range(2):
+            with profiler.phase('sleep'):
+                time.sleep(0.05)
+        with pytest.raises(ValueError):
+            with profiler.phase('fail'):
+                raise ValueError()
+
+        stats = profiler.phases['sleep']
+        assert stats.calls == 2 and stats.errors == 0
+        assert stats.wall >= 0.1
+        assert stats.cpu < stats.wall
+        assert stats.finished_at - stats.started_at >= stats.wall
+        assert profiler.phases['fail'].errors == 1
+
+    def test__noop(self):
+        assert active_profiler() is None
+        with phase('nothing.{0}', 'here'):
+            pass
+        assert profiled('nothing')(lambda x: x * 2)(2) == 4
+
+    def test__profiled(self, profiler):
+        @profiled('double')
+        def double(x):
+            return x * 2
+
+        assert double(2) == 4
+        with phase('formatted.{0}', 'name'):
+            pass
+        assert profiler.phases['double'].calls == 1
+        assert 'formatted.name' in profiler.phases
+
+    def test__config_loader(self, profiler):
+        loader = ConfigLoader(parsers=[YamlParser(StringIO('a: 1\n'))], use_key_index=False)
+        loader.warm_up()
+        assert loader.get('a') == 1
+        assert loader.get('b') is None
+
+        assert profiler.phases['config.warm_up'].calls == 1
+        assert profiler.phases['config.warm_up.YamlParser'].calls == 1
+        assert profiler.phases['config.get.YamlParser'].calls == 2
+
+    def test__profile_startup(self, tmp_path):
+        report_path = str(tmp_path / 'profile.json')
+        with patch('django_docker_helpers.profiling.wf') as wf:
+            with profile_startup(report_path):
+                with phase('db.migrate'):
+                    pass
+        assert active_profiler() is None
+
+        with open(report_path) as fp:
+            report = json.load(fp)
+        assert report['version'] == 1
+        assert [stats['name'] for stats in report['phases']] == ['total', 'db.migrate']
+        assert report['phases'][0]['wall'] >= report['phases'][1]['wall']
+
+        table = wf.call_args[0][0]
+        assert 'db.migrate' in table and 'Startup profile' in table
+
+    def test__report_from_env(self, tmp_path, monkeypatch):
+        report_path = tmp_path / 'profile.json'
+        monkeypatch.setenv('STARTUP_PROFILE_FILE', str(report_path))
+        start_profiling()
+        report = stop_profiling(print_table=False)
+        assert report['phases'] == []
+        assert json.loads(report_path.read_text())['pid'] == report['pid']
+        assert stop_profiling() is None
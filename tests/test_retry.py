@@ -0,0 +1,49 @@
+# noinspection PyPackageRequirements
+import pytest
+
+import random
+import time
+
+from django_docker_helpers.retry import RetrySchedule
+
+pytestmark = pytest.mark.retry
+
+
+# noinspection PyMethodMayBeStatic
+class RetryScheduleTest:
+    def test__delay(self):
+        schedule = RetrySchedule(fast_attempts=2, fast_interval=0.1, base_delay=1, max_delay=4,
+                                 rng=random.Random(42))
+        for _ in range(100):
+            assert 0.05 <= schedule.delay(1) <= 0.1
+            assert 0.05 <= schedule.delay(2) <= 0.1
+            assert 0 <= schedule.delay(3) <= 1
+            assert 0 <= schedule.delay(4) <= 2
+            assert 0 <= schedule.delay(10) <= 4
+
+    def test__jitter(self):
+        delays = {RetrySchedule(fast_attempts=0).delay(5) for _ in range(20)}
+        assert len(delays) > 1, 'Ensure retries are not in lockstep'
+
+    def test__max_attempts(self):
+        schedule = RetrySchedule(max_attempts=4, fast_interval=0.01)
+        assert list(schedule) == [1, 2, 3, 4]
+        assert schedule.attempts == 4
+
+        assert list(RetrySchedule(max_attempts=1)) == [1]
+
+    def test__deadline(self):
+        schedule = RetrySchedule(deadline=0.3, fast_attempts=1, fast_interval=0.01, base_delay=10, max_delay=10)
+        started_at = time.monotonic()
+        attempts = list(schedule)
+        assert time.monotonic() - started_at < 0.5
+        assert len(attempts) >= 2
+        assert schedule.remaining == 0
+
+    def test__stops_when_broken_out(self):
+        schedule = RetrySchedule(deadline=10)
+        for attempt in schedule:
+            if attempt == 2:
+                break
+        assert schedule.attempts == 2
+        assert schedule.remaining > 9
@@ -0,0 +1,113 @@
+# noinspection PyPackageRequirements
+import pytest
+
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+from django_docker_helpers.startup import Startup, default_startup
+from django_docker_helpers.utils import wf
+
+pytestmark = pytest.mark.startup
+
+
+def _sleep(seconds: float, calls: list, name: str):
+    calls.append((name, threading.current_thread().name))
+    time.sleep(seconds)
+    return name
+
+
+def _fail():
+    exit(1)
+
+
+def _chatty(name: str, barrier: threading.Barrier):
+    print('{0}: started'.format(name))
+    barrier.wait()
+    wf('{0}: working\n'.format(name))
+    barrier.wait()
+    sys.stderr.write('{0}: done\n'.format(name))
+
+
+# noinspection PyMethodMayBeStatic
+class StartupTest:
+    def test__run__parallel(self):
+        calls = []
+        startup = Startup()
+        startup.add('databases', _sleep, 0.3, calls, 'databases')
+        startup.add('collectstatic', _sleep, 0.3, calls, 'collectstatic')
+        startup.add('migrate', _sleep, 0.2, calls, 'migrate', depends_on=['databases'])
+        startup.add('create_admin', _sleep, 0.1, calls, 'create_admin', depends_on=['migrate'])
+
+        with patch('django_docker_helpers.startup.wf') as wf:
+            started_at = time.monotonic()
+            report = startup.run()
+            elapsed = time.monotonic() - started_at
+
+        assert report
+        assert elapsed < 0.9, 'Ensure collectstatic runs alongside the database chain'
+        assert list(report) == ['databases', 'collectstatic', 'migrate', 'create_admin']
+        assert report['migrate'].result == 'migrate'
+        assert report['databases'].elapsed >= 0.3
+        assert report['migrate'].started_at >= report['databases'].finished_at
+        assert [result.name for result in report.critical_path] == ['databases', 'migrate', 'create_admin']
+
+        summary = wf.call_args_list[-1][0][0]
+        assert 'Critical path: databases' in summary
+        assert 'create_admin' in summary
+
+    def test__run__capture_output(self, capsys):
+        barrier = threading.Barrier(2, timeout=5)
+        startup = Startup()
+        startup.add('first', _chatty, 'first', barrier)
+        startup.add('second', _chatty, 'second', barrier)
+
+        stdout, stderr = sys.stdout, sys.stderr
+        report = startup.run()
+        assert (sys.stdout, sys.stderr) == (stdout, stderr), 'Ensure streams are restored'
+        assert report['first'].stdout == 'first: started\nfirst: working\n'
+        assert report['second'].stderr == 'second: done\n'
+
+        out, err = capsys.readouterr()
+        for name in ('first', 'second'):
+            assert '{0}: started\n{0}: working\n'.format(name) in out, 'Ensure task outputs do not interleave'
+            assert '{0}: done\n'.format(name) in err
+        assert 'Startup finished' in out
+
+    def test__run__failure(self):
+        startup = Startup()
+        startup.add('databases', _fail)
+        startup.add('migrate', _sleep, 0, [], 'migrate', depends_on=['databases'])
+        startup.add('create_admin', _sleep, 0, [], 'create_admin', depends_on=['migrate'])
+        startup.add('collectstatic', _sleep, 0, [], 'collectstatic')
+
+        with patch('django_docker_helpers.startup.wf'):
+            report = startup.run()
+            assert not report
+            assert isinstance(report['databases'].error, SystemExit)
+            assert report['migrate'].skipped and report['create_admin'].skipped
+            assert report['collectstatic'].ok
+
+            with pytest.raises(SystemExit):
+                startup.run(exit_on_failure=True)
+
+    def test__validate(self):
+        startup = Startup()
+        startup.add('a', _fail, depends_on=['b'])
+        with pytest.raises(ValueError):
+            startup.validate()
+
+        startup.add('b', _fail, depends_on=['a'])
+        with pytest.raises(ValueError):
+            startup.validate()
+
+        with pytest.raises(ValueError):
+            startup.add('a', _fail)
+
+    def test__default_startup(self):
+        startup = default_startup(user_config_path=None)
+        assert list(startup.tasks) == ['databases', 'caches', 'migrate', 'modeltranslation', 'collectstatic']
+        assert startup.tasks['migrate'].depends_on == ('databases',)
+        assert startup.tasks['collectstatic'].depends_on == ()
+        startup.validate()
@@ -213,6 +213,27 @@ class UtilsTest:
         assert utils.dot_path(o, 'final.lol.qwe', 'my_default') == 'my_default'
         assert utils.dot_path(o, 'final.nested.my_dict.a.qwe', 'my_default') == 'my_default'
 
+    def test__deep_merge(self):
+        base = {'db': {'host': 'localhost', 'port': 5432}, 'cache': {'ttl': 1}, 'hosts': [1, 2]}
+        merged = utils.deep_merge(base, {'db': {'host': 'db'}, 'hosts': [3]})
+
+        assert merged == {'db': {'host': 'db', 'port': 5432}, 'cache': {'ttl': 1}, 'hosts': [3]}
+        assert merged['cache'] is base['cache'], 'Ensure unchanged sections are shared'
+        assert base['db']['host'] == 'localhost', 'Ensure inputs are not mutated'
+        assert utils.deep_merge(base, {'db': {}}) is base
+
+        base = {'DB': {'HOST': 'localhost'}}
+        assert utils.deep_merge(base, {'db': {'host': 'db'}}) == {'DB': {'HOST': 'localhost'}, 'db': {'host': 'db'}}
+        assert utils.deep_merge(base, {'db': {'host': 'db', 'port': 1}}, case_insensitive=True) == {
+            'DB': {'HOST': 'db', 'port': 1}
+        }
+
+    def test__unflatten_items(self):
+        section = {'a': 1}
+        res = utils.unflatten_items([('db.host', 'db'), ('db', section), ('db.opts.ssl', 'on'), ('debug', 'true')])
+        assert res == {'db': {'a': 1, 'host': 'db', 'opts': {'ssl': 'on'}}, 'debug': 'true'}
+        assert section == {'a': 1}
+
     def test__shred(self):
         assert utils.shred('password', '1234') == '****'
         assert utils.shred('qwerty', '1234') == '1234'